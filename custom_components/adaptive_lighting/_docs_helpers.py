@@ -9,6 +9,9 @@ from .const import (
     DOCS,
     DOCS_APPLY,
     DOCS_MANUAL_CONTROL,
+    DOCS_RECORD_TRACE,
+    PROFILE_SCHEMA,
+    RECORD_TRACE_SCHEMA,
     SET_MANUAL_CONTROL_SCHEMA,
     VALIDATION_TUPLES,
     apply_service_schema,
@@ -52,6 +55,12 @@ def _type_to_str(type_: Any) -> str:  # noqa: PLR0911
         return f"one of `{type_.config['options']}`"
     if isinstance(type_, selector.ColorRGBSelector):
         return "RGB color"
+    if isinstance(type_, selector.EntitySelector):
+        if type_.config.get("multiple"):
+            return "list of `entity_id`s"
+        return "`str` (entity_id)"
+    if isinstance(type_, selector.ObjectSelector):
+        return "`dict`"
     msg = f"Unknown type: {type_}"
     raise ValueError(msg)
 
@@ -115,3 +124,11 @@ def generate_set_manual_control_markdown_table():
         SET_MANUAL_CONTROL_SCHEMA,
         DOCS_MANUAL_CONTROL,
     )
+
+
+def generate_profile_markdown_table():
+    return _generate_service_markdown_table(PROFILE_SCHEMA)
+
+
+def generate_record_trace_markdown_table():
+    return _generate_service_markdown_table(RECORD_TRACE_SCHEMA, DOCS_RECORD_TRACE)
@@ -43,6 +43,23 @@ DOCS[CONF_INCLUDE_CONFIG_IN_ATTRIBUTES] = (
     "Home Assistant when set to `true`. 📝"
 )
 
+CONF_ATTRIBUTE_PROFILE, DEFAULT_ATTRIBUTE_PROFILE = "attribute_profile", "full"
+DOCS[CONF_ATTRIBUTE_PROFILE] = (
+    "Attributes of the switch: `full` shows the settings in all color formats, "
+    "`compact` only the brightness, color temperature, RGB color, sun position "
+    "and manually controlled lights. 🗜️"
+)
+
+CONF_MIN_STATE_WRITE_INTERVAL, DEFAULT_MIN_STATE_WRITE_INTERVAL = (
+    "min_state_write_interval",
+    0,
+)
+DOCS[CONF_MIN_STATE_WRITE_INTERVAL] = (
+    "Minimum number of seconds between updates of the switch's attributes by "
+    "the adaptations, to reduce the number of state changes in the recorder. "
+    "The attributes are only updated when they changed. Set to 0 to disable. 📝"
+)
+
 CONF_INITIAL_TRANSITION, DEFAULT_INITIAL_TRANSITION = "initial_transition", 1
 DOCS[CONF_INITIAL_TRANSITION] = (
     "Duration of the first transition when lights turn "
@@ -195,6 +212,25 @@ DOCS[CONF_LUX_SENSOR] = (
     "When configured, the sensor completely replaces sun-based calculations. 💡"
 )
 
+CONF_LUX_SENSORS, DEFAULT_LUX_SENSORS = "lux_sensors", []
+DOCS[CONF_LUX_SENSORS] = (
+    "Optional: More ambient light sensors (lux), e.g., for large rooms. Their "
+    "readings are combined with the one of `lux_sensor` using `lux_aggregation`. 💡"
+)
+
+CONF_LUX_AGGREGATION, DEFAULT_LUX_AGGREGATION = "lux_aggregation", "mean"
+DOCS[CONF_LUX_AGGREGATION] = (
+    "How to combine the readings of multiple lux sensors: `min`, `max`, `mean`, "
+    "`median` or `weighted` (a mean weighted by `lux_weights`). Unavailable "
+    "sensors are left out. 🧮"
+)
+
+CONF_LUX_WEIGHTS, DEFAULT_LUX_WEIGHTS = "lux_weights", {}
+DOCS[CONF_LUX_WEIGHTS] = (
+    "Weights of the lux sensors for `lux_aggregation: weighted`, e.g., "
+    "`{sensor.window: 1, sensor.corner: 3}`. Sensors without a weight count as 1. ⚖️"
+)
+
 CONF_LUX_MIN, DEFAULT_LUX_MIN = "lux_min", 0
 DOCS[CONF_LUX_MIN] = (
     "Minimum lux level. Below this value, lights will be at maximum brightness. "
@@ -207,6 +243,25 @@ DOCS[CONF_LUX_MAX] = (
     "Only used when lux_sensor is configured. 🌞"
 )
 
+CONF_LUX_FILTER, DEFAULT_LUX_FILTER = "lux_filter", "none"
+DOCS[CONF_LUX_FILTER] = (
+    "How to smooth the lux sensor readings: `none` uses the latest reading, `ema` an "
+    "exponential moving average and `median` the median of the last "
+    "`lux_filter_window` readings. 📉"
+)
+
+CONF_LUX_FILTER_WINDOW, DEFAULT_LUX_FILTER_WINDOW = "lux_filter_window", 5
+DOCS[CONF_LUX_FILTER_WINDOW] = (
+    "Number of lux sensor readings that `lux_filter` smooths over. 🪟"
+)
+
+CONF_LUX_HYSTERESIS, DEFAULT_LUX_HYSTERESIS = "lux_hysteresis", 0
+DOCS[CONF_LUX_HYSTERESIS] = (
+    "Only use a new (smoothed) lux reading when it differs from the one in use by "
+    "more than this percentage of the `lux_min`-`lux_max` range, so small "
+    "fluctuations do not result in new commands. 0 to disable. 〰️"
+)
+
 CONF_TAKE_OVER_CONTROL, DEFAULT_TAKE_OVER_CONTROL = "take_over_control", True
 DOCS[CONF_TAKE_OVER_CONTROL] = (
     "Disable Adaptive Lighting if another source calls `light.turn_on` while lights "
@@ -273,6 +328,20 @@ DOCS[CONF_MULTI_LIGHT_INTERCEPT] = (
     "Requires `intercept` to be enabled."
 )
 
+CONF_COLLECT_METRICS, DEFAULT_COLLECT_METRICS = "collect_metrics", False
+DOCS[CONF_COLLECT_METRICS] = (
+    "Record latency histograms of intercepted calls and adaptations, "
+    "shown in the diagnostics and as diagnostic sensors of the first switch "
+    "that collects them. ⏱️"
+)
+
+CONF_WATCHDOG_THRESHOLD, DEFAULT_WATCHDOG_THRESHOLD = "watchdog_threshold", 0
+DOCS[CONF_WATCHDOG_THRESHOLD] = (
+    "Log a warning (and list it in the diagnostics) when an Adaptive Lighting "
+    "callback blocks the event loop for longer than this many milliseconds, "
+    "with the callback and the switch or lights involved. Set to 0 to disable. 🐕"
+)
+
 SLEEP_MODE_SWITCH = "sleep_mode_switch"
 ADAPT_COLOR_SWITCH = "adapt_color_switch"
 ADAPT_BRIGHTNESS_SWITCH = "adapt_brightness_switch"
@@ -297,6 +366,12 @@ DOCS[CONF_USE_DEFAULTS] = (
     '"current" (default, retains current values), "factory" (resets to '
     'documented defaults), or "configuration" (reverts to switch config defaults). ⚙️'
 )
+SERVICE_PROFILE = "profile"
+CONF_DURATION = "duration"
+DOCS[CONF_DURATION] = "Number of seconds to profile the integration for. ⏱️"
+CONF_TOP = "top"
+DOCS[CONF_TOP] = "Number of functions with the highest cumulative time to return. 🔥"
+SERVICE_RECORD_TRACE = "record_trace"
 
 TURNING_OFF_DELAY = 5
 
@@ -314,6 +389,10 @@ DOCS_APPLY = {
     CONF_LIGHTS: "A light (or list of lights) to apply the settings to. 💡",
 }
 
+DOCS_RECORD_TRACE = {
+    CONF_DURATION: "Number of seconds to record the events for. ⏱️",
+}
+
 
 def int_between(min_int, max_int):
     """Return an integer between 'min_int' and 'max_int'."""
@@ -379,8 +458,40 @@ VALIDATION_TUPLES = [
             selector.EntitySelectorConfig(domain="sensor"),
         ),
     ),
+    (
+        CONF_LUX_SENSORS,
+        DEFAULT_LUX_SENSORS,
+        selector.EntitySelector(
+            selector.EntitySelectorConfig(domain="sensor", multiple=True),
+        ),
+    ),
+    (
+        CONF_LUX_AGGREGATION,
+        DEFAULT_LUX_AGGREGATION,
+        selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=["min", "max", "mean", "median", "weighted"],
+                multiple=False,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            ),
+        ),
+    ),
+    (CONF_LUX_WEIGHTS, DEFAULT_LUX_WEIGHTS, selector.ObjectSelector()),
     (CONF_LUX_MIN, DEFAULT_LUX_MIN, int_between(0, 100000)),
     (CONF_LUX_MAX, DEFAULT_LUX_MAX, int_between(0, 100000)),
+    (
+        CONF_LUX_FILTER,
+        DEFAULT_LUX_FILTER,
+        selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=["none", "ema", "median"],
+                multiple=False,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            ),
+        ),
+    ),
+    (CONF_LUX_FILTER_WINDOW, DEFAULT_LUX_FILTER_WINDOW, int_between(1, 100)),
+    (CONF_LUX_HYSTERESIS, DEFAULT_LUX_HYSTERESIS, int_between(0, 50)),
     (CONF_TAKE_OVER_CONTROL, DEFAULT_TAKE_OVER_CONTROL, bool),
     (CONF_DETECT_NON_HA_CHANGES, DEFAULT_DETECT_NON_HA_CHANGES, bool),
     (
@@ -401,6 +512,24 @@ VALIDATION_TUPLES = [
     (CONF_INTERCEPT, DEFAULT_INTERCEPT, bool),
     (CONF_MULTI_LIGHT_INTERCEPT, DEFAULT_MULTI_LIGHT_INTERCEPT, bool),
     (CONF_INCLUDE_CONFIG_IN_ATTRIBUTES, DEFAULT_INCLUDE_CONFIG_IN_ATTRIBUTES, bool),
+    (
+        CONF_ATTRIBUTE_PROFILE,
+        DEFAULT_ATTRIBUTE_PROFILE,
+        selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=["full", "compact"],
+                multiple=False,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            ),
+        ),
+    ),
+    (
+        CONF_MIN_STATE_WRITE_INTERVAL,
+        DEFAULT_MIN_STATE_WRITE_INTERVAL,
+        int_between(0, 3600),
+    ),
+    (CONF_COLLECT_METRICS, DEFAULT_COLLECT_METRICS, bool),
+    (CONF_WATCHDOG_THRESHOLD, DEFAULT_WATCHDOG_THRESHOLD, int_between(0, 10000)),
 ]
 
 
@@ -426,6 +555,7 @@ EXTRA_VALIDATION = {
     CONF_MAX_SUNSET_TIME: (cv.time, str),
     CONF_BRIGHTNESS_MODE_TIME_LIGHT: (cv.time_period, timedelta_as_int),
     CONF_BRIGHTNESS_MODE_TIME_DARK: (cv.time_period, timedelta_as_int),
+    CONF_LUX_WEIGHTS: (vol.Schema({cv.entity_id: vol.Coerce(float)}), dict),
 }
 
 
@@ -480,3 +610,23 @@ SET_MANUAL_CONTROL_SCHEMA = vol.Schema(
         vol.Optional(CONF_MANUAL_CONTROL, default=True): cv.boolean,
     },
 )
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        # The profiler slows down the whole event loop, so keep it short
+        vol.Optional(CONF_DURATION, default=30): vol.All(
+            vol.Coerce(float),
+            vol.Range(min=1, max=300),
+        ),
+        vol.Optional(CONF_TOP, default=20): int_between(1, 200),
+    },
+)
+
+RECORD_TRACE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_DURATION, default=60): vol.All(
+            vol.Coerce(float),
+            vol.Range(min=1, max=3600),
+        ),
+    },
+)
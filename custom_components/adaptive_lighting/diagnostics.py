@@ -0,0 +1,156 @@
+"""Diagnostics support for Adaptive Lighting."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+
+from .const import ATTR_ADAPTIVE_LIGHTING_MANAGER, DOMAIN
+from .light_records import LightRecord
+from .switch import _context_id_infix, _which_short, parse_context_id
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .switch import AdaptiveLightingManager, AdaptiveSwitch
+
+# `LightRecord` attributes that hold a task or timer
+_TASK_ATTRS = (
+    "adaptation_task_brightness",
+    "adaptation_task_color",
+    "sleep_task",
+)
+_TIMER_ATTRS = (
+    "auto_reset_manual_control_timer",
+    "transition_timer",
+)
+
+
+def _record_sizes(records: dict[str, LightRecord]) -> dict[str, int]:
+    """Return the number of lights for which each record attribute is set."""
+    return {
+        attr: sum(
+            1
+            for record in records.values()
+            if getattr(record, attr) not in (None, False)
+        )
+        for attr in LightRecord.__slots__
+        if attr != "entity_id"
+    }
+
+
+def _running_tasks(records: dict[str, LightRecord]) -> dict[str, int]:
+    """Return the number of tasks and timers that did not finish yet."""
+    running = {
+        attr: sum(
+            1
+            for record in records.values()
+            if (task := getattr(record, attr)) is not None and not task.done()
+        )
+        for attr in _TASK_ATTRS
+    }
+    running.update(
+        {
+            attr: sum(
+                1
+                for record in records.values()
+                if (timer := getattr(record, attr)) is not None and timer.is_running()
+            )
+            for attr in _TIMER_ATTRS
+        },
+    )
+    return running
+
+
+def _manager_diagnostics(manager: AdaptiveLightingManager) -> dict[str, Any]:
+    records = manager.records
+    return {
+        "lights": len(manager.lights),
+        "records": len(records),
+        "record_attributes": _record_sizes(records),
+        "state_history_lengths": {
+            light: len(record.state_history)
+            for light, record in records.items()
+            if record.state_history is not None
+        },
+        "proactively_adapting_contexts": len(manager._proactively_adapting_contexts),
+        "adaptation_tasks": len(manager.adaptation_tasks),
+        "area_lights": len(manager._area_lights),
+        "listeners": len(manager.listener_removers),
+        "running": _running_tasks(records),
+        "event_loop_tasks": len(asyncio.all_tasks()),
+    }
+
+
+def _decisions(manager: AdaptiveLightingManager) -> dict[str, list[dict[str, Any]]]:
+    """Return the recent adaptation decisions per light."""
+    return {
+        light: [asdict(decision) for decision in record.decisions]
+        for light, record in manager.records.items()
+        if record.decisions
+    }
+
+
+def _cache_diagnostics(manager: AdaptiveLightingManager) -> dict[str, Any]:
+    caches = {
+        "area_lights": manager.area_lights_stats.as_dict(),
+        "capabilities": manager.capabilities_stats.as_dict(),
+        "target_payload": manager.target_payload_stats.as_dict(),
+    }
+    for name, func in (
+        ("parse_context_id", parse_context_id),
+        ("context_id_infix", _context_id_infix),
+        ("which_short", _which_short),
+    ):
+        info = func.cache_info()
+        total = info.hits + info.misses
+        caches[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": info.hits / total if total else None,
+            "size": info.currsize,
+        }
+    return caches
+
+
+def _switch_diagnostics(switch: AdaptiveSwitch) -> dict[str, Any]:
+    return {
+        "is_on": switch.is_on,
+        "lights": len(switch.lights),
+        "listeners": len(switch.remove_listeners),
+        "adaptation_interval": (
+            switch.adaptation_interval.total_seconds()
+            if switch.adaptation_interval is not None
+            else None
+        ),
+        "settings_version": switch._settings_version,
+        "counters": switch.counters.as_dict(),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data.get(DOMAIN, {})
+    manager = data.get(ATTR_ADAPTIVE_LIGHTING_MANAGER)
+    switch = data.get(config_entry.entry_id, {}).get(SWITCH_DOMAIN)
+    diagnostics: dict[str, Any] = {
+        "data": dict(config_entry.data),
+        "options": dict(config_entry.options),
+        "switch": _switch_diagnostics(switch) if switch is not None else None,
+    }
+    if manager is not None:
+        diagnostics.update(
+            manager=_manager_diagnostics(manager),
+            caches=_cache_diagnostics(manager),
+            decisions=_decisions(manager),
+            metrics=manager.metrics.as_dict(),
+            watchdog=manager.watchdog.as_dict(),
+        )
+    return diagnostics
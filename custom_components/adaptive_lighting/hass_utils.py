@@ -2,11 +2,13 @@
 
 import logging
 from collections.abc import Awaitable, Callable
+from time import perf_counter
 
 from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.util.read_only_dict import ReadOnlyDict
 
 from .adaptation_utils import ServiceData
+from .metrics import METRIC_SERVICE_CALL_PROXY, Metrics
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,11 +18,18 @@ def setup_service_call_interceptor(
     domain: str,
     service: str,
     intercept_func: Callable[[ServiceCall, ServiceData], Awaitable[None] | None],
+    should_intercept: Callable[[ServiceCall], bool] | None = None,
+    metrics: Metrics | None = None,
 ) -> Callable[[], None]:
     """Inject a function into a registered service call to preprocess service data.
 
     The injected interceptor function receives the service call and a writeable data dictionary
     (the data of the service call is read-only) before the service call is executed.
+
+    If 'should_intercept' is given, it is called first and when it returns False
+    the original service handler is called directly, without copying the data.
+    If 'metrics' is given, the time added before calling the original service
+    handler is recorded.
     """
     try:
         # HACK: Access protected attribute of HA service registry.
@@ -43,21 +52,25 @@ def setup_service_call_interceptor(
     existing_service = registered_services[domain][service]
 
     async def service_func_proxy(call: ServiceCall) -> None:
+        start = perf_counter()
         try:
-            # Convert read-only data to writeable dictionary for modification by interceptor
-            data = dict(call.data)
+            if should_intercept is None or should_intercept(call):
+                # Convert read-only data to writeable dictionary for modification by interceptor
+                data = dict(call.data)
 
-            # Call interceptor
-            await intercept_func(call, data)
+                # Call interceptor
+                await intercept_func(call, data)
 
-            # Convert data back to read-only
-            call.data = ReadOnlyDict(data)
+                # Convert data back to read-only
+                call.data = ReadOnlyDict(data)
         except Exception:
             # Blindly catch all exceptions to avoid breaking light.turn_on
             _LOGGER.exception(
                 "Error for call '%s' in service_func_proxy",
                 call.data,
             )
+        if metrics is not None:
+            metrics.record(METRIC_SERVICE_CALL_PROXY, perf_counter() - start)
         # Call original service handler with processed data
         await existing_service.job.target(call)
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import base64
 import math
+from typing import Any
 
 
 def clamp(value: float, minimum: float, maximum: float) -> float:
@@ -83,3 +84,14 @@ def color_difference_redmean(
     green_term = 4 * delta_g**2
     blue_term = (2 + (255 - r_hat) / 256) * delta_b**2
     return math.sqrt(red_term + green_term + blue_term)
+
+
+def round_floats(value: Any, ndigits: int) -> Any:
+    """Round the floats in 'value', also inside tuples, lists and dicts."""
+    if isinstance(value, float):
+        return round(value, ndigits)
+    if isinstance(value, tuple | list):
+        return type(value)(round_floats(x, ndigits) for x in value)
+    if isinstance(value, dict):
+        return {k: round_floats(v, ndigits) for k, v in value.items()}
+    return value
@@ -0,0 +1,475 @@
+"""Compact per-light records kept by the AdaptiveLightingManager."""
+
+from __future__ import annotations
+
+import datetime
+import logging
+from collections import deque
+from collections.abc import Mapping
+from copy import deepcopy
+from dataclasses import dataclass
+from time import time
+from typing import TYPE_CHECKING, Any, Literal
+
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_COLOR_TEMP_KELVIN,
+    ATTR_MAX_COLOR_TEMP_KELVIN,
+    ATTR_MIN_COLOR_TEMP_KELVIN,
+    ATTR_RGB_COLOR,
+    ATTR_SUPPORTED_COLOR_MODES,
+    ATTR_TRANSITION,
+    ColorMode,
+    LightEntityFeature,
+)
+from homeassistant.const import ATTR_SERVICE_DATA, ATTR_SUPPORTED_FEATURES
+from homeassistant.core import Context
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Iterator
+
+    from homeassistant.core import Event, State
+    from homeassistant.util.read_only_dict import ReadOnlyDict
+
+    from .switch import _AsyncSingleShotTimer
+
+_LOGGER = logging.getLogger(__name__)
+
+# State attributes that determine the capabilities of a light
+CAPABILITY_ATTRS = (
+    ATTR_SUPPORTED_FEATURES,
+    ATTR_SUPPORTED_COLOR_MODES,
+    ATTR_MIN_COLOR_TEMP_KELVIN,
+    ATTR_MAX_COLOR_TEMP_KELVIN,
+)
+
+_COLOR_MODES = {
+    ColorMode.RGB,
+    ColorMode.RGBW,
+    ColorMode.RGBWW,
+    ColorMode.XY,
+    ColorMode.HS,
+}
+
+# Number of state reports kept per light. A single adaptation with a long
+# transition typically results in a handful of reports, so this is plenty.
+STATE_HISTORY_SIZE = 10
+
+# Number of adaptation decisions kept per light
+DECISION_HISTORY_SIZE = 20
+
+# How far apart the moment a `TargetPayload` was computed for and the moment a
+# turn on is adapted for may be. It does not depend on the interval, because
+# that can be several minutes.
+TARGET_PAYLOAD_MAX_AGE = datetime.timedelta(seconds=30)
+
+# Whether a light was adapted, see `Decision`
+DECISION_ADAPT = "adapt"
+DECISION_SKIP = "skip"
+
+# Reasons of the decisions
+REASON_UPDATE = "update"
+REASON_INTERCEPTED = "intercepted"
+REASON_TRANSITIONING = "transitioning"
+REASON_JUST_TURNED_OFF = "just_turned_off"
+REASON_MANUAL_CONTROL = "manual_control"
+REASON_SIGNIFICANT_CHANGE = "significant_change"
+REASON_TURN_OFF_LOCK = "turn_off_lock"
+REASON_NOTHING_TO_ADAPT = "nothing_to_adapt"
+REASON_SWITCH_OFF = "switch_off"
+REASON_INTERCEPT_DISABLED = "intercept_disabled"
+REASON_LIGHT_GROUP = "light_group"
+REASON_ALREADY_ON = "already_on"
+REASON_NON_BARE_TURN_ON = "non_bare_turn_on"
+REASON_MULTI_LIGHT_INTERCEPT = "multi_light_intercept"
+
+
+@dataclass(frozen=True, slots=True)
+class StateSnapshot:
+    """The parts of a light `State` that we need to remember."""
+
+    context_id: str | None
+    brightness: int | None
+    color_temp_kelvin: int | None
+    rgb_color: tuple[int, int, int] | None
+    timestamp: float
+
+    @classmethod
+    def from_state(cls, state: State) -> StateSnapshot:
+        """Create a snapshot from a `State` without keeping a reference to it."""
+        attributes = state.attributes
+        return cls(
+            context_id=state.context.id,
+            brightness=attributes.get(ATTR_BRIGHTNESS),
+            color_temp_kelvin=attributes.get(ATTR_COLOR_TEMP_KELVIN),
+            rgb_color=attributes.get(ATTR_RGB_COLOR),
+            timestamp=state.last_updated.timestamp(),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class LightCapabilities:
+    """What a light supports, derived from its state attributes."""
+
+    features: frozenset[str]
+    min_kelvin: int | None
+    max_kelvin: int | None
+
+    @classmethod
+    def from_state(cls, state: State) -> LightCapabilities:
+        """Determine the capabilities of the light with 'state'."""
+        attributes = state.attributes
+        supported_features = attributes.get(ATTR_SUPPORTED_FEATURES, 0)
+        assert isinstance(supported_features, int)
+
+        supported = set()
+
+        if supported_features & LightEntityFeature.TRANSITION:
+            supported.add("transition")
+
+        supported_color_modes = attributes.get(ATTR_SUPPORTED_COLOR_MODES) or set()
+
+        # Adding brightness when color mode is supported, see
+        # comment https://github.com/basnijholt/adaptive-lighting/issues/112#issuecomment-836944011
+        if not _COLOR_MODES.isdisjoint(supported_color_modes):
+            supported.update({"color", "brightness"})
+
+        if ColorMode.COLOR_TEMP in supported_color_modes:
+            supported.update({"color_temp", "brightness"})
+
+        if ColorMode.BRIGHTNESS in supported_color_modes:
+            supported.add("brightness")
+
+        return cls(
+            features=frozenset(supported),
+            min_kelvin=attributes.get(ATTR_MIN_COLOR_TEMP_KELVIN),
+            max_kelvin=attributes.get(ATTR_MAX_COLOR_TEMP_KELVIN),
+        )
+
+    @property
+    def supports_transition(self) -> bool:
+        """Whether the light supports transitions."""
+        return "transition" in self.features
+
+    @property
+    def supports_brightness(self) -> bool:
+        """Whether the light supports brightness."""
+        return "brightness" in self.features
+
+    @property
+    def supports_color(self) -> bool:
+        """Whether the light supports RGB, XY, or HS colors."""
+        return "color" in self.features
+
+    @property
+    def supports_color_temp(self) -> bool:
+        """Whether the light supports color temperatures."""
+        return "color_temp" in self.features
+
+
+def capability_attributes_changed(
+    old_attributes: ReadOnlyDict[str, Any],
+    new_attributes: ReadOnlyDict[str, Any],
+) -> bool:
+    """Whether any of the attributes in `CAPABILITY_ATTRS` changed."""
+    return any(
+        old_attributes.get(attr) != new_attributes.get(attr)
+        for attr in CAPABILITY_ATTRS
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class TargetPayload:
+    """Light attributes an `AdaptiveSwitch` computed for a light.
+
+    The attributes exclude the entity id and transition. `key` holds the
+    inputs that were used, the payload can only be reused if they match.
+    `settings_time` is the moment the settings were computed for, which is
+    the time of the computation plus the transition.
+    """
+
+    key: tuple[Any, ...]
+    attributes: dict[str, Any]
+    settings_time: datetime.datetime
+
+    def is_valid(self, key: tuple[Any, ...], settings_time: datetime.datetime) -> bool:
+        """Whether the payload can be used for 'key' at 'settings_time'."""
+        return (
+            self.key == key
+            and abs(settings_time - self.settings_time) <= TARGET_PAYLOAD_MAX_AGE
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class EventSnapshot:
+    """The parts of a service call or state change `Event` that we need to remember.
+
+    Keeping the full `Event` around would also keep its service data and the
+    old and new `State` objects alive.
+    """
+
+    context_id: str
+    parent_id: str | None
+    user_id: str | None
+    time_fired: datetime.datetime
+    transition: float | None = None
+    service_data_keys: frozenset[str] = frozenset()
+
+    @classmethod
+    def from_event(cls, event: Event) -> EventSnapshot:
+        """Create a snapshot from an `Event` without keeping a reference to it."""
+        context = event.context
+        service_data = event.data.get(ATTR_SERVICE_DATA) or {}
+        return cls(
+            context_id=context.id,
+            parent_id=context.parent_id,
+            user_id=context.user_id,
+            time_fired=event.time_fired,
+            transition=service_data.get(ATTR_TRANSITION),
+            service_data_keys=frozenset(service_data),
+        )
+
+    @property
+    def context(self) -> Context:
+        """Return a new `Context` equal to the one of the original event."""
+        return Context(
+            user_id=self.user_id,
+            parent_id=self.parent_id,
+            id=self.context_id,
+        )
+
+
+class StateHistory:
+    """Fixed-capacity ring buffer of the state reports following one adaptation.
+
+    The buffer is started with the first state change caused by an adaptation
+    and subsequent reports are appended. Once full, the oldest reports are
+    dropped, however, `context_id` always refers to the adaptation that
+    started the history.
+    """
+
+    __slots__ = ("_snapshots", "context_id")
+
+    def __init__(
+        self,
+        first: StateSnapshot,
+        maxlen: int = STATE_HISTORY_SIZE,
+    ) -> None:
+        """Start a new history with the state change of an adaptation."""
+        self.context_id = first.context_id
+        self._snapshots: deque[StateSnapshot] = deque((first,), maxlen=maxlen)
+
+    def append(self, snapshot: StateSnapshot) -> None:
+        """Add a state report, dropping the oldest one if the buffer is full."""
+        self._snapshots.append(snapshot)
+
+    @property
+    def last(self) -> StateSnapshot:
+        """Return the most recent state report."""
+        return self._snapshots[-1]
+
+    def __len__(self) -> int:
+        """Return the number of stored state reports."""
+        return len(self._snapshots)
+
+    def __iter__(self) -> Iterator[StateSnapshot]:
+        """Iterate over the stored state reports, oldest first."""
+        return iter(self._snapshots)
+
+    def __getitem__(self, index: int) -> StateSnapshot:
+        """Return the state report at 'index'."""
+        return self._snapshots[index]
+
+    def __repr__(self) -> str:
+        """Return a string representation of the history."""
+        return (
+            f"{self.__class__.__name__}("
+            f"context_id={self.context_id}, "
+            f"len={len(self)}"
+            ")"
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Decision:
+    """Why a light was (or was not) adapted."""
+
+    timestamp: float
+    context_id: str | None
+    switch: str | None
+    decision: str
+    reason: str
+
+
+class LightRecord:
+    """Everything the manager tracks for a single light.
+
+    Keeping this in one slotted object (instead of a dict per attribute)
+    means the event handlers only need a single lookup per light.
+    """
+
+    __slots__ = (
+        "adaptation_task_brightness",
+        "adaptation_task_color",
+        "auto_reset_manual_control_time",
+        "auto_reset_manual_control_timer",
+        "capabilities",
+        "decisions",
+        "entity_id",
+        "last_service_data",
+        "manual_control",
+        "off_to_on_event",
+        "on_to_off_event",
+        "sleep_task",
+        "state_history",
+        "target_payload",
+        "toggle_event",
+        "transition_timer",
+        "turn_off_event",
+        "turn_off_lock",
+        "turn_on_event",
+    )
+
+    def __init__(self, entity_id: str) -> None:
+        """Initialize an empty record for 'entity_id'."""
+        self.entity_id = entity_id
+        # Last 'light.turn_off', 'light.turn_on', and 'light.toggle' service calls
+        self.turn_off_event: EventSnapshot | None = None
+        self.turn_on_event: EventSnapshot | None = None
+        self.toggle_event: EventSnapshot | None = None
+        # Last 'on' → 'off' and 'off' → 'on' state changes
+        self.on_to_off_event: EventSnapshot | None = None
+        self.off_to_on_event: EventSnapshot | None = None
+        # 'asyncio.sleep' task that can be cancelled by 'light.turn_on' events
+        self.sleep_task: asyncio.Task | None = None
+        # Lock that prevents adjusting the light when waiting for it to 'turn_off'
+        self.turn_off_lock: asyncio.Lock | None = None
+        # Whether the light is manually controlled
+        self.manual_control: bool = False
+        # 'state_changed' events resulting from this integration
+        self.state_history: StateHistory | None = None
+        # Last 'service_data' to 'light.turn_on' resulting from this integration
+        self.last_service_data: dict[str, Any] | None = None
+        # Ongoing (split) adaptations, to be able to cancel them
+        self.adaptation_task_brightness: asyncio.Task | None = None
+        self.adaptation_task_color: asyncio.Task | None = None
+        # Auto reset of manual_control
+        self.auto_reset_manual_control_timer: _AsyncSingleShotTimer | None = None
+        self.auto_reset_manual_control_time: float | None = None
+        # Light transitions
+        self.transition_timer: _AsyncSingleShotTimer | None = None
+        # Cached capabilities, cleared when the relevant state attributes change
+        self.capabilities: LightCapabilities | None = None
+        # Target attributes of the last update, reused by intercepted calls
+        self.target_payload: TargetPayload | None = None
+        # Last adaptation decisions, created on the first decision
+        self.decisions: deque[Decision] | None = None
+
+    def add_decision(
+        self,
+        decision: str,
+        reason: str,
+        context_id: str | None,
+        switch: str | None = None,
+    ) -> None:
+        """Add a decision to the bounded decision history."""
+        decisions = self.decisions
+        if decisions is None:
+            decisions = self.decisions = deque(maxlen=DECISION_HISTORY_SIZE)
+        decisions.append(Decision(time(), context_id, switch, decision, reason))
+
+    def cancel_adaptation_tasks(
+        self,
+        which: Literal["color", "brightness", "both"] = "both",
+    ) -> None:
+        """Cancel ongoing adaptation service calls."""
+        brightness_task = self.adaptation_task_brightness
+        color_task = self.adaptation_task_color
+        if (
+            which in ("both", "brightness")
+            and brightness_task is not None
+            and not brightness_task.done()
+        ):
+            _LOGGER.debug(
+                "Cancelled ongoing brightness adaptation calls (%s) for '%s'",
+                brightness_task,
+                self.entity_id,
+            )
+            brightness_task.cancel()
+        if (
+            which in ("both", "color")
+            and color_task is not None
+            and color_task is not brightness_task
+            and not color_task.done()
+        ):
+            _LOGGER.debug(
+                "Cancelled ongoing color adaptation calls (%s) for '%s'",
+                color_task,
+                self.entity_id,
+            )
+            # color_task might be the same as brightness_task
+            color_task.cancel()
+
+    def reset(self, reset_manual_control: bool = True) -> None:
+        """Reset the 'manual_control' status and the adaptation history."""
+        if reset_manual_control:
+            self.manual_control = False
+            if (timer := self.auto_reset_manual_control_timer) is not None:
+                self.auto_reset_manual_control_timer = None
+                timer.cancel()
+        self.state_history = None
+        self.last_service_data = None
+        self.cancel_adaptation_tasks()
+
+    def close(self) -> None:
+        """Cancel all tasks and timers, before the record is dropped."""
+        self.reset()
+        if (task := self.sleep_task) is not None:
+            self.sleep_task = None
+            task.cancel()
+        if (timer := self.transition_timer) is not None:
+            self.transition_timer = None
+            timer.cancel()
+
+
+class RecordAttributeView(Mapping[str, Any]):
+    """Read-only `light → attribute` mapping over a dict of `LightRecord`s.
+
+    Lights for which the attribute is unset (`None`) are not included.
+    """
+
+    __slots__ = ("_attribute", "_records")
+
+    def __init__(self, records: dict[str, LightRecord], attribute: str) -> None:
+        """Initialize the view on 'attribute' of 'records'."""
+        self._records = records
+        self._attribute = attribute
+
+    def __getitem__(self, light: str) -> Any:
+        """Return the attribute of the record of 'light'."""
+        value = getattr(self._records[light], self._attribute)
+        if value is None:
+            raise KeyError(light)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the lights that have the attribute set."""
+        attribute = self._attribute
+        return (
+            light
+            for light, record in self._records.items()
+            if getattr(record, attribute) is not None
+        )
+
+    def __len__(self) -> int:
+        """Return the number of lights that have the attribute set."""
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the view."""
+        return repr(dict(self))
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        """Return a deep copy as a plain dict."""
+        return deepcopy(dict(self), memo)
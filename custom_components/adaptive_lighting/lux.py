@@ -0,0 +1,132 @@
+"""Smoothing, hysteresis and aggregation for the readings of lux sensors."""
+
+from __future__ import annotations
+
+import statistics
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+LUX_FILTER_NONE = "none"
+LUX_FILTER_EMA = "ema"
+LUX_FILTER_MEDIAN = "median"
+LUX_FILTERS = [LUX_FILTER_NONE, LUX_FILTER_EMA, LUX_FILTER_MEDIAN]
+
+LUX_AGGREGATION_MIN = "min"
+LUX_AGGREGATION_MAX = "max"
+LUX_AGGREGATION_MEAN = "mean"
+LUX_AGGREGATION_MEDIAN = "median"
+LUX_AGGREGATION_WEIGHTED = "weighted"
+LUX_AGGREGATIONS = [
+    LUX_AGGREGATION_MIN,
+    LUX_AGGREGATION_MAX,
+    LUX_AGGREGATION_MEAN,
+    LUX_AGGREGATION_MEDIAN,
+    LUX_AGGREGATION_WEIGHTED,
+]
+
+# Smallest changes in the settings for which a lux sensor update adapts the lights
+LUX_BRIGHTNESS_PCT_STEP = 1.0
+LUX_COLOR_TEMP_KELVIN_STEP = 50
+
+
+class LuxFilter:
+    """Filter the readings of one lux sensor.
+
+    The readings are smoothed with an exponential moving average (EMA) or the
+    median of the last 'window' readings. The output only follows the smoothed
+    value once it differs by more than 'band' lux from the previous output, so
+    a noisy sensor does not result in new light settings on every update.
+    """
+
+    __slots__ = ("_ema", "_last_timestamp", "_samples", "band", "mode", "output")
+
+    def __init__(self, mode: str, window: int, band: float = 0.0) -> None:
+        """Initialize the filter without any readings."""
+        if mode not in LUX_FILTERS:
+            msg = f"Unknown lux filter '{mode}', expected one of {LUX_FILTERS}"
+            raise ValueError(msg)
+        self.mode = mode
+        self.band = band
+        self.output: float | None = None
+        self._samples: deque[float] = deque(maxlen=max(1, window))
+        self._ema: float | None = None
+        self._last_timestamp: float | None = None
+
+    def _smooth(self, value: float) -> float:
+        if self.mode == LUX_FILTER_EMA:
+            if self._ema is None:
+                self._ema = value
+            else:
+                alpha = 2 / (self._samples.maxlen + 1)
+                self._ema += alpha * (value - self._ema)
+            return self._ema
+        self._samples.append(value)
+        if self.mode == LUX_FILTER_MEDIAN:
+            return statistics.median(self._samples)
+        return value
+
+    def update(self, value: float, timestamp: float | None = None) -> float:
+        """Add a reading and return the filtered output.
+
+        A reading with the same 'timestamp' as the previous one is the same
+        sensor state read again (e.g., once for every light) and is not added.
+        """
+        if timestamp is None or timestamp != self._last_timestamp:
+            self._last_timestamp = timestamp
+            smoothed = self._smooth(value)
+            if self.output is None or abs(smoothed - self.output) > self.band:
+                self.output = smoothed
+        return self.output
+
+    def reset(self) -> None:
+        """Forget all readings, e.g., when the sensor became unavailable."""
+        self.output = None
+        self._samples.clear()
+        self._ema = None
+        self._last_timestamp = None
+
+
+def aggregate_lux(
+    readings: Mapping[str, float],
+    mode: str,
+    weights: Mapping[str, float] | None = None,
+) -> float | None:
+    """Combine the readings of several sensors into one, None without readings."""
+    if not readings:
+        return None
+    values = list(readings.values())
+    if mode == LUX_AGGREGATION_MIN:
+        return min(values)
+    if mode == LUX_AGGREGATION_MAX:
+        return max(values)
+    if mode == LUX_AGGREGATION_MEDIAN:
+        return statistics.median(values)
+    if mode == LUX_AGGREGATION_WEIGHTED and weights:
+        total = sum(weights.get(sensor, 1.0) for sensor in readings)
+        if total > 0:
+            return (
+                sum(
+                    weights.get(sensor, 1.0) * value
+                    for sensor, value in readings.items()
+                )
+                / total
+            )
+    return statistics.fmean(values)
+
+
+def lux_settings_changed(old: Mapping[str, Any], new: Mapping[str, Any]) -> bool:
+    """Return whether the light settings for a new lux reading differ noticeably."""
+    for key, step in (
+        ("brightness_pct", LUX_BRIGHTNESS_PCT_STEP),
+        ("color_temp_kelvin", LUX_COLOR_TEMP_KELVIN_STEP),
+    ):
+        old_value, new_value = old.get(key), new.get(key)
+        if old_value is None or new_value is None:
+            if old_value != new_value:
+                return True
+        elif abs(new_value - old_value) >= step:
+            return True
+    return False
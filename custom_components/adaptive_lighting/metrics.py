@@ -0,0 +1,248 @@
+"""Low-overhead latency metrics for Adaptive Lighting."""
+
+from __future__ import annotations
+
+import functools
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Concatenate, ParamSpec, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator
+    from contextlib import AbstractContextManager
+
+# Upper bounds (in milliseconds) of the histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS_MS = (
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+)
+
+# Names of the measured code paths
+METRIC_SERVICE_CALL_PROXY = "service_call_proxy"
+METRIC_INTERCEPT_TURN_ON = "intercept_turn_on"
+METRIC_PREPARE_ADAPTATION_DATA = "prepare_adaptation_data"
+METRIC_LIGHT_TURN_ON = "light_turn_on"
+LATENCY_METRICS = (
+    METRIC_SERVICE_CALL_PROXY,
+    METRIC_INTERCEPT_TURN_ON,
+    METRIC_PREPARE_ADAPTATION_DATA,
+    METRIC_LIGHT_TURN_ON,
+)
+
+# Counters of an AdaptiveSwitch, see `AdaptationCounters`
+COUNTER_TICKS = "ticks"
+COUNTER_LIGHTS_EVALUATED = "lights_evaluated"
+COUNTER_COMMANDS_SENT = "commands_sent"
+COUNTER_REDUNDANT_SKIPPED = "redundant_skipped"
+COUNTER_MANUAL_CONTROL_SKIPPED = "manual_control_skipped"
+COUNTER_TRANSITION_SKIPPED = "transition_skipped"
+COUNTER_CANCELLATIONS = "cancellations"
+COUNTER_STATE_WRITES_UNCHANGED = "state_writes_unchanged"
+COUNTER_STATE_WRITES_THROTTLED = "state_writes_throttled"
+COUNTER_TICK_DURATION = "tick_duration"
+COUNTERS = (
+    COUNTER_TICKS,
+    COUNTER_LIGHTS_EVALUATED,
+    COUNTER_COMMANDS_SENT,
+    COUNTER_REDUNDANT_SKIPPED,
+    COUNTER_MANUAL_CONTROL_SKIPPED,
+    COUNTER_TRANSITION_SKIPPED,
+    COUNTER_CANCELLATIONS,
+    COUNTER_STATE_WRITES_UNCHANGED,
+    COUNTER_STATE_WRITES_THROTTLED,
+    COUNTER_TICK_DURATION,
+)
+
+_NULL_CONTEXT = nullcontext()
+
+
+class LatencyHistogram:
+    """Histogram with fixed buckets, so recording is O(log(buckets)) and memory is constant."""
+
+    __slots__ = ("count", "counts", "max", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add a measurement."""
+        milliseconds = seconds * 1000
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, milliseconds)] += 1
+        self.count += 1
+        self.total += milliseconds
+        self.max = max(self.max, milliseconds)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return an upper bound (in ms) for the 'percentile' (0-100) of the measurements.
+
+        This is the upper bound of the bucket that contains the percentile, or
+        the maximum for the unbounded bucket.
+        """
+        if not self.count:
+            return None
+        rank = percentile / 100 * self.count
+        cumulative = 0
+        for upper_bound, count in zip(LATENCY_BUCKETS_MS, self.counts, strict=False):
+            cumulative += count
+            if cumulative >= rank:
+                return min(upper_bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of the histogram."""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else None,
+            "max_ms": self.max if self.count else None,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+        }
+
+
+class Metrics:
+    """Latency histograms of the integration, only recorded when enabled."""
+
+    def __init__(self) -> None:
+        """Initialize disabled metrics."""
+        self.enabled = False
+        self.histograms: dict[str, LatencyHistogram] = {}
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """Return the histogram for 'name', creating it if needed."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        return histogram
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record a measurement of 'seconds' for 'name' if enabled."""
+        if self.enabled:
+            self.histogram(name).record(seconds)
+
+    def time(self, name: str) -> AbstractContextManager[None]:
+        """Return a context manager that records the time spent inside it."""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._time(name)
+
+    @contextmanager
+    def _time(self, name: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name).record(perf_counter() - start)
+
+    def reset(self) -> None:
+        """Remove all measurements."""
+        self.histograms.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of all histograms."""
+        return {
+            "enabled": self.enabled,
+            "latency": {
+                name: histogram.as_dict()
+                for name, histogram in sorted(self.histograms.items())
+            },
+        }
+
+
+@dataclass(slots=True)
+class AdaptationCounters:
+    """Counters of what an AdaptiveSwitch did, always recorded because they are cheap."""
+
+    # Calls of `_update_attrs_and_maybe_adapt_lights`
+    ticks: int = 0
+    # Lights that were on during a tick
+    lights_evaluated: int = 0
+    # `light.turn_on` calls made to adapt lights
+    commands_sent: int = 0
+    # Split commands not sent because the light already had the target state
+    redundant_skipped: int = 0
+    # Lights not adapted because they are manually controlled
+    manual_control_skipped: int = 0
+    # Lights not adapted because they were still transitioning
+    transition_skipped: int = 0
+    # Adaptations cancelled by a newer adaptation or turning the light off
+    cancellations: int = 0
+    # Switch state writes of ticks that were skipped because nothing changed
+    state_writes_unchanged: int = 0
+    # Switch state writes of ticks that were postponed by `min_state_write_interval`
+    state_writes_throttled: int = 0
+    # Duration of the last tick until all adaptations were dispatched, in ms
+    tick_duration: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as a dictionary."""
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Hits and misses of one of the caches."""
+
+    hits: int = 0
+    misses: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counts and the hit rate."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else None,
+        }
+
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+_T = TypeVar("_T")
+
+
+def timed(
+    name: str,
+) -> Callable[
+    [Callable[Concatenate[_T, _P], Awaitable[_R]]],
+    Callable[Concatenate[_T, _P], Awaitable[_R]],
+]:
+    """Record the duration of an async method of an object with a `metrics` attribute."""
+
+    def decorator(
+        func: Callable[Concatenate[_T, _P], Awaitable[_R]],
+    ) -> Callable[Concatenate[_T, _P], Awaitable[_R]]:
+        @functools.wraps(func)
+        async def wrapper(self: _T, *args: _P.args, **kwargs: _P.kwargs) -> _R:
+            metrics: Metrics = self.metrics  # type: ignore[attr-defined]
+            if not metrics.enabled:
+                return await func(self, *args, **kwargs)
+            start = perf_counter()
+            try:
+                return await func(self, *args, **kwargs)
+            finally:
+                metrics.record(name, perf_counter() - start)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,88 @@
+"""On-demand profiling of the Adaptive Lighting integration."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import logging
+import pstats
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import homeassistant.util.dt as dt_util
+from homeassistant.exceptions import HomeAssistantError
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Only functions defined in this directory are reported
+INTEGRATION_DIR = str(Path(__file__).parent)
+PROFILE_FILENAME = "adaptive_lighting_profile_{}.prof"
+
+_profile_lock = asyncio.Lock()
+
+
+class ProfilerBusyError(HomeAssistantError):
+    """A profile is already being recorded."""
+
+
+def _integration_functions(stats: pstats.Stats, top: int) -> list[dict[str, Any]]:
+    """Return the 'top' integration functions with the highest cumulative time."""
+    functions = []
+    for func, (_, calls, tottime, cumtime, _) in stats.stats.items():  # type: ignore[attr-defined]
+        filename, line, name = func
+        if not filename.startswith(INTEGRATION_DIR):
+            continue
+        functions.append(
+            {
+                "function": f"{Path(filename).name}:{line}({name})",
+                "calls": calls,
+                "total_time": tottime,
+                "cumulative_time": cumtime,
+            },
+        )
+    functions.sort(key=lambda f: f["cumulative_time"], reverse=True)
+    return functions[:top]
+
+
+def _write_stats(
+    profiler: cProfile.Profile,
+    path: str,
+    top: int,
+) -> list[dict[str, Any]]:
+    """Write the stats to 'path' and return the hottest integration functions."""
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(path)
+    return _integration_functions(stats, top)
+
+
+async def async_profile(
+    hass: HomeAssistant,
+    duration: float,
+    top: int,
+) -> dict[str, Any]:
+    """Profile the event loop for 'duration' seconds.
+
+    The profiler only sees the thread it is enabled in, which is the event loop
+    running all callbacks of the integration. The complete stats are written to
+    the config directory, only the integration's functions are returned. The
+    profiler slows down every callback in the event loop while it is enabled.
+    """
+    if _profile_lock.locked():
+        msg = "Adaptive Lighting is already being profiled"
+        raise ProfilerBusyError(msg)
+    async with _profile_lock:
+        _LOGGER.debug("Profiling Adaptive Lighting for %s seconds", duration)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profiler.disable()
+        timestamp = dt_util.utcnow().strftime("%Y%m%d_%H%M%S")
+        path = hass.config.path(PROFILE_FILENAME.format(timestamp))
+        functions = await hass.async_add_executor_job(_write_stats, profiler, path, top)
+    _LOGGER.debug("Wrote Adaptive Lighting profile to '%s'", path)
+    return {"path": path, "duration": duration, "functions": functions}
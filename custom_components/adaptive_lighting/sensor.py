@@ -0,0 +1,195 @@
+"""Diagnostic sensors for Adaptive Lighting."""
+
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import (
+    CONF_NAME,
+    MAJOR_VERSION,
+    MINOR_VERSION,
+    EntityCategory,
+    UnitOfTime,
+)
+from homeassistant.core import callback
+
+if [MAJOR_VERSION, MINOR_VERSION] < [2023, 9]:
+    from homeassistant.helpers.entity import DeviceInfo
+else:
+    from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import slugify
+
+from .const import ATTR_ADAPTIVE_LIGHTING_MANAGER, CONF_COLLECT_METRICS, DOMAIN
+from .metrics import COUNTER_TICK_DURATION, COUNTERS, LATENCY_METRICS
+from .switch import validate
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+_LOGGER = logging.getLogger(__name__)
+
+# States are refreshed at most this often, not on every adaptation
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+):
+    """Set up the Adaptive Lighting diagnostic sensors."""
+    data = validate(config_entry)
+    name = data[CONF_NAME]
+    entities: list[AdaptiveLightingSensor] = [
+        CounterSensor(hass, name, config_entry.entry_id, counter)
+        for counter in COUNTERS
+    ]
+    if _latency_sensors_entry_id(hass) == config_entry.entry_id:
+        entities.extend(LatencySensor(hass, name, metric) for metric in LATENCY_METRICS)
+    async_add_entities(entities)
+
+
+def _latency_sensors_entry_id(hass: HomeAssistant) -> str | None:
+    """Return the config entry that gets the latency sensors.
+
+    The histograms are shared by all switches, so only the first config entry
+    that collects metrics gets the sensors.
+    """
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.disabled_by is None and validate(entry)[CONF_COLLECT_METRICS]:
+            return entry.entry_id
+    return None
+
+
+class AdaptiveLightingSensor(SensorEntity, ABC):
+    """Diagnostic sensor that is refreshed periodically."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+
+    def __init__(self, hass: HomeAssistant, config_name: str, which: str) -> None:
+        """Initialize the sensor."""
+        self.hass = hass
+        self._config_name = config_name
+        self._unique_id = f"{config_name}_{slugify(which)}"
+        self._name = f"Adaptive Lighting {which}: {config_name}"
+
+    @property
+    def name(self):
+        """Return the name of the device if any."""
+        return self._name
+
+    @property
+    def unique_id(self):
+        """Return the unique ID of entity."""
+        return self._unique_id
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info, used to group this and adjacent entities in the UI."""
+        return DeviceInfo(
+            identifiers={
+                (DOMAIN, self._config_name),
+            },
+            name=f"Adaptive Lighting: {self._config_name}",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh the state periodically instead of on every change."""
+        self._refresh()
+        self.async_on_remove(
+            async_track_time_interval(self.hass, self._refresh, SCAN_INTERVAL),
+        )
+
+    @abstractmethod
+    def _update(self) -> bool:
+        """Update the cached state, return whether it changed."""
+
+    @callback
+    def _refresh(self, _=None) -> None:
+        if self._update():
+            self.async_write_ha_state()
+
+
+class CounterSensor(AdaptiveLightingSensor):
+    """One of the `AdaptationCounters` of an AdaptiveSwitch."""
+
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_name: str,
+        entry_id: str,
+        counter: str,
+    ) -> None:
+        """Initialize the counter sensor."""
+        super().__init__(hass, config_name, counter.replace("_", " ").title())
+        self._entry_id = entry_id
+        self._counter = counter
+        self._value: float | None = None
+        if counter == COUNTER_TICK_DURATION:
+            self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+            self._attr_icon = "mdi:timer-outline"
+        else:
+            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+            self._attr_icon = "mdi:counter"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the value of the counter."""
+        return self._value
+
+    def _update(self) -> bool:
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self._entry_id, {})
+        switch = entry_data.get(SWITCH_DOMAIN)
+        value = None if switch is None else getattr(switch.counters, self._counter)
+        if value == self._value:
+            return False
+        self._value = value
+        return True
+
+
+class LatencySensor(AdaptiveLightingSensor):
+    """95th percentile latency of one of the measured code paths."""
+
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, hass: HomeAssistant, config_name: str, metric: str) -> None:
+        """Initialize the latency sensor."""
+        super().__init__(hass, config_name, f"Latency {metric.replace('_', ' ')}")
+        self._metric = metric
+        self._summary: dict[str, Any] = {}
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the 95th percentile latency in milliseconds."""
+        return self._summary.get("p95_ms")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the other statistics of the histogram."""
+        return {k: v for k, v in self._summary.items() if k != "p95_ms"}
+
+    def _update(self) -> bool:
+        manager = self.hass.data.get(DOMAIN, {}).get(ATTR_ADAPTIVE_LIGHTING_MANAGER)
+        histograms = {} if manager is None else manager.metrics.histograms
+        histogram = histograms.get(self._metric)
+        summary = histogram.as_dict() if histogram is not None else {}
+        if summary == self._summary:
+            return False
+        self._summary = summary
+        return True
@@ -8,6 +8,8 @@ import logging
 import zoneinfo
 from copy import deepcopy
 from datetime import timedelta
+from functools import cache, lru_cache
+from time import perf_counter
 from typing import TYPE_CHECKING, Any, Literal
 
 import homeassistant.helpers.config_validation as cv
@@ -20,11 +22,8 @@ from homeassistant.components.light import (
     ATTR_EFFECT,
     ATTR_FLASH,
     ATTR_RGB_COLOR,
-    ATTR_SUPPORTED_COLOR_MODES,
     ATTR_TRANSITION,
     ATTR_XY_COLOR,
-    ColorMode,
-    LightEntityFeature,
     is_on,
     preprocess_turn_on_alternatives,
 )
@@ -38,7 +37,6 @@ from homeassistant.const import (
     ATTR_ENTITY_ID,
     ATTR_SERVICE,
     ATTR_SERVICE_DATA,
-    ATTR_SUPPORTED_FEATURES,
     CONF_NAME,
     CONF_PARAMS,
     EVENT_CALL_SERVICE,
@@ -58,18 +56,25 @@ from homeassistant.core import (
     Event,
     HomeAssistant,
     ServiceCall,
+    ServiceResponse,
     State,
+    SupportsResponse,
     callback,
 )
 from homeassistant.helpers import entity_platform, entity_registry
+from homeassistant.helpers.area_registry import EVENT_AREA_REGISTRY_UPDATED
 from homeassistant.helpers.entity_component import async_update_entity
 
 if [MAJOR_VERSION, MINOR_VERSION] < [2023, 9]:
     from homeassistant.helpers.entity import DeviceInfo
 else:
     from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.device_registry import (
+    EVENT_DEVICE_REGISTRY_UPDATED,
+    DeviceEntryType,
+)
 from homeassistant.helpers.event import (
+    async_call_later,
     async_track_state_change_event,
     async_track_time_interval,
 )
@@ -99,20 +104,29 @@ from .const import (
     CONF_ADAPT_DELAY,
     CONF_ADAPT_ONLY_ON_BARE_TURN_ON,
     CONF_ADAPT_UNTIL_SLEEP,
+    CONF_ATTRIBUTE_PROFILE,
     CONF_AUTORESET_CONTROL,
     CONF_BRIGHTNESS_MODE,
     CONF_BRIGHTNESS_MODE_TIME_DARK,
     CONF_BRIGHTNESS_MODE_TIME_LIGHT,
+    CONF_COLLECT_METRICS,
     CONF_DETECT_NON_HA_CHANGES,
-    CONF_INVERT_BRIGHTNESS,
+    CONF_DURATION,
     CONF_INCLUDE_CONFIG_IN_ATTRIBUTES,
-    CONF_LUX_MAX,
-    CONF_LUX_MIN,
-    CONF_LUX_SENSOR,
     CONF_INITIAL_TRANSITION,
     CONF_INTERCEPT,
     CONF_INTERVAL,
+    CONF_INVERT_BRIGHTNESS,
     CONF_LIGHTS,
+    CONF_LUX_AGGREGATION,
+    CONF_LUX_FILTER,
+    CONF_LUX_FILTER_WINDOW,
+    CONF_LUX_HYSTERESIS,
+    CONF_LUX_MAX,
+    CONF_LUX_MIN,
+    CONF_LUX_SENSOR,
+    CONF_LUX_SENSORS,
+    CONF_LUX_WEIGHTS,
     CONF_MANUAL_CONTROL,
     CONF_MAX_BRIGHTNESS,
     CONF_MAX_COLOR_TEMP,
@@ -120,6 +134,7 @@ from .const import (
     CONF_MAX_SUNSET_TIME,
     CONF_MIN_BRIGHTNESS,
     CONF_MIN_COLOR_TEMP,
+    CONF_MIN_STATE_WRITE_INTERVAL,
     CONF_MIN_SUNRISE_TIME,
     CONF_MIN_SUNSET_TIME,
     CONF_MULTI_LIGHT_INTERCEPT,
@@ -138,17 +153,23 @@ from .const import (
     CONF_SUNSET_OFFSET,
     CONF_SUNSET_TIME,
     CONF_TAKE_OVER_CONTROL,
+    CONF_TOP,
     CONF_TRANSITION,
     CONF_TURN_ON_LIGHTS,
     CONF_USE_DEFAULTS,
+    CONF_WATCHDOG_THRESHOLD,
     DOMAIN,
     EXTRA_VALIDATION,
     ICON_BRIGHTNESS,
     ICON_COLOR_TEMP,
     ICON_MAIN,
     ICON_SLEEP,
+    PROFILE_SCHEMA,
+    RECORD_TRACE_SCHEMA,
     SERVICE_APPLY,
     SERVICE_CHANGE_SWITCH_SETTINGS,
+    SERVICE_PROFILE,
+    SERVICE_RECORD_TRACE,
     SERVICE_SET_MANUAL_CONTROL,
     SET_MANUAL_CONTROL_SCHEMA,
     SLEEP_MODE_SWITCH,
@@ -163,11 +184,51 @@ from .helpers import (
     color_difference_redmean,
     int_to_base36,
     remove_vowels,
+    round_floats,
     short_hash,
 )
+from .light_records import (
+    DECISION_ADAPT,
+    DECISION_SKIP,
+    REASON_ALREADY_ON,
+    REASON_INTERCEPT_DISABLED,
+    REASON_INTERCEPTED,
+    REASON_JUST_TURNED_OFF,
+    REASON_LIGHT_GROUP,
+    REASON_MANUAL_CONTROL,
+    REASON_MULTI_LIGHT_INTERCEPT,
+    REASON_NON_BARE_TURN_ON,
+    REASON_NOTHING_TO_ADAPT,
+    REASON_SIGNIFICANT_CHANGE,
+    REASON_SWITCH_OFF,
+    REASON_TRANSITIONING,
+    REASON_TURN_OFF_LOCK,
+    REASON_UPDATE,
+    EventSnapshot,
+    LightCapabilities,
+    LightRecord,
+    RecordAttributeView,
+    StateHistory,
+    StateSnapshot,
+    TargetPayload,
+    capability_attributes_changed,
+)
+from .lux import LuxFilter, aggregate_lux, lux_settings_changed
+from .metrics import (
+    METRIC_INTERCEPT_TURN_ON,
+    METRIC_LIGHT_TURN_ON,
+    METRIC_PREPARE_ADAPTATION_DATA,
+    AdaptationCounters,
+    CacheStats,
+    Metrics,
+    timed,
+)
+from .profiling import async_profile
+from .trace import async_record_trace
+from .watchdog import LoopWatchdog, watched
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Coroutine, Iterable
+    from collections.abc import Callable, Collection, Coroutine, Iterable
 
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -182,6 +243,22 @@ BRIGHTNESS_CHANGE = 25  # ≈10% of total range
 COLOR_TEMP_CHANGE = 100  # ≈3% of total range (2000-6500)
 RGB_REDMEAN_CHANGE = 80  # ≈10% of total range
 
+# The settings that are attributes of a switch with `attribute_profile: compact`
+COMPACT_ATTRIBUTES = frozenset(
+    {"brightness_pct", "color_temp_kelvin", "rgb_color", "sun_position"},
+)
+# Number of decimals with which the settings of two ticks are compared, to not
+# write the state for changes that are too small to matter. The settings that
+# are not listed are compared exactly.
+STATE_WRITE_NDIGITS = {
+    "brightness_pct": 0,
+    "color_temp_mired": 0,
+    "rgb_color": 0,
+    "xy_color": 3,
+    "hs_color": 0,
+    "sun_position": 2,
+}
+
 
 # Keep a short domain version for the context instances (which can only be 36 chars)
 _DOMAIN_SHORT = "al"
@@ -199,9 +276,7 @@ def create_context(
     # Pack index with base85 to maximize the number of contexts we can create
     # before we exceed the 26-character limit and are forced to wrap.
     time_stamp = ulid_transform.ulid_now()[:10]  # time part of a ULID
-    name_hash = short_hash(name)
-    which_short = remove_vowels(which)
-    context_id_start = f"{time_stamp}:{_DOMAIN_SHORT}:{name_hash}:{which_short}:"
+    context_id_start = time_stamp + _context_id_infix(name, which)
     chars_left = 26 - len(context_id_start)
     index_packed = int_to_base36(index).zfill(chars_left)[-chars_left:]
     context_id = context_id_start + index_packed
@@ -209,17 +284,48 @@ def create_context(
     return Context(id=context_id, parent_id=parent_id)
 
 
+@cache
+def _which_short(which: str) -> str:
+    """Return the short form of 'which' as it appears in our context ids."""
+    return remove_vowels(which)
+
+
+@cache
+def _context_id_infix(name: str, which: str) -> str:
+    """Return the part of our context ids between the time stamp and the index."""
+    return f":{_DOMAIN_SHORT}:{short_hash(name)}:{_which_short(which)}:"
+
+
+@lru_cache(maxsize=512)
+def parse_context_id(context_id: str) -> tuple[bool, str | None, str | None]:
+    """Parse 'context_id' into '(is_ours, name_hash, which_short)'.
+
+    Our context ids look like '{time_stamp}:al:{name_hash}:{which_short}:{index}'.
+    The same context id is typically checked several times while handling a
+    single event (interceptor, event listeners, manual control checks), so the
+    results are cached.
+    """
+    parts = context_id.split(":")
+    if len(parts) == 5 and parts[1] == _DOMAIN_SHORT:
+        return True, parts[2], parts[3]
+    if f":{_DOMAIN_SHORT}:" in context_id:
+        return True, None, None
+    return False, None, None
+
+
 def is_our_context_id(context_id: str | None, which: str | None = None) -> bool:
     """Check whether this integration created 'context_id'."""
     if context_id is None:
         return False
 
-    is_al = f":{_DOMAIN_SHORT}:" in context_id
+    is_al, _, which_short = parse_context_id(context_id)
     if not is_al:
         return False
     if which is None:
         return True
-    return f":{remove_vowels(which)}:" in context_id
+    if which_short is None:
+        return f":{_which_short(which)}:" in context_id
+    return which_short == _which_short(which)
 
 
 def is_our_context(context: Context | None, which: str | None = None) -> bool:
@@ -541,6 +647,42 @@ async def async_setup_entry(  # noqa: PLR0915
         schema=SET_MANUAL_CONTROL_SCHEMA,
     )
 
+    async def handle_profile(service_call: ServiceCall) -> ServiceResponse:
+        """Profile the integration and return its hottest functions."""
+        data = service_call.data
+        _LOGGER.debug(
+            "Called 'adaptive_lighting.profile' service with '%s'",
+            data,
+        )
+        return await async_profile(hass, data[CONF_DURATION], data[CONF_TOP])
+
+    # Register `profile` service
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_PROFILE,
+        service_func=handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def handle_record_trace(service_call: ServiceCall) -> ServiceResponse:
+        """Record a trace of the events that the integration handles."""
+        data = service_call.data
+        _LOGGER.debug(
+            "Called 'adaptive_lighting.record_trace' service with '%s'",
+            data,
+        )
+        return await async_record_trace(hass, data[CONF_DURATION])
+
+    # Register `record_trace` service
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_RECORD_TRACE,
+        service_func=handle_record_trace,
+        schema=RECORD_TRACE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
     args = {vol.Optional(CONF_USE_DEFAULTS, default="current"): cv.string}
     # Modifying these after init isn't possible
     skip = (CONF_INTERVAL, CONF_NAME, CONF_LIGHTS)
@@ -630,38 +772,7 @@ def _is_light_group(state: State) -> bool:
 def _supported_features(hass: HomeAssistant, light: str) -> set[str]:
     state = hass.states.get(light)
     assert state is not None
-    supported_features = state.attributes.get(ATTR_SUPPORTED_FEATURES, 0)
-    assert isinstance(supported_features, int)
-
-    supported = set()
-
-    if supported_features & LightEntityFeature.TRANSITION:
-        supported.add("transition")
-
-    supported_color_modes = state.attributes.get(ATTR_SUPPORTED_COLOR_MODES, set())
-    color_modes = {
-        ColorMode.RGB,
-        ColorMode.RGBW,
-        ColorMode.RGBWW,
-        ColorMode.XY,
-        ColorMode.HS,
-    }
-
-    # Adding brightness when color mode is supported, see
-    # comment https://github.com/basnijholt/adaptive-lighting/issues/112#issuecomment-836944011
-
-    for mode in color_modes:
-        if mode in supported_color_modes:
-            supported.update({"color", "brightness"})
-            break
-
-    if ColorMode.COLOR_TEMP in supported_color_modes:
-        supported.update({"color_temp", "brightness"})
-
-    if ColorMode.BRIGHTNESS in supported_color_modes:
-        supported.add("brightness")
-
-    return supported
+    return set(LightCapabilities.from_state(state).features)
 
 
 # All comparisons should be done with RGB since
@@ -777,6 +888,11 @@ def _attributes_have_changed(
 class AdaptiveSwitch(SwitchEntity, RestoreEntity):
     """Representation of a Adaptive Lighting switch."""
 
+    # Change often or are large, and are of little use in the history
+    _unrecorded_attributes = frozenset(
+        {"configuration", "manual_control", "autoreset_time_remaining"},
+    )
+
     def __init__(
         self,
         hass,
@@ -800,6 +916,10 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
         self._name = data[CONF_NAME]
         self._interval: timedelta = data[CONF_INTERVAL]
         self.lights: list[str] = data[CONF_LIGHTS]
+        # Incremented on every settings change, invalidates cached target payloads
+        self._settings_version = 0
+        # What this switch did, shown by the diagnostic sensors
+        self.counters = AdaptationCounters()
 
         # backup data for use in change_switch_settings "configuration" CONF_USE_DEFAULTS
         self._config_backup = deepcopy(data)
@@ -814,10 +934,16 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
 
         # Set in self._update_attrs_and_maybe_adapt_lights
         self._settings: dict[str, Any] = {}
+        # The (rounded) state of the last write, see `_state_fingerprint`
+        self._written_state: tuple[Any, ...] | None = None
+        self._last_state_write: datetime.datetime | None = None
+        self._remove_deferred_state_write: CALLBACK_TYPE | None = None
 
         # Set and unset tracker in async_turn_on and async_turn_off
         self.remove_listeners: list[CALLBACK_TYPE] = []
         self.remove_interval: CALLBACK_TYPE = lambda: None
+        # Interval of the scheduled adaptations, None if none are scheduled
+        self.adaptation_interval: timedelta | None = None
         _LOGGER.debug(
             "%s: Setting up with '%s',"
             " config_entry.data: '%s',"
@@ -843,9 +969,17 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
 
         # backup data for use in change_switch_settings "current" CONF_USE_DEFAULTS
         self._current_settings = data
+        self._settings_version += 1
 
         self._detect_non_ha_changes = data[CONF_DETECT_NON_HA_CHANGES]
+        self.manager.set_collect_metrics(
+            self._name,
+            enabled=data[CONF_COLLECT_METRICS],
+        )
+        self.manager.set_watchdog_threshold(self._name, data[CONF_WATCHDOG_THRESHOLD])
         self._include_config_in_attributes = data[CONF_INCLUDE_CONFIG_IN_ATTRIBUTES]
+        self._compact_attributes = data[CONF_ATTRIBUTE_PROFILE] == "compact"
+        self._min_state_write_interval = data[CONF_MIN_STATE_WRITE_INTERVAL]
         self._config: dict[str, Any] = {}
         if self._include_config_in_attributes:
             attrdata = deepcopy(data)
@@ -891,6 +1025,14 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
             self._multi_light_intercept = False
         self._expand_light_groups()  # updates manual control timers
         location, _ = get_astral_location(self.hass)
+        lux_sensors = list(
+            dict.fromkeys(
+                [
+                    *([data[CONF_LUX_SENSOR]] if data[CONF_LUX_SENSOR] else []),
+                    *(data[CONF_LUX_SENSORS] or []),
+                ],
+            ),
+        )
 
         self._sun_light_settings = SunLightSettings(
             name=self._name,
@@ -916,11 +1058,25 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
             brightness_mode_time_dark=data[CONF_BRIGHTNESS_MODE_TIME_DARK],
             brightness_mode_time_light=data[CONF_BRIGHTNESS_MODE_TIME_LIGHT],
             invert_brightness=data[CONF_INVERT_BRIGHTNESS],
-            lux_sensor=data[CONF_LUX_SENSOR],
+            lux_sensor=lux_sensors[0] if lux_sensors else None,
             lux_min=data[CONF_LUX_MIN],
             lux_max=data[CONF_LUX_MAX],
             timezone=zoneinfo.ZoneInfo(self.hass.config.time_zone),
         )
+        lux_range = max(0, data[CONF_LUX_MAX] - data[CONF_LUX_MIN])
+        self._lux_filters = {
+            sensor: LuxFilter(
+                data[CONF_LUX_FILTER],
+                data[CONF_LUX_FILTER_WINDOW],
+                band=data[CONF_LUX_HYSTERESIS] / 100 * lux_range,
+            )
+            for sensor in lux_sensors
+        }
+        self._lux_aggregation = data[CONF_LUX_AGGREGATION]
+        self._lux_weights = data[CONF_LUX_WEIGHTS] or {}
+        # The sensor states of the latest reading and the resulting value
+        self._lux_reading_states: tuple[State | None, ...] = ()
+        self._lux_reading: float | None = None
         _LOGGER.debug(
             "%s: Set switch settings for lights '%s'. now using data: '%s'",
             self._name,
@@ -974,6 +1130,18 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
     async def async_will_remove_from_hass(self):
         """Remove the listeners upon removing the component."""
         self._remove_listeners()
+        self.manager.set_collect_metrics(self._name, enabled=False)
+        self.manager.set_watchdog_threshold(self._name, 0)
+
+    @property
+    def metrics(self) -> Metrics:
+        """Return the latency metrics shared by all switches."""
+        return self.manager.metrics
+
+    @property
+    def watchdog(self) -> LoopWatchdog:
+        """Return the event loop watchdog shared by all switches."""
+        return self.manager.watchdog
 
     def _expand_light_groups(self, hass=None) -> None:
         hass = hass or self.hass
@@ -1019,6 +1187,15 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
         )
 
         self.remove_listeners.append(remove_sleep)
+
+        if self._lux_filters:
+            remove_lux = async_track_state_change_event(
+                self.hass,
+                entity_ids=list(self._lux_filters),
+                action=self._lux_sensor_state_event_action,
+            )
+            self.remove_listeners.append(remove_lux)
+
         self._expand_light_groups()
 
     def _update_time_interval_listener(self) -> None:
@@ -1046,6 +1223,7 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
             action=self._async_update_at_interval_action,
             interval=adaptation_interval,
         )
+        self.adaptation_interval = adaptation_interval
 
     def _call_on_remove_callbacks(self) -> None:
         """Call callbacks registered by async_on_remove."""
@@ -1067,9 +1245,11 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
     def _remove_interval_listener(self) -> None:
         self.remove_interval()
         self.remove_interval = lambda: None
+        self.adaptation_interval = None
 
     def _remove_listeners(self) -> None:
         self._remove_interval_listener()
+        self._cancel_deferred_state_write()
 
         while self.remove_listeners:
             remove_listener = self.remove_listeners.pop()
@@ -1083,20 +1263,27 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the attributes of the switch."""
-        extra_state_attributes: dict[str, Any] = {"configuration": self._config}
+        extra_state_attributes: dict[str, Any] = {}
+        if not self._compact_attributes or self._config:
+            extra_state_attributes["configuration"] = self._config
+        settings = self._settings
+        if self._compact_attributes:
+            settings = {k: v for k, v in settings.items() if k in COMPACT_ATTRIBUTES}
         if not self.is_on:
-            for key in self._settings:
+            for key in settings:
                 extra_state_attributes[key] = None
             return extra_state_attributes
-        extra_state_attributes["manual_control"] = [
-            light for light in self.lights if self.manager.manual_control.get(light)
-        ]
-        extra_state_attributes.update(self._settings)
-        timers = self.manager.auto_reset_manual_control_timers
+        extra_state_attributes["manual_control"] = self._manual_control_lights()
+        extra_state_attributes.update(settings)
+        if self._compact_attributes:
+            return extra_state_attributes
+        records = self.manager.records
         extra_state_attributes["autoreset_time_remaining"] = {
             light: time
             for light in self.lights
-            if (timer := timers.get(light)) and (time := timer.remaining_time()) > 0
+            if (record := records.get(light))
+            and (timer := record.auto_reset_manual_control_timer)
+            and (time := timer.remaining_time()) > 0
         }
         return extra_state_attributes
 
@@ -1140,6 +1327,7 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
         self._remove_listeners()
         self.manager.reset(*self.lights)
 
+    @watched
     async def _async_update_at_interval_action(self, now=None) -> None:  # noqa: ARG002
         """Update the attributes and maybe adapt the lights."""
         await self._update_attrs_and_maybe_adapt_lights(
@@ -1149,54 +1337,86 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
         )
 
     def _get_lux_reading(self) -> float | None:
-        """Read the current lux value from the configured sensor.
-        
+        """Read the current lux value from the configured sensors.
+
+        The readings are smoothed by the `lux_filter` of each sensor, which
+        keeps the previous value when a reading is within `lux_hysteresis`,
+        and combined with `lux_aggregation`. The sensors are only read again
+        when one of their states changed, so all lights share one reading.
+
         Returns:
-            The lux reading as a float, or None if:
+            The aggregated lux reading as a float, or None if:
             - No lux sensor is configured
-            - Sensor state is unavailable or unknown
-            - Sensor state cannot be parsed as a float
+            - No sensor state is available and can be parsed as a float
         """
-        if self._sun_light_settings.lux_sensor is None:
+        if not self._lux_filters:
             return None
-        
-        state = self.hass.states.get(self._sun_light_settings.lux_sensor)
-        if state is None:
-            _LOGGER.warning(
-                "%s: Lux sensor '%s' not found",
+        states = tuple(map(self.hass.states.get, self._lux_filters))
+        if len(states) == len(self._lux_reading_states) and all(
+            state is previous
+            for state, previous in zip(states, self._lux_reading_states, strict=True)
+        ):
+            return self._lux_reading
+        readings = {}
+        for sensor, state in zip(self._lux_filters, states, strict=True):
+            lux_value = self._read_lux_sensor(sensor, state)
+            if lux_value is not None:
+                readings[sensor] = lux_value
+        lux_reading = aggregate_lux(readings, self._lux_aggregation, self._lux_weights)
+        if lux_reading is None:
+            _LOGGER.debug(
+                "%s: No lux sensor is available, falling back to sun-based adaptation",
                 self._name,
-                self._sun_light_settings.lux_sensor,
             )
+        elif len(self._lux_filters) > 1:
+            _LOGGER.debug(
+                "%s: Combined lux readings %s into %.1f (%s)",
+                self._name,
+                readings,
+                lux_reading,
+                self._lux_aggregation,
+            )
+        self._lux_reading_states = states
+        self._lux_reading = lux_reading
+        return lux_reading
+
+    def _read_lux_sensor(self, sensor: str, state: State | None) -> float | None:
+        """Parse and filter the state of one lux sensor."""
+        lux_filter = self._lux_filters[sensor]
+        if state is None:
+            _LOGGER.warning("%s: Lux sensor '%s' not found", self._name, sensor)
             return None
-        
+
         if state.state in ("unknown", "unavailable"):
+            lux_filter.reset()
             _LOGGER.debug(
-                "%s: Lux sensor '%s' is %s, falling back to sun-based adaptation",
+                "%s: Lux sensor '%s' is %s",
                 self._name,
-                self._sun_light_settings.lux_sensor,
+                sensor,
                 state.state,
             )
             return None
-        
+
         try:
             lux_value = float(state.state)
-            _LOGGER.debug(
-                "%s: Read lux value %.1f from sensor '%s'",
-                self._name,
-                lux_value,
-                self._sun_light_settings.lux_sensor,
-            )
-            return lux_value
         except (ValueError, TypeError) as err:
             _LOGGER.warning(
                 "%s: Failed to parse lux sensor '%s' state '%s' as float: %s",
                 self._name,
-                self._sun_light_settings.lux_sensor,
+                sensor,
                 state.state,
                 err,
             )
             return None
+        _LOGGER.debug(
+            "%s: Read lux value %.1f from sensor '%s'",
+            self._name,
+            lux_value,
+            sensor,
+        )
+        return lux_filter.update(lux_value, state.last_updated.timestamp())
 
+    @timed(METRIC_PREPARE_ADAPTATION_DATA)
     async def prepare_adaptation_data(
         self,
         light: str,
@@ -1206,8 +1426,14 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
         prefer_rgb_color: bool | None = None,
         force: bool = False,
         context: Context | None = None,
+        use_target_payload: bool = False,
     ) -> AdaptationData | None:
-        """Prepare `AdaptationData` for adapting a light."""
+        """Prepare `AdaptationData` for adapting a light.
+
+        With 'use_target_payload', the light attributes computed during the
+        last update are reused if they are still valid, which keeps the
+        computation off the critical path of intercepted `light.turn_on` calls.
+        """
         if transition is None:
             transition = self._transition
         if adapt_brightness is None:
@@ -1235,49 +1461,57 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
                 lux_reading,
             )
 
-        # The switch might be off and not have _settings set.
-        self._settings = self._sun_light_settings.get_settings(
-            self.sleep_mode_switch.is_on,
-            transition,
-            lux_reading,
-        )
-
         # Build service data.
         service_data: dict[str, Any] = {ATTR_ENTITY_ID: light}
-        features = _supported_features(self.hass, light)
+        capabilities = self.manager.capabilities(light)
 
         # Check transition == 0 to fix #378
-        use_transition = "transition" in features and transition > 0
+        use_transition = capabilities.supports_transition and transition > 0
         if use_transition:
             service_data[ATTR_TRANSITION] = transition
 
-        if "brightness" in features and adapt_brightness:
-            brightness = round(255 * self._settings["brightness_pct"] / 100)
-            service_data[ATTR_BRIGHTNESS] = brightness
-
-        sleep_rgb = (
-            self.sleep_mode_switch.is_on
-            and self._sun_light_settings.sleep_rgb_or_color_temp == "rgb_color"
+        record = self.manager.record(light)
+        key = self._target_payload_key(
+            adapt_brightness,
+            adapt_color,
+            prefer_rgb_color,
+            lux_reading,
+            capabilities,
         )
+        settings_time = dt_util.utcnow() + timedelta(seconds=transition)
+        payload = record.target_payload
         if (
-            "color_temp" in features
-            and adapt_color
-            and not (prefer_rgb_color and "color" in features)
-            and not (sleep_rgb and "color" in features)
-            and not (self._settings["force_rgb_color"] and "color" in features)
+            use_target_payload
+            and payload is not None
+            and payload.is_valid(key, settings_time)
         ):
-            _LOGGER.debug("%s: Setting color_temp of light %s", self._name, light)
-            state = self.hass.states.get(light)
-            assert isinstance(state, State)
-            attributes = state.attributes
-            min_kelvin = attributes["min_color_temp_kelvin"]
-            max_kelvin = attributes["max_color_temp_kelvin"]
-            color_temp_kelvin = self._settings["color_temp_kelvin"]
-            color_temp_kelvin = clamp(color_temp_kelvin, min_kelvin, max_kelvin)
-            service_data[ATTR_COLOR_TEMP_KELVIN] = color_temp_kelvin
-        elif "color" in features and adapt_color:
-            _LOGGER.debug("%s: Setting rgb_color of light %s", self._name, light)
-            service_data[ATTR_RGB_COLOR] = self._settings["rgb_color"]
+            self.manager.target_payload_stats.hits += 1
+            _LOGGER.debug(
+                "%s: Using target payload of %s for %s",
+                self._name,
+                light,
+                payload.settings_time,
+            )
+            attributes = payload.attributes
+        else:
+            if use_target_payload:
+                self.manager.target_payload_stats.misses += 1
+            # The switch might be off and not have _settings set.
+            self._settings = self._sun_light_settings.get_settings(
+                self.sleep_mode_switch.is_on,
+                transition,
+                lux_reading,
+            )
+            attributes = self._target_attributes(
+                light,
+                capabilities,
+                self._settings,
+                adapt_brightness,
+                adapt_color,
+                prefer_rgb_color,
+            )
+            record.target_payload = TargetPayload(key, attributes, settings_time)
+        service_data.update(attributes)
 
         required_attrs = [ATTR_RGB_COLOR, ATTR_COLOR_TEMP_KELVIN, ATTR_BRIGHTNESS]
         if not any(attr in service_data for attr in required_attrs):
@@ -1304,6 +1538,110 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
             force=force,
         )
 
+    def _target_payload_key(
+        self,
+        adapt_brightness: bool,
+        adapt_color: bool,
+        prefer_rgb_color: bool,
+        lux_reading: float | None,
+        capabilities: LightCapabilities,
+    ) -> tuple[Any, ...]:
+        """Return the inputs of a `TargetPayload` apart from the time."""
+        return (
+            self._name,
+            self._settings_version,
+            self.sleep_mode_switch.is_on,
+            adapt_brightness,
+            adapt_color,
+            prefer_rgb_color,
+            lux_reading,
+            capabilities,
+        )
+
+    def _target_attributes(
+        self,
+        light: str,
+        capabilities: LightCapabilities,
+        settings: dict[str, Any],
+        adapt_brightness: bool,
+        adapt_color: bool,
+        prefer_rgb_color: bool,
+    ) -> dict[str, Any]:
+        """Compute the brightness and color that 'light' should be adapted to."""
+        attributes: dict[str, Any] = {}
+
+        if capabilities.supports_brightness and adapt_brightness:
+            brightness = round(255 * settings["brightness_pct"] / 100)
+            attributes[ATTR_BRIGHTNESS] = brightness
+
+        sleep_rgb = (
+            self.sleep_mode_switch.is_on
+            and self._sun_light_settings.sleep_rgb_or_color_temp == "rgb_color"
+        )
+        if (
+            capabilities.supports_color_temp
+            and adapt_color
+            and not (prefer_rgb_color and capabilities.supports_color)
+            and not (sleep_rgb and capabilities.supports_color)
+            and not (settings["force_rgb_color"] and capabilities.supports_color)
+        ):
+            _LOGGER.debug("%s: Setting color_temp of light %s", self._name, light)
+            color_temp_kelvin = settings["color_temp_kelvin"]
+            min_kelvin, max_kelvin = capabilities.min_kelvin, capabilities.max_kelvin
+            # Not all lights report their range, e.g., when they are off
+            if min_kelvin is not None and max_kelvin is not None:
+                color_temp_kelvin = clamp(color_temp_kelvin, min_kelvin, max_kelvin)
+            attributes[ATTR_COLOR_TEMP_KELVIN] = color_temp_kelvin
+        elif capabilities.supports_color and adapt_color:
+            _LOGGER.debug("%s: Setting rgb_color of light %s", self._name, light)
+            attributes[ATTR_RGB_COLOR] = settings["rgb_color"]
+        return attributes
+
+    def _refresh_target_payloads(self, lights: Iterable[str]) -> None:
+        """Compute the target payloads for turning on 'lights', which are off.
+
+        The interceptor only adapts `light.turn_on` calls for lights that are
+        off, so their payloads are computed on every update, which keeps the
+        computation off the critical path of the user's turn on.
+        """
+        adapt_brightness = self.adapt_brightness_switch.is_on
+        adapt_color = self.adapt_color_switch.is_on
+        if not self._intercept or not (adapt_brightness or adapt_color):
+            return
+        # Intercepted calls are adapted with the initial transition by default
+        transition = self.initial_transition
+        lux_reading = self._get_lux_reading()
+        settings = self._sun_light_settings.get_settings(
+            self.sleep_mode_switch.is_on,
+            transition,
+            lux_reading,
+        )
+        settings_time = dt_util.utcnow() + timedelta(seconds=transition)
+        for light in lights:
+            if self.hass.states.get(light) is None:
+                continue
+            capabilities = self.manager.capabilities(light)
+            key = self._target_payload_key(
+                adapt_brightness,
+                adapt_color,
+                self._prefer_rgb_color,
+                lux_reading,
+                capabilities,
+            )
+            attributes = self._target_attributes(
+                light,
+                capabilities,
+                settings,
+                adapt_brightness,
+                adapt_color,
+                self._prefer_rgb_color,
+            )
+            self.manager.record(light).target_payload = TargetPayload(
+                key,
+                attributes,
+                settings_time,
+            )
+
     async def _adapt_light(
         self,
         light: str,
@@ -1314,8 +1652,19 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
         prefer_rgb_color: bool | None = None,
         force: bool = False,
     ) -> None:
-        if (lock := self.manager.turn_off_locks.get(light)) and lock.locked():
+        if (
+            (record := self.manager.records.get(light))
+            and (lock := record.turn_off_lock)
+            and lock.locked()
+        ):
             _LOGGER.debug("%s: '%s' is locked", self._name, light)
+            self.manager.add_decision(
+                light,
+                DECISION_SKIP,
+                REASON_TURN_OFF_LOCK,
+                context.id,
+                self._name,
+            )
             return
 
         data = await self.prepare_adaptation_data(
@@ -1328,10 +1677,18 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
             context,
         )
         if data is None:
+            self.manager.add_decision(
+                light,
+                DECISION_SKIP,
+                REASON_NOTHING_TO_ADAPT,
+                context.id,
+                self._name,
+            )
             return  # nothing to adapt
 
         await self.execute_cancellable_adaptation_calls(data)
 
+    @watched
     async def _execute_adaptation_calls(self, data: AdaptationData):
         """Executes a sequence of adaptation service calls for the given service datas."""
         for index in range(data.max_length):
@@ -1347,7 +1704,8 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
             service_data = await data.next_service_call_data()
 
             if not service_data:
-                # All service datas processed
+                # All service datas processed, the rest was filtered as redundant
+                self.counters.redundant_skipped += data.max_length - index
                 break
 
             if (
@@ -1372,13 +1730,15 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
                 data.context.id,
             )
             light = service_data[ATTR_ENTITY_ID]
-            self.manager.last_service_data[light] = service_data
-            await self.hass.services.async_call(
-                LIGHT_DOMAIN,
-                SERVICE_TURN_ON,
-                service_data,
-                context=data.context,
-            )
+            self.manager.record(light).last_service_data = service_data
+            self.counters.commands_sent += 1
+            with self.manager.metrics.time(METRIC_LIGHT_TURN_ON):
+                await self.hass.services.async_call(
+                    LIGHT_DOMAIN,
+                    SERVICE_TURN_ON,
+                    service_data,
+                    context=data.context,
+                )
 
     async def execute_cancellable_adaptation_calls(
         self,
@@ -1399,12 +1759,14 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
         # Execute adaptation calls within a task
         try:
             task = asyncio.ensure_future(self._execute_adaptation_calls(data))
+            record = self.manager.record(data.entity_id)
             if data.which in ("both", "brightness"):
-                self.manager.adaptation_tasks_brightness[data.entity_id] = task
+                record.adaptation_task_brightness = task
             if data.which in ("both", "color"):
-                self.manager.adaptation_tasks_color[data.entity_id] = task
+                record.adaptation_task_color = task
             await task
         except asyncio.CancelledError:
+            self.counters.cancellations += 1
             _LOGGER.debug(
                 "%s: Ongoing adaptation of %s cancelled, with AdaptationData: %s",
                 self._name,
@@ -1412,7 +1774,57 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
                 data,
             )
 
-    async def _update_attrs_and_maybe_adapt_lights(  # noqa: PLR0912
+    def _lights_to_adapt(self, lights: list[str], context: Context) -> list[str]:
+        """Return the 'lights' that are not transitioning or just turned off."""
+        filtered_lights = []
+        records = self.manager.records
+        for light in lights:
+            record = records.get(light)
+            if record is None:
+                filtered_lights.append(light)
+                continue
+            # Don't adapt lights that haven't finished prior transitions.
+            timer = record.transition_timer
+            if timer is not None and timer.is_running():
+                self.counters.transition_skipped += 1
+                record.add_decision(
+                    DECISION_SKIP,
+                    REASON_TRANSITIONING,
+                    context.id,
+                    self._name,
+                )
+                _LOGGER.debug(
+                    "%s: Light '%s' is still transitioning, context.id='%s'",
+                    self._name,
+                    light,
+                    context.id,
+                )
+            elif (
+                # This is to prevent lights immediately turning on after
+                # being turned off in 'interval' update, see #726
+                not self._detect_non_ha_changes
+                and is_our_context(context, "interval")
+                and (turn_on := record.turn_on_event)
+                and (turn_off := record.turn_off_event)
+                and turn_off.time_fired > turn_on.time_fired
+            ):
+                record.add_decision(
+                    DECISION_SKIP,
+                    REASON_JUST_TURNED_OFF,
+                    context.id,
+                    self._name,
+                )
+                _LOGGER.debug(
+                    "%s: Light '%s' was turned just turned off, context.id='%s'",
+                    self._name,
+                    light,
+                    context.id,
+                )
+            else:
+                filtered_lights.append(light)
+        return filtered_lights
+
+    async def _update_attrs_and_maybe_adapt_lights(
         self,
         *,
         context: Context,
@@ -1431,56 +1843,39 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
             force,
         )
         assert self.is_on
+        start = perf_counter()
+        self.counters.ticks += 1
         self._settings.update(
             self._sun_light_settings.get_settings(
                 self.sleep_mode_switch.is_on,
                 transition,
+                self._get_lux_reading(),
             ),
         )
-        self.async_write_ha_state()
-
-        if not force and self._only_once:
-            return
+        self._async_write_ha_state_if_changed()
 
         if lights is None:
             lights = self.lights
 
         on_lights = [light for light in lights if is_on(self.hass, light)]
+        # The payloads of the lights that are on are refreshed when adapting them
+        self._refresh_target_payloads(
+            light for light in lights if light not in on_lights
+        )
 
-        if force:
-            filtered_lights = on_lights
-        else:
-            filtered_lights = []
-            for light in on_lights:
-                # Don't adapt lights that haven't finished prior transitions.
-                timer = self.manager.transition_timers.get(light)
-                if timer is not None and timer.is_running():
-                    _LOGGER.debug(
-                        "%s: Light '%s' is still transitioning, context.id='%s'",
-                        self._name,
-                        light,
-                        context.id,
-                    )
-                elif (
-                    # This is to prevent lights immediately turning on after
-                    # being turned off in 'interval' update, see #726
-                    not self._detect_non_ha_changes
-                    and is_our_context(context, "interval")
-                    and (turn_on := self.manager.turn_on_event.get(light))
-                    and (turn_off := self.manager.turn_off_event.get(light))
-                    and turn_off.time_fired > turn_on.time_fired
-                ):
-                    _LOGGER.debug(
-                        "%s: Light '%s' was turned just turned off, context.id='%s'",
-                        self._name,
-                        light,
-                        context.id,
-                    )
-                else:
-                    filtered_lights.append(light)
+        if not force and self._only_once:
+            self._record_tick_duration(start)
+            return
+
+        self.counters.lights_evaluated += len(on_lights)
+
+        filtered_lights = (
+            on_lights if force else self._lights_to_adapt(on_lights, context)
+        )
 
         _LOGGER.debug("%s: filtered_lights: '%s'", self._name, filtered_lights)
         if not filtered_lights:
+            self._record_tick_duration(start)
             return
 
         adapt_brightness = self.adapt_brightness_switch.is_on
@@ -1500,6 +1895,14 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
                 )
             )
             if manually_controlled:
+                self.counters.manual_control_skipped += 1
+                self.manager.add_decision(
+                    light,
+                    DECISION_SKIP,
+                    REASON_MANUAL_CONTROL,
+                    context.id,
+                    self._name,
+                )
                 _LOGGER.debug(
                     "%s: '%s' is being manually controlled, stop adapting, context.id=%s.",
                     self._name,
@@ -1523,6 +1926,14 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
                 )
             )
             if significant_change:
+                self.counters.manual_control_skipped += 1
+                self.manager.add_decision(
+                    light,
+                    DECISION_SKIP,
+                    REASON_SIGNIFICANT_CHANGE,
+                    context.id,
+                    self._name,
+                )
                 _fire_manual_control_event(self, light, context)
                 continue
 
@@ -1534,19 +1945,96 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
                 transition,
                 context.id,
             )
+            self.manager.add_decision(
+                light,
+                DECISION_ADAPT,
+                REASON_UPDATE,
+                context.id,
+                self._name,
+            )
             coro = self._adapt_light(light, context, transition, force=force)
             task = self.hass.async_create_task(
                 coro,
             )
             tasks.append(task)
+        self._record_tick_duration(start)
         if tasks:
             await asyncio.gather(*tasks)
 
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember when, for `min_state_write_interval`."""
+        self._cancel_deferred_state_write()
+        self._written_state = self._state_fingerprint()
+        self._last_state_write = dt_util.utcnow()
+        super().async_write_ha_state()
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Return what a tick can change of the state, with `STATE_WRITE_NDIGITS`.
+
+        The `autoreset_time_remaining` decreases in every tick, so it is only
+        updated together with the other attributes. With the compact attribute
+        profile, only the `COMPACT_ATTRIBUTES` are compared.
+        """
+        settings = []
+        for key, value in self._settings.items():
+            if self._compact_attributes and key not in COMPACT_ATTRIBUTES:
+                continue
+            ndigits = STATE_WRITE_NDIGITS.get(key)
+            settings.append(
+                (key, value if ndigits is None else round_floats(value, ndigits)),
+            )
+        return (self.state, tuple(self._manual_control_lights()), tuple(settings))
+
+    def _manual_control_lights(self) -> list[str]:
+        """Return the lights of this switch that are manually controlled."""
+        records = self.manager.records
+        return [
+            light
+            for light in self.lights
+            if (record := records.get(light)) and record.manual_control
+        ]
+
+    @callback
+    def _async_write_ha_state_if_changed(self, *, throttle: bool = True) -> None:
+        """Write the state of a tick when it changed, at most every interval."""
+        state = self._state_fingerprint()
+        if state == self._written_state:
+            self.counters.state_writes_unchanged += 1
+            return
+        remaining = 0.0
+        if self._last_state_write is not None:
+            elapsed = dt_util.utcnow() - self._last_state_write
+            remaining = self._min_state_write_interval - elapsed.total_seconds()
+        if throttle and remaining > 0:
+            self.counters.state_writes_throttled += 1
+            if self._remove_deferred_state_write is None:
+                self._remove_deferred_state_write = async_call_later(
+                    self.hass,
+                    remaining,
+                    self._async_deferred_state_write,
+                )
+            return
+        self.async_write_ha_state()
+
+    @callback
+    def _async_deferred_state_write(self, _now) -> None:
+        self._remove_deferred_state_write = None
+        self._async_write_ha_state_if_changed(throttle=False)
+
+    def _cancel_deferred_state_write(self) -> None:
+        if self._remove_deferred_state_write is not None:
+            self._remove_deferred_state_write()
+            self._remove_deferred_state_write = None
+
+    def _record_tick_duration(self, start: float) -> None:
+        self.counters.tick_duration = (perf_counter() - start) * 1000
+
     async def _respond_to_off_to_on_event(self, entity_id: str, event: Event) -> None:
         assert not self.manager.is_proactively_adapting(event.context.id)
         from_turn_on = self.manager._off_to_on_state_event_is_from_turn_on(
             entity_id,
-            event,
+            EventSnapshot.from_event(event),
         )
         if (
             self._take_over_control
@@ -1574,17 +2062,18 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
             # adaptive_lighting.apply can turn on light, so check this is not our context
             and not is_our_context(event.context)
         ):
-            service_data = self.manager.turn_on_event[entity_id].data[ATTR_SERVICE_DATA]
+            turn_on_event = self.manager.records[entity_id].turn_on_event
+            service_data_keys = turn_on_event.service_data_keys
             if self.manager._mark_manual_control_if_non_bare_turn_on(
                 entity_id,
-                service_data,
+                service_data_keys,
             ):
                 _LOGGER.debug(
                     "Skipping responding to 'off' → 'on' event for '%s' with context.id='%s' because"
                     " we only adapt on bare `light.turn_on` events and not on service_data: '%s'",
                     entity_id,
                     event.context.id,
-                    service_data,
+                    sorted(service_data_keys),
                 )
                 return
 
@@ -1598,6 +2087,7 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
             force=True,
         )
 
+    @watched
     async def _sleep_mode_switch_state_event_action(self, event: Event) -> None:
         if not _is_state_event(event, (STATE_ON, STATE_OFF)):
             _LOGGER.debug("%s: Ignoring sleep event %s", self._name, event)
@@ -1615,6 +2105,31 @@ class AdaptiveSwitch(SwitchEntity, RestoreEntity):
             force=True,
         )
 
+    @watched
+    async def _lux_sensor_state_event_action(self, event: Event) -> None:
+        """Adapt the lights when the (filtered) lux reading changes the settings."""
+        lux_reading = self._get_lux_reading()
+        if lux_reading is None:
+            return  # the interval falls back to sun-based adaptation
+        settings = self._sun_light_settings.get_settings(
+            self.sleep_mode_switch.is_on,
+            self._transition,
+            lux_reading,
+        )
+        if not lux_settings_changed(self._settings, settings):
+            return
+        _LOGGER.debug(
+            "%s: Lux sensor changed to %.1f lux, adapting lights, event: '%s'",
+            self._name,
+            lux_reading,
+            event,
+        )
+        await self._update_attrs_and_maybe_adapt_lights(
+            context=self.create_context("lux", parent=event.context),
+            transition=self._transition,
+            force=False,
+        )
+
 
 class SimpleSwitch(SwitchEntity, RestoreEntity):
     """Representation of a Adaptive Lighting switch."""
@@ -1691,49 +2206,63 @@ class SimpleSwitch(SwitchEntity, RestoreEntity):
         self._state = False
 
 
+def _record_view(attribute: str) -> property:
+    """Return a property with a read-only `light → attribute` view on the records."""
+
+    def getter(self: AdaptiveLightingManager) -> RecordAttributeView:
+        return RecordAttributeView(self.records, attribute)
+
+    return property(getter, doc=f"Read-only view on `LightRecord.{attribute}`.")
+
+
 class AdaptiveLightingManager:
     """Track 'light.turn_off' and 'light.turn_on' service calls."""
 
+    # Read-only views on the per-light records, keyed by light
+    turn_off_event = _record_view("turn_off_event")
+    turn_on_event = _record_view("turn_on_event")
+    toggle_event = _record_view("toggle_event")
+    on_to_off_event = _record_view("on_to_off_event")
+    off_to_on_event = _record_view("off_to_on_event")
+    sleep_tasks = _record_view("sleep_task")
+    turn_off_locks = _record_view("turn_off_lock")
+    manual_control = _record_view("manual_control")
+    our_last_state_on_change = _record_view("state_history")
+    last_service_data = _record_view("last_service_data")
+    adaptation_tasks_brightness = _record_view("adaptation_task_brightness")
+    adaptation_tasks_color = _record_view("adaptation_task_color")
+    auto_reset_manual_control_timers = _record_view("auto_reset_manual_control_timer")
+    auto_reset_manual_control_times = _record_view("auto_reset_manual_control_time")
+    transition_timers = _record_view("transition_timer")
+
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the AdaptiveLightingManager that is shared among all switches."""
         assert hass is not None
         self.hass = hass
         self.lights: set[str] = set()
 
-        # Tracks 'light.turn_off' service calls
-        self.turn_off_event: dict[str, Event] = {}
-        # Tracks 'light.turn_on' service calls
-        self.turn_on_event: dict[str, Event] = {}
-        # Tracks 'light.toggle' service calls
-        self.toggle_event: dict[str, Event] = {}
-        # Tracks 'on' → 'off' state changes
-        self.on_to_off_event: dict[str, Event] = {}
-        # Tracks 'off' → 'on' state changes
-        self.off_to_on_event: dict[str, Event] = {}
-        # Keep 'asyncio.sleep' tasks that can be cancelled by 'light.turn_on' events
-        self.sleep_tasks: dict[str, asyncio.Task] = {}
-        # Locks that prevent light adjusting when waiting for a light to 'turn_off'
-        self.turn_off_locks: dict[str, asyncio.Lock] = {}
-        # Tracks which lights are manually controlled
-        self.manual_control: dict[str, bool] = {}
-        # Track 'state_changed' events of self.lights resulting from this integration
-        self.our_last_state_on_change: dict[str, list[State]] = {}
-        # Track last 'service_data' to 'light.turn_on' resulting from this integration
-        self.last_service_data: dict[str, dict[str, Any]] = {}
-        # Track ongoing split adaptations to be able to cancel them
-        self.adaptation_tasks_brightness: dict[str, asyncio.Task] = {}
-        self.adaptation_tasks_color: dict[str, asyncio.Task] = {}
-
-        # Track auto reset of manual_control
-        self.auto_reset_manual_control_timers: dict[str, _AsyncSingleShotTimer] = {}
-        self.auto_reset_manual_control_times: dict[str, float] = {}
-
-        # Track light transitions
-        self.transition_timers: dict[str, _AsyncSingleShotTimer] = {}
+        # Everything that is tracked per light
+        self.records: dict[str, LightRecord] = {}
 
         # Track _execute_cancellable_adaptation_calls tasks
         self.adaptation_tasks = set()
 
+        # Lights per area, for service calls that target an 'area_id'
+        self._area_lights: dict[str, tuple[str, ...]] = {}
+
+        # Hits and misses of the caches, for the diagnostics
+        self.area_lights_stats = CacheStats()
+        self.capabilities_stats = CacheStats()
+        self.target_payload_stats = CacheStats()
+
+        # Latency histograms, recorded while any switch has 'collect_metrics' on
+        self.metrics = Metrics()
+        self._metrics_switches: set[str] = set()
+
+        # Reports callbacks that block the event loop, thresholds in ms per switch
+        self.watchdog = LoopWatchdog()
+        self._watchdog_thresholds: dict[str, int] = {}
+
         # Setup listeners and its callbacks to remove them later
         self.listener_removers = [
             self.hass.bus.async_listen(
@@ -1745,6 +2274,15 @@ class AdaptiveLightingManager:
                 self.state_changed_event_listener,
             ),
         ]
+        # Areas, devices, and entities can move between areas
+        self.listener_removers.extend(
+            self.hass.bus.async_listen(event_type, self._clear_area_lights)
+            for event_type in (
+                EVENT_AREA_REGISTRY_UPDATED,
+                EVENT_DEVICE_REGISTRY_UPDATED,
+                entity_registry.EVENT_ENTITY_REGISTRY_UPDATED,
+            )
+        )
 
         self._proactively_adapting_contexts: dict[str, str] = {}
 
@@ -1755,6 +2293,8 @@ class AdaptiveLightingManager:
                     LIGHT_DOMAIN,
                     SERVICE_TURN_ON,
                     self._service_interceptor_turn_on_handler,
+                    self._should_intercept_turn_on,
+                    self.metrics,
                 ),
             )
 
@@ -1764,6 +2304,8 @@ class AdaptiveLightingManager:
                     LIGHT_DOMAIN,
                     SERVICE_TOGGLE,
                     self._service_interceptor_turn_on_handler,
+                    self._should_intercept_turn_on,
+                    self.metrics,
                 ),
             )
         except RuntimeError:
@@ -1778,6 +2320,60 @@ class AdaptiveLightingManager:
         for remove in self.listener_removers:
             remove()
 
+    def record(self, light: str) -> LightRecord:
+        """Return the record of 'light', creating it if it does not exist yet."""
+        record = self.records.get(light)
+        if record is None:
+            record = self.records[light] = LightRecord(light)
+        return record
+
+    def capabilities(self, light: str) -> LightCapabilities:
+        """Return the capabilities of 'light'.
+
+        For the lights we track, the result is cached until a 'state_changed'
+        event changes any of the attributes that determine the capabilities.
+        """
+        record = self.record(light) if light in self.lights else None
+        if record is not None and record.capabilities is not None:
+            self.capabilities_stats.hits += 1
+            return record.capabilities
+        self.capabilities_stats.misses += 1
+        state = self.hass.states.get(light)
+        assert state is not None
+        capabilities = LightCapabilities.from_state(state)
+        if record is not None:
+            record.capabilities = capabilities
+        return capabilities
+
+    def add_decision(
+        self,
+        light: str,
+        decision: str,
+        reason: str,
+        context_id: str | None,
+        switch_name: str | None = None,
+    ) -> None:
+        """Add an adaptation decision to the history of 'light' if it is tracked."""
+        if light in self.lights:
+            self.record(light).add_decision(decision, reason, context_id, switch_name)
+
+    def set_collect_metrics(self, switch_name: str, *, enabled: bool) -> None:
+        """Enable the metrics while at least one switch wants them collected."""
+        if enabled:
+            self._metrics_switches.add(switch_name)
+        else:
+            self._metrics_switches.discard(switch_name)
+        self.metrics.enabled = bool(self._metrics_switches)
+
+    def set_watchdog_threshold(self, switch_name: str, threshold: int) -> None:
+        """Watch the callbacks with the lowest threshold (ms) of all switches."""
+        if threshold:
+            self._watchdog_thresholds[switch_name] = threshold
+        else:
+            self._watchdog_thresholds.pop(switch_name, None)
+        thresholds = self._watchdog_thresholds.values()
+        self.watchdog.threshold = min(thresholds) / 1000 if thresholds else None
+
     def set_proactively_adapting(self, context_id: str, entity_id: str) -> None:
         """Declare the adaptation with context_id as proactively adapting,
         and associate it to an entity_id.
@@ -1810,10 +2406,25 @@ class AdaptiveLightingManager:
         for key in keys:
             self._proactively_adapting_contexts.pop(key)
 
+    def _forget_removed_light(self, light: str) -> None:
+        """Drop the record of a removed light that no switch is configured with.
+
+        Lights of a switch keep their record, because they will likely come
+        back, e.g., after their integration is reloaded.
+        """
+        if _switches_with_lights(self.hass, [light], expand_light_groups=False):
+            return
+        _LOGGER.debug("Forgetting '%s' because it was removed", light)
+        self.lights.discard(light)
+        self.clear_proactively_adapting(light)
+        if (record := self.records.pop(light, None)) is not None:
+            record.close()
+
     def _separate_entity_ids(
         self,
         entity_ids: list[str],
         data,
+        context_id: str | None = None,
     ) -> tuple[list[str], list[str]]:
         # Create a mapping from switch to entity IDs
         # AdaptiveSwitch.name → entity_ids mapping
@@ -1841,32 +2452,24 @@ class AdaptiveLightingManager:
                     skipped,
                 )
             else:
-                if (
-                    not switch.is_on
-                    or not switch._intercept
-                    # Never adapt on light groups, because HA will make a separate light.turn_on
-                    or _is_light_group(self.hass.states.get(entity_id))
-                    # Prevent adaptation of TURN_ON calls when light is already on,
-                    # and of TOGGLE calls when toggling off.
-                    or self.hass.states.is_state(entity_id, STATE_ON)
-                    or self.manual_control.get(entity_id, False)
-                    or (
-                        switch._take_over_control
-                        and switch._adapt_only_on_bare_turn_on
-                        and self._mark_manual_control_if_non_bare_turn_on(
-                            entity_id,
-                            data[CONF_PARAMS],
-                        )
+                reason = self._intercept_skip_reason(switch, entity_id, data)
+                if reason is not None:
+                    self.add_decision(
+                        entity_id,
+                        DECISION_SKIP,
+                        reason,
+                        context_id,
+                        switch._name,
                     )
-                ):
                     _LOGGER.debug(
-                        "Switch is off or light is already on for entity_id='%s', skipped='%s'"
+                        "Skipping entity_id='%s' (reason='%s'), skipped='%s'"
                         " (is_on='%s', is_state='%s', manual_control='%s', switch._intercept='%s')",
                         entity_id,
+                        reason,
                         skipped,
                         switch.is_on,
                         self.hass.states.is_state(entity_id, STATE_ON),
-                        self.manual_control.get(entity_id, False),
+                        self._is_marked_manual_control(entity_id),
                         switch._intercept,
                     )
                     skipped.append(entity_id)
@@ -1875,12 +2478,56 @@ class AdaptiveLightingManager:
                     switch_name_mapping[switch.name] = switch
         return switch_to_eids, switch_name_mapping, skipped
 
+    def _intercept_skip_reason(
+        self,
+        switch: AdaptiveSwitch,
+        entity_id: str,
+        data,
+    ) -> str | None:
+        """Return why an intercepted call should not adapt 'entity_id', if so.
+
+        The checks are evaluated in order until one applies, because the last
+        one marks the light as manually controlled.
+        """
+        checks: tuple[tuple[Callable[[], bool], str], ...] = (
+            (lambda: not switch.is_on, REASON_SWITCH_OFF),
+            (lambda: not switch._intercept, REASON_INTERCEPT_DISABLED),
+            # Never adapt on light groups, because HA will make a separate light.turn_on
+            (
+                lambda: _is_light_group(self.hass.states.get(entity_id)),
+                REASON_LIGHT_GROUP,
+            ),
+            # Prevent adaptation of TURN_ON calls when light is already on,
+            # and of TOGGLE calls when toggling off.
+            (
+                lambda: self.hass.states.is_state(entity_id, STATE_ON),
+                REASON_ALREADY_ON,
+            ),
+            (
+                lambda: self._is_marked_manual_control(entity_id),
+                REASON_MANUAL_CONTROL,
+            ),
+            (
+                lambda: (
+                    switch._take_over_control
+                    and switch._adapt_only_on_bare_turn_on
+                    and self._mark_manual_control_if_non_bare_turn_on(
+                        entity_id,
+                        data[CONF_PARAMS],
+                    )
+                ),
+                REASON_NON_BARE_TURN_ON,
+            ),
+        )
+        return next((reason for check, reason in checks if check()), None)
+
     def _correct_for_multi_light_intercept(
         self,
         entity_ids,
         switch_to_eids,
         switch_name_mapping,
         skipped,
+        context_id: str | None = None,
     ):
         # Check for `multi_light_intercept: true/false`
         mli = [sw._multi_light_intercept for sw in switch_name_mapping.values()]
@@ -1889,6 +2536,18 @@ class AdaptiveLightingManager:
             len(switch_to_eids) == 1 and len(next(iter(switch_to_eids.values()))) > 1
         )
         switch_without_multi_light_intercept = not all(mli)
+        if switch_without_multi_light_intercept and (
+            more_than_one_switch or single_switch_with_multiple_lights
+        ):
+            for switch_name, eids in switch_to_eids.items():
+                for eid in eids:
+                    self.add_decision(
+                        eid,
+                        DECISION_SKIP,
+                        REASON_MULTI_LIGHT_INTERCEPT,
+                        context_id,
+                        switch_name_mapping[switch_name]._name,
+                    )
         if more_than_one_switch and switch_without_multi_light_intercept:
             _LOGGER.warning(
                 "Multiple switches (%s) targeted, but not all have"
@@ -1911,6 +2570,25 @@ class AdaptiveLightingManager:
             switch_to_eids = {}
         return switch_to_eids, switch_name_mapping, skipped
 
+    def _should_intercept_turn_on(self, call: ServiceCall) -> bool:
+        """Whether `_service_interceptor_turn_on_handler` might adapt 'call'.
+
+        This runs for every `light.turn_on` and `light.toggle` call, so it only
+        does cheap checks on the read-only call data and never copies it.
+        """
+        if is_our_context(call.context) and not is_our_context(
+            call.context,
+            "skipped",
+        ):
+            return False
+        params = call.data.get(CONF_PARAMS)
+        if params and (ATTR_EFFECT in params or ATTR_FLASH in params):
+            return False
+        lights = self.lights
+        return any(eid in lights for eid in self._get_entity_list(call.data))
+
+    @timed(METRIC_INTERCEPT_TURN_ON)
+    @watched
     async def _service_interceptor_turn_on_handler(
         self,
         call: ServiceCall,
@@ -1965,10 +2643,6 @@ class AdaptiveLightingManager:
             service_data,
         )
 
-        # Because `_service_interceptor_turn_on_single_light_handler` modifies the
-        # original service data, we need to make a copy of it to use in the `skipped` call
-        service_data_copy = deepcopy(service_data)
-
         entity_ids = self._get_entity_list(service_data)
         # Note: we do not expand light groups anywhere in this method, instead
         # we skip them and rely on the followup call that HA will make
@@ -1977,6 +2651,7 @@ class AdaptiveLightingManager:
         switch_to_eids, switch_name_mapping, skipped = self._separate_entity_ids(
             entity_ids,
             service_data,
+            call.context.id,
         )
 
         (
@@ -1988,6 +2663,7 @@ class AdaptiveLightingManager:
             switch_to_eids,
             switch_name_mapping,
             skipped,
+            call.context.id,
         )
         _LOGGER.debug(
             "(2) _service_interceptor_turn_on_handler: switch_to_eids='%s', skipped='%s'",
@@ -1995,6 +2671,13 @@ class AdaptiveLightingManager:
             skipped,
         )
 
+        # Because `_service_interceptor_turn_on_single_light_handler` updates the
+        # original params, we need a copy of them to use in the `skipped` call.
+        # It only replaces values, so a shallow copy suffices.
+        original_params = (
+            dict(service_data[CONF_PARAMS]) if switch_to_eids and skipped else None
+        )
+
         def modify_service_data(service_data, entity_ids):
             """Modify the service data to contain the entity IDs."""
             service_data.pop(ATTR_ENTITY_ID, None)
@@ -2004,8 +2687,19 @@ class AdaptiveLightingManager:
 
         # Intercept the call for first switch and call _adapt_light for the rest
         has_intercepted = False  # Can only intercept a turn_on call once
+        # The other adaptations and the skipped call are independent, so they
+        # are dispatched concurrently instead of one after another
+        tasks: list[asyncio.Task] = []
         for adaptive_switch_name, _entity_ids in switch_to_eids.items():
             switch = switch_name_mapping[adaptive_switch_name]
+            for eid in _entity_ids:
+                self.add_decision(
+                    eid,
+                    DECISION_ADAPT,
+                    REASON_INTERCEPTED,
+                    call.context.id,
+                    switch._name,
+                )
             transition = service_data[CONF_PARAMS].get(
                 ATTR_TRANSITION,
                 switch.initial_transition,
@@ -2036,11 +2730,12 @@ class AdaptiveLightingManager:
                     context,
                     transition,
                 )
-                await switch._adapt_light(
+                coro = switch._adapt_light(
                     light=eid,
                     context=context,
                     transition=transition,
                 )
+                tasks.append(self.hass.async_create_task(coro))
 
         # Call light.turn_on service for skipped entities
         if skipped:
@@ -2052,17 +2747,30 @@ class AdaptiveLightingManager:
             _LOGGER.debug(
                 "(5) _service_interceptor_turn_on_handler: calling `light.turn_on` with skipped='%s', service_data: '%s', context='%s'",
                 skipped,
-                service_data_copy,  # This is the original service data
+                original_params,  # These are the original params
                 context.id,
             )
-            service_data = {ATTR_ENTITY_ID: skipped, **service_data_copy[CONF_PARAMS]}
-            await self.hass.services.async_call(
+            assert original_params is not None
+            service_data = {ATTR_ENTITY_ID: skipped, **original_params}
+            coro = self.hass.services.async_call(
                 LIGHT_DOMAIN,
                 SERVICE_TURN_ON,
                 service_data,
                 blocking=True,
                 context=context,
             )
+            tasks.append(self.hass.async_create_task(coro))
+
+        if tasks:
+            # An error in one adaptation must not hide the others' results
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    _LOGGER.error(
+                        "Error while adapting the lights of call '%s'",
+                        call.context.id,
+                        exc_info=result,
+                    )
 
     async def _service_interceptor_turn_on_single_light_handler(
         self,
@@ -2088,6 +2796,7 @@ class AdaptiveLightingManager:
         adaptation_data = await switch.prepare_adaptation_data(
             entity_id,
             transition,
+            use_target_payload=True,
         )
         if adaptation_data is None:
             return
@@ -2129,29 +2838,34 @@ class AdaptiveLightingManager:
         if done_tasks := [t for t in self.adaptation_tasks if t.done()]:
             self.adaptation_tasks.difference_update(done_tasks)
 
+    def _is_marked_manual_control(self, light: str) -> bool:
+        record = self.records.get(light)
+        return record is not None and record.manual_control
+
+    @staticmethod
     def _handle_timer(
-        self,
-        light: str,
-        timers_dict: dict[str, _AsyncSingleShotTimer],
+        timer: _AsyncSingleShotTimer | None,
         delay: float | None,
         reset_coroutine: Callable[[], Coroutine[Any, Any, None]],
-    ) -> None:
-        timer = timers_dict.get(light)
+    ) -> _AsyncSingleShotTimer | None:
+        """Start, restart, or cancel 'timer' and return the timer that should be kept."""
         if timer is not None:
             if delay is None:  # Timer object exists, but should not anymore
                 timer.cancel()
-                timers_dict.pop(light)
-            else:  # Timer object already exists, just update the delay and restart it
-                timer.delay = delay
-                timer.start()
-        elif delay is not None:  # Timer object does not exist, create it
+                return None
+            # Timer object already exists, just update the delay and restart it
+            timer.delay = delay
+            timer.start()
+            return timer
+        if delay is not None:  # Timer object does not exist, create it
             timer = _AsyncSingleShotTimer(delay, reset_coroutine)
-            timers_dict[light] = timer
             timer.start()
+        return timer
 
     def start_transition_timer(self, light: str) -> None:
         """Mark a light as manually controlled."""
-        last_service_data = self.last_service_data.get(light)
+        record = self.record(light)
+        last_service_data = record.last_service_data
         if last_service_data is None:
             _LOGGER.debug(
                 "No last service data for light %s, not starting timer.",
@@ -2180,14 +2894,19 @@ class AdaptiveLightingManager:
                 light,
             )
 
-        self._handle_timer(light, self.transition_timers, last_transition, reset)
+        record.transition_timer = self._handle_timer(
+            record.transition_timer,
+            last_transition,
+            reset,
+        )
 
     def set_auto_reset_manual_control_times(self, lights: list[str], time: float):
         """Set the time after which the lights are automatically reset."""
         if time == 0:
             return
         for light in lights:
-            old_time = self.auto_reset_manual_control_times.get(light)
+            record = self.record(light)
+            old_time = record.auto_reset_manual_control_time
             if (old_time is not None) and (old_time != time):
                 _LOGGER.info(
                     "Setting auto_reset_manual_control for '%s' from %s seconds to %s seconds."
@@ -2197,13 +2916,14 @@ class AdaptiveLightingManager:
                     old_time,
                     time,
                 )
-            self.auto_reset_manual_control_times[light] = time
+            record.auto_reset_manual_control_time = time
 
     def mark_as_manual_control(self, light: str) -> None:
         """Mark a light as manually controlled."""
         _LOGGER.debug("Marking '%s' as manually controlled.", light)
-        self.manual_control[light] = True
-        delay = self.auto_reset_manual_control_times.get(light)
+        record = self.record(light)
+        record.manual_control = True
+        delay = record.auto_reset_manual_control_time
 
         async def reset():
             _LOGGER.debug(
@@ -2223,9 +2943,13 @@ class AdaptiveLightingManager:
                     transition=switch.initial_transition,
                     force=True,
                 )
-            assert not self.manual_control[light]
+            assert not record.manual_control
 
-        self._handle_timer(light, self.auto_reset_manual_control_timers, delay, reset)
+        record.auto_reset_manual_control_timer = self._handle_timer(
+            record.auto_reset_manual_control_timer,
+            delay,
+            reset,
+        )
 
     def cancel_ongoing_adaptation_calls(
         self,
@@ -2233,43 +2957,32 @@ class AdaptiveLightingManager:
         which: Literal["color", "brightness", "both"] = "both",
     ):
         """Cancel ongoing adaptation service calls for a specific light entity."""
-        brightness_task = self.adaptation_tasks_brightness.get(light_id)
-        color_task = self.adaptation_tasks_color.get(light_id)
-        if (
-            which in ("both", "brightness")
-            and brightness_task is not None
-            and not brightness_task.done()
-        ):
-            _LOGGER.debug(
-                "Cancelled ongoing brightness adaptation calls (%s) for '%s'",
-                brightness_task,
-                light_id,
-            )
-            brightness_task.cancel()
-        if (
-            which in ("both", "color")
-            and color_task is not None
-            and color_task is not brightness_task
-            and not color_task.done()
-        ):
-            _LOGGER.debug(
-                "Cancelled ongoing color adaptation calls (%s) for '%s'",
-                color_task,
-                light_id,
-            )
-            # color_task might be the same as brightness_task
-            color_task.cancel()
+        if (record := self.records.get(light_id)) is not None:
+            record.cancel_adaptation_tasks(which)
 
     def reset(self, *lights, reset_manual_control: bool = True) -> None:
         """Reset the 'manual_control' status of the lights."""
         for light in lights:
-            if reset_manual_control:
-                self.manual_control[light] = False
-                if timer := self.auto_reset_manual_control_timers.pop(light, None):
-                    timer.cancel()
-            self.our_last_state_on_change.pop(light, None)
-            self.last_service_data.pop(light, None)
-            self.cancel_ongoing_adaptation_calls(light)
+            self.record(light).reset(reset_manual_control)
+
+    @callback
+    def _clear_area_lights(self, _event: Event) -> None:
+        """Invalidate the area → lights index after a registry update."""
+        self._area_lights.clear()
+
+    def area_lights(self, area_id: str) -> tuple[str, ...]:
+        """Return the lights in 'area_id', using the cached index if possible."""
+        lights = self._area_lights.get(area_id)
+        if lights is not None:
+            self.area_lights_stats.hits += 1
+        else:
+            self.area_lights_stats.misses += 1
+            lights = self._area_lights[area_id] = tuple(
+                entity_id
+                for entity_id in area_entities(self.hass, area_id)
+                if entity_id.startswith(LIGHT_DOMAIN)
+            )
+        return lights
 
     def _get_entity_list(self, service_data: ServiceData) -> list[str]:
         if ATTR_ENTITY_ID in service_data:
@@ -2278,13 +2991,7 @@ class AdaptiveLightingManager:
             entity_ids = []
             area_ids = cv.ensure_list_csv(service_data[ATTR_AREA_ID])
             for area_id in area_ids:
-                area_entity_ids = area_entities(self.hass, area_id)
-                eids = [
-                    entity_id
-                    for entity_id in area_entity_ids
-                    if entity_id.startswith(LIGHT_DOMAIN)
-                ]
-                entity_ids.extend(eids)
+                entity_ids.extend(self.area_lights(area_id))
                 _LOGGER.debug(
                     "Found entity_ids '%s' for area_id '%s'",
                     entity_ids,
@@ -2297,6 +3004,7 @@ class AdaptiveLightingManager:
         )
         return []
 
+    @watched
     async def turn_on_off_event_listener(self, event: Event) -> None:
         """Track 'light.turn_off' and 'light.turn_on' service calls."""
         domain = event.data.get(ATTR_DOMAIN)
@@ -2310,16 +3018,18 @@ class AdaptiveLightingManager:
         if not any(eid in self.lights for eid in entity_ids):
             return
 
-        def off(eid: str, event: Event):
-            self.turn_off_event[eid] = event
-            self.reset(eid)
+        snapshot = EventSnapshot.from_event(event)
+
+        def off(record: LightRecord):
+            record.turn_off_event = snapshot
+            record.reset()
 
-        def on(eid: str, event: Event):
-            task = self.sleep_tasks.get(eid)
+        def on(record: LightRecord, event: Event):
+            task = record.sleep_task
             if task is not None:
                 task.cancel()
-            self.turn_on_event[eid] = event
-            timer = self.auto_reset_manual_control_timers.get(eid)
+            record.turn_on_event = snapshot
+            timer = record.auto_reset_manual_control_timer
             if (
                 timer is not None
                 and timer.is_running()
@@ -2328,6 +3038,9 @@ class AdaptiveLightingManager:
                 # Restart the auto reset timer
                 timer.start()
 
+        # Only keep records of the lights we track
+        entity_ids = [eid for eid in entity_ids if eid in self.lights]
+
         if service == SERVICE_TURN_OFF:
             transition = service_data.get(ATTR_TRANSITION)
             _LOGGER.debug(
@@ -2337,7 +3050,7 @@ class AdaptiveLightingManager:
                 event.context.id,
             )
             for eid in entity_ids:
-                off(eid, event)
+                off(self.record(eid))
 
         elif service == SERVICE_TURN_ON:
             _LOGGER.debug(
@@ -2346,7 +3059,7 @@ class AdaptiveLightingManager:
                 event.context.id,
             )
             for eid in entity_ids:
-                on(eid, event)
+                on(self.record(eid), event)
 
         elif service == SERVICE_TOGGLE:
             _LOGGER.debug(
@@ -2356,12 +3069,72 @@ class AdaptiveLightingManager:
             )
             for eid in entity_ids:
                 state = self.hass.states.get(eid).state
-                self.toggle_event[eid] = event
+                record = self.record(eid)
+                record.toggle_event = snapshot
                 if state == STATE_ON:  # is turning off
-                    off(eid, event)
+                    off(record)
                 elif state == STATE_OFF:  # is turning on
-                    on(eid, event)
+                    on(record, event)
+
+    @staticmethod
+    def _invalidate_capabilities(
+        record: LightRecord,
+        old_state: State | None,
+        new_state: State,
+    ) -> None:
+        """Forget the cached capabilities when the light reports new ones."""
+        if record.capabilities is not None and (
+            old_state is None
+            or capability_attributes_changed(old_state.attributes, new_state.attributes)
+        ):
+            record.capabilities = None
 
+    def _update_state_history(self, record: LightRecord, new_state: State) -> None:
+        """Add a 'state_changed' event of a light that is on to its state history."""
+        entity_id = record.entity_id
+        _LOGGER.debug(
+            "Detected a '%s' 'state_changed' event: '%s' with context.id='%s'",
+            entity_id,
+            new_state.attributes,
+            new_state.context.id,
+        )
+        # It is possible to have multiple state change events with the same context.
+        # This can happen because a `turn_on.light(brightness_pct=100, transition=30)`
+        # event leads to an instant state change of
+        # `new_state=dict(brightness=100, ...)`. However, after polling the light
+        # could still only be `new_state=dict(brightness=50, ...)`.
+        # We save all events because the first event change might indicate at what
+        # settings the light will be later *or* the second event might indicate a
+        # final state. The latter case happens for example when a light was
+        # called with a color_temp outside of its range (and HA reports the
+        # incorrect 'min_kelvin' and 'max_kelvin', which happens e.g., for
+        # Philips Hue White GU10 Bluetooth lights).
+        # Only compact snapshots are kept (in a bounded buffer) to not keep the
+        # `State` objects alive for lights that keep reporting.
+        history = record.state_history
+        snapshot = StateSnapshot.from_state(new_state)
+        if is_our_context(new_state.context):
+            if history is not None and history.context_id == new_state.context.id:
+                _LOGGER.debug(
+                    "AdaptiveLightingManager: State change event of '%s' is already"
+                    " in its state history (%s)"
+                    " adding this state also",
+                    entity_id,
+                    new_state.context.id,
+                )
+                history.append(snapshot)
+            else:
+                _LOGGER.debug(
+                    "AdaptiveLightingManager: New adapt '%s' found for %s",
+                    new_state,
+                    entity_id,
+                )
+                record.state_history = StateHistory(snapshot)
+                self.start_transition_timer(entity_id)
+        elif history is not None:
+            history.append(snapshot)
+
+    @watched
     async def state_changed_event_listener(self, event: Event) -> None:
         """Track 'state_changed' events."""
         entity_id = event.data.get(ATTR_ENTITY_ID, "")
@@ -2370,61 +3143,24 @@ class AdaptiveLightingManager:
 
         old_state = event.data.get("old_state")
         new_state = event.data.get("new_state")
+        if new_state is None:
+            self._forget_removed_light(entity_id)
+            return
 
         new_on = new_state is not None and new_state.state == STATE_ON
         new_off = new_state is not None and new_state.state == STATE_OFF
         old_on = old_state is not None and old_state.state == STATE_ON
         old_off = old_state is not None and old_state.state == STATE_OFF
 
+        record = self.record(entity_id)
+        self._invalidate_capabilities(record, old_state, new_state)
         if new_on:
-            _LOGGER.debug(
-                "Detected a '%s' 'state_changed' event: '%s' with context.id='%s'",
-                entity_id,
-                new_state.attributes,
-                new_state.context.id,
-            )
-            # It is possible to have multiple state change events with the same context.
-            # This can happen because a `turn_on.light(brightness_pct=100, transition=30)`
-            # event leads to an instant state change of
-            # `new_state=dict(brightness=100, ...)`. However, after polling the light
-            # could still only be `new_state=dict(brightness=50, ...)`.
-            # We save all events because the first event change might indicate at what
-            # settings the light will be later *or* the second event might indicate a
-            # final state. The latter case happens for example when a light was
-            # called with a color_temp outside of its range (and HA reports the
-            # incorrect 'min_kelvin' and 'max_kelvin', which happens e.g., for
-            # Philips Hue White GU10 Bluetooth lights).
-            last_state: list[State] | None = self.our_last_state_on_change.get(
-                entity_id,
-            )
-            if is_our_context(new_state.context):
-                if (
-                    last_state is not None
-                    and last_state[0].context.id == new_state.context.id
-                ):
-                    _LOGGER.debug(
-                        "AdaptiveLightingManager: State change event of '%s' is already"
-                        " in 'self.our_last_state_on_change' (%s)"
-                        " adding this state also",
-                        entity_id,
-                        new_state.context.id,
-                    )
-                    self.our_last_state_on_change[entity_id].append(new_state)
-                else:
-                    _LOGGER.debug(
-                        "AdaptiveLightingManager: New adapt '%s' found for %s",
-                        new_state,
-                        entity_id,
-                    )
-                    self.our_last_state_on_change[entity_id] = [new_state]
-                    self.start_transition_timer(entity_id)
-            elif last_state is not None:
-                self.our_last_state_on_change[entity_id].append(new_state)
+            self._update_state_history(record, new_state)
 
         if old_on and new_off:
             # Tracks 'on' → 'off' state changes
-            self.on_to_off_event[entity_id] = event
-            self.reset(entity_id)
+            record.on_to_off_event = EventSnapshot.from_event(event)
+            record.reset()
             _LOGGER.debug(
                 "Detected an 'on' → 'off' event for '%s' with context.id='%s'",
                 entity_id,
@@ -2432,7 +3168,7 @@ class AdaptiveLightingManager:
             )
         elif old_off and new_on:
             # Tracks 'off' → 'on' state changes
-            self.off_to_on_event[entity_id] = event
+            record.off_to_on_event = EventSnapshot.from_event(event)
             _LOGGER.debug(
                 "Detected an 'off' → 'on' event for '%s' with context.id='%s'",
                 entity_id,
@@ -2449,11 +3185,17 @@ class AdaptiveLightingManager:
                 # Note: the reset below already happened in `_service_interceptor_turn_on_handler`
                 return
 
-            self.reset(entity_id, reset_manual_control=False)
-            lock = self.turn_off_locks.setdefault(entity_id, asyncio.Lock())
-            async with lock:
+            record.reset(reset_manual_control=False)
+            if record.turn_off_lock is None:
+                record.turn_off_lock = asyncio.Lock()
+            async with record.turn_off_lock:
                 if await self.just_turned_off(entity_id):
                     # Stop if a rapid 'off' → 'on' → 'off' happens.
+                    record.add_decision(
+                        DECISION_SKIP,
+                        REASON_JUST_TURNED_OFF,
+                        event.context.id,
+                    )
                     _LOGGER.debug(
                         "Cancelling adjusting lights for %s",
                         entity_id,
@@ -2477,19 +3219,20 @@ class AdaptiveLightingManager:
         adapt_color: bool,
     ) -> bool:
         """Check if the light has been 'on' and is now manually controlled."""
-        manual_control = self.manual_control.setdefault(light, False)
+        record = self.record(light)
+        manual_control = record.manual_control
         if manual_control:
             # Manually controlled until light is turned on and off
             return True
 
-        turn_on_event = self.turn_on_event.get(light)
+        turn_on_event = record.turn_on_event
         if (
             turn_on_event is not None
-            and not self.is_proactively_adapting(turn_on_event.context.id)
-            and not is_our_context(turn_on_event.context)
+            and not self.is_proactively_adapting(turn_on_event.context_id)
+            and not is_our_context_id(turn_on_event.context_id)
             and not force
         ):
-            keys = turn_on_event.data[ATTR_SERVICE_DATA].keys()
+            keys = turn_on_event.service_data_keys
             if (
                 (adapt_color and COLOR_ATTRS.intersection(keys))
                 or (adapt_brightness and BRIGHTNESS_ATTRS.intersection(keys))
@@ -2506,7 +3249,7 @@ class AdaptiveLightingManager:
                     " Lighting will stop adapting the light until the switch or the"
                     " light turns off and then on again.",
                     light,
-                    turn_on_event.context.id,
+                    turn_on_event.context_id,
                 )
         return manual_control
 
@@ -2527,7 +3270,8 @@ class AdaptiveLightingManager:
         """
         assert switch._detect_non_ha_changes
 
-        last_service_data = self.last_service_data.get(light)
+        record = self.records.get(light)
+        last_service_data = record.last_service_data if record else None
         if last_service_data is None:
             return False
         # Update state and check for a manual change not done in HA.
@@ -2569,11 +3313,11 @@ class AdaptiveLightingManager:
     def _off_to_on_state_event_is_from_turn_on(
         self,
         entity_id: str,
-        off_to_on_event: Event,
+        off_to_on_event: EventSnapshot,
     ) -> bool:
         # Adaptive Lighting should never turn on lights itself
-        if is_our_context(off_to_on_event.context) and not is_our_context(
-            off_to_on_event.context,
+        if is_our_context_id(off_to_on_event.context_id) and not is_our_context_id(
+            off_to_on_event.context_id,
             "service",  # adaptive_lighting.apply is allowed to turn on lights
         ):
             _LOGGER.warning(
@@ -2582,15 +3326,16 @@ class AdaptiveLightingManager:
                 " which *should* not happen. If you see this please submit an issue with"
                 " your full logs at https://github.com/basnijholt/adaptive-lighting",
                 entity_id,
-                off_to_on_event.context.id,
+                off_to_on_event.context_id,
                 off_to_on_event,
             )
-        turn_on_event: Event | None = self.turn_on_event.get(entity_id)
-        id_off_to_on = off_to_on_event.context.id
+        record = self.records.get(entity_id)
+        turn_on_event = record.turn_on_event if record else None
+        id_off_to_on = off_to_on_event.context_id
         return (
             turn_on_event is not None
             and id_off_to_on is not None
-            and id_off_to_on == turn_on_event.context.id
+            and id_off_to_on == turn_on_event.context_id
         )
 
     async def just_turned_off(  # noqa: PLR0911
@@ -2609,8 +3354,9 @@ class AdaptiveLightingManager:
         if the brightness is still decreasing. Only if it is the case we
         adjust the lights.
         """
-        off_to_on_event = self.off_to_on_event[entity_id]
-        on_to_off_event = self.on_to_off_event.get(entity_id)
+        record = self.record(entity_id)
+        off_to_on_event = record.off_to_on_event
+        on_to_off_event = record.on_to_off_event
 
         if on_to_off_event is None:
             _LOGGER.debug(
@@ -2620,7 +3366,7 @@ class AdaptiveLightingManager:
             )
             return False
 
-        if off_to_on_event.context.id == on_to_off_event.context.id:
+        if off_to_on_event.context_id == on_to_off_event.context_id:
             _LOGGER.debug(
                 "just_turned_off: 'on' → 'off' state change has the same context.id as the"
                 " 'off' → 'on' state change for '%s'. This is probably a false positive.",
@@ -2628,16 +3374,17 @@ class AdaptiveLightingManager:
             )
             return True
 
-        id_on_to_off = on_to_off_event.context.id
+        id_on_to_off = on_to_off_event.context_id
 
-        turn_off_event = self.turn_off_event.get(entity_id)
-        if turn_off_event is not None:
-            transition = turn_off_event.data[ATTR_SERVICE_DATA].get(ATTR_TRANSITION)
-        else:
-            transition = None
+        turn_off_event = record.turn_off_event
+        transition = turn_off_event.transition if turn_off_event is not None else None
 
         if self._off_to_on_state_event_is_from_turn_on(entity_id, off_to_on_event):
-            is_toggle = off_to_on_event == self.toggle_event.get(entity_id)
+            toggle_event = record.toggle_event
+            is_toggle = (
+                toggle_event is not None
+                and off_to_on_event.context_id == toggle_event.context_id
+            )
             from_service = "light.toggle" if is_toggle else "light.turn_on"
             _LOGGER.debug(
                 "just_turned_off: State change 'off' → 'on' triggered by '%s'",
@@ -2647,7 +3394,7 @@ class AdaptiveLightingManager:
 
         if (
             turn_off_event is not None
-            and id_on_to_off == turn_off_event.context.id
+            and id_on_to_off == turn_off_event.context_id
             and id_on_to_off is not None
             and transition is not None  # 'turn_off' is called with transition=...
         ):
@@ -2685,7 +3432,7 @@ class AdaptiveLightingManager:
             # specified time in the 'turn_off' service.
             coro = asyncio.sleep(delay)
             total_sleep += delay
-            task = self.sleep_tasks[entity_id] = asyncio.ensure_future(coro)
+            task = record.sleep_task = asyncio.ensure_future(coro)
             try:
                 await task
             except asyncio.CancelledError:  # 'light.turn_on' has been called
@@ -2722,7 +3469,7 @@ class AdaptiveLightingManager:
     def _mark_manual_control_if_non_bare_turn_on(
         self,
         entity_id: str,
-        service_data: ServiceData,
+        service_data: ServiceData | Collection[str],
     ) -> bool:
         _LOGGER.debug(
             "_mark_manual_control_if_non_bare_turn_on: entity_id='%s', service_data='%s'",
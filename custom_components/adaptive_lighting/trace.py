@@ -0,0 +1,283 @@
+"""Record and read traces of the events handled by Adaptive Lighting.
+
+A trace is a JSON lines file. The first line is a header with the start time,
+the Adaptive Lighting config entries and the states of all lights and switches
+when the recording started. Every other line is a compact list describing one
+`call_service` or `state_changed` event::
+
+    [time, "call", domain, service, service_data, context_id, parent_id]
+    [time, "state", entity_id, state, changed_attributes, removed_attributes,
+     context_id, parent_id]
+
+'time' is the number of seconds since the start, and light attributes are only
+stored when they changed since the previous state of that light. A trace can
+be replayed against the manager to reproduce the event interleavings of a real
+installation, see `tests/test_trace.py`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import homeassistant.util.dt as dt_util
+from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import (
+    ATTR_DOMAIN,
+    ATTR_ENTITY_ID,
+    ATTR_SERVICE,
+    ATTR_SERVICE_DATA,
+    EVENT_CALL_SERVICE,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import Event, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.json import json_dumps
+
+from .const import (
+    ADAPT_BRIGHTNESS_SWITCH,
+    ADAPT_COLOR_SWITCH,
+    DOMAIN,
+    SLEEP_MODE_SWITCH,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+TRACE_FILENAME = "adaptive_lighting_trace_{}.jsonl"
+TRACE_CALL = "call"
+TRACE_STATE = "state"
+
+# The entities of a config entry in `hass.data[DOMAIN][entry_id]`
+_ENTITY_KEYS = (
+    SWITCH_DOMAIN,
+    SLEEP_MODE_SWITCH,
+    ADAPT_COLOR_SWITCH,
+    ADAPT_BRIGHTNESS_SWITCH,
+)
+
+_trace_lock = asyncio.Lock()
+
+
+class TraceBusyError(HomeAssistantError):
+    """A trace is already being recorded."""
+
+
+@dataclass(frozen=True, slots=True)
+class TraceCall:
+    """A recorded `call_service` event."""
+
+    time: float
+    domain: str
+    service: str
+    service_data: dict[str, Any]
+    context_id: str | None
+    parent_id: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class TraceState:
+    """A recorded `state_changed` event with the complete new attributes."""
+
+    time: float
+    entity_id: str
+    state: str | None  # None if the entity was removed
+    attributes: dict[str, Any]
+    context_id: str | None
+    parent_id: str | None
+
+
+@dataclass(slots=True)
+class Trace:
+    """The header and events of a trace."""
+
+    start: dt.datetime
+    entries: list[dict[str, Any]]
+    lights: dict[str, tuple[str, dict[str, Any]]]
+    switches: dict[str, str]
+    events: list[TraceCall | TraceState] = field(default_factory=list)
+
+
+def _entity_ids(hass: HomeAssistant) -> set[str]:
+    """Return the entity_ids of all Adaptive Lighting switches."""
+    entity_ids = set()
+    for data in hass.data.get(DOMAIN, {}).values():
+        if not isinstance(data, dict):
+            continue  # the manager
+        for key in _ENTITY_KEYS:
+            if (entity := data.get(key)) is not None and entity.entity_id:
+                entity_ids.add(entity.entity_id)
+    return entity_ids
+
+
+class TraceRecorder:
+    """Record the `call_service` and `state_changed` events that matter to us."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the recorder, which starts recording with `start`."""
+        self.hass = hass
+        self.lines: list[str] = []
+        self._start = 0.0
+        self._entity_ids: set[str] = set()
+        self._attributes: dict[str, dict[str, Any]] = {}
+        self._remove_listeners: list[CALLBACK_TYPE] = []
+
+    @property
+    def events(self) -> int:
+        """Return the number of recorded events."""
+        return max(0, len(self.lines) - 1)
+
+    def start(self) -> None:
+        """Record the header and subscribe to the events."""
+        hass = self.hass
+        now = dt_util.utcnow()
+        self._start = now.timestamp()
+        self._entity_ids = _entity_ids(hass)
+        lights = {}
+        for state in hass.states.async_all(LIGHT_DOMAIN):
+            self._attributes[state.entity_id] = dict(state.attributes)
+            lights[state.entity_id] = [state.state, state.attributes]
+        switches = {
+            entity_id: state.state
+            for entity_id in sorted(self._entity_ids)
+            if (state := hass.states.get(entity_id)) is not None
+        }
+        header = {
+            "version": TRACE_VERSION,
+            "start": now.isoformat(),
+            "entries": [
+                {
+                    "title": entry.title,
+                    "data": dict(entry.data),
+                    "options": dict(entry.options),
+                }
+                for entry in hass.config_entries.async_entries(DOMAIN)
+            ],
+            "lights": lights,
+            "switches": switches,
+        }
+        self.lines = [json_dumps(header)]
+        self._remove_listeners = [
+            hass.bus.async_listen(EVENT_CALL_SERVICE, self._call_service_listener),
+            hass.bus.async_listen(EVENT_STATE_CHANGED, self._state_changed_listener),
+        ]
+
+    def stop(self) -> None:
+        """Stop recording."""
+        while self._remove_listeners:
+            self._remove_listeners.pop()()
+
+    def _add(self, event: Event, *fields: Any) -> None:
+        time = round(event.time_fired_timestamp - self._start, 3)
+        context = event.context
+        self.lines.append(json_dumps([time, *fields, context.id, context.parent_id]))
+
+    @callback
+    def _call_service_listener(self, event: Event) -> None:
+        data = event.data
+        domain = data[ATTR_DOMAIN]
+        service_data = data.get(ATTR_SERVICE_DATA) or {}
+        if domain == SWITCH_DOMAIN:
+            entity_ids = cv.ensure_list(service_data.get(ATTR_ENTITY_ID))
+            if self._entity_ids.isdisjoint(entity_ids):
+                return
+        elif domain not in (LIGHT_DOMAIN, DOMAIN):
+            return
+        self._add(event, TRACE_CALL, domain, data[ATTR_SERVICE], service_data)
+
+    @callback
+    def _state_changed_listener(self, event: Event) -> None:
+        entity_id = event.data[ATTR_ENTITY_ID]
+        if not entity_id.startswith(f"{LIGHT_DOMAIN}."):
+            return
+        new_state = event.data["new_state"]
+        if new_state is None:
+            self._attributes.pop(entity_id, None)
+            self._add(event, TRACE_STATE, entity_id, None, {}, [])
+            return
+        old = self._attributes.get(entity_id, {})
+        new = dict(new_state.attributes)
+        changed = {k: v for k, v in new.items() if k not in old or old[k] != v}
+        removed = [k for k in old if k not in new]
+        self._attributes[entity_id] = new
+        self._add(event, TRACE_STATE, entity_id, new_state.state, changed, removed)
+
+
+def _write_lines(path: str, lines: list[str]) -> None:
+    with Path(path).open("w") as f:
+        f.writelines(line + "\n" for line in lines)
+
+
+async def async_record_trace(hass: HomeAssistant, duration: float) -> dict[str, Any]:
+    """Record a trace for 'duration' seconds and write it to the config directory."""
+    if _trace_lock.locked():
+        msg = "An Adaptive Lighting trace is already being recorded"
+        raise TraceBusyError(msg)
+    async with _trace_lock:
+        _LOGGER.debug("Recording an Adaptive Lighting trace for %s seconds", duration)
+        recorder = TraceRecorder(hass)
+        recorder.start()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            recorder.stop()
+        timestamp = dt_util.utcnow().strftime("%Y%m%d_%H%M%S")
+        path = hass.config.path(TRACE_FILENAME.format(timestamp))
+        await hass.async_add_executor_job(_write_lines, path, recorder.lines)
+    _LOGGER.debug("Wrote Adaptive Lighting trace to '%s'", path)
+    return {"path": path, "duration": duration, "events": recorder.events}
+
+
+def parse_trace(lines: Iterable[str]) -> Trace:
+    """Parse the lines of a trace and expand the attributes of the states."""
+    lines = iter(lines)
+    header = json.loads(next(lines))
+    if header.get("version") != TRACE_VERSION:
+        msg = f"Unsupported trace version: {header.get('version')}"
+        raise ValueError(msg)
+    trace = Trace(
+        start=dt.datetime.fromisoformat(header["start"]),
+        entries=header["entries"],
+        lights={
+            entity_id: (state, attrs)
+            for entity_id, (state, attrs) in header["lights"].items()
+        },
+        switches=header["switches"],
+    )
+    # The latest attributes of every light
+    attributes = {entity_id: attrs for entity_id, (_, attrs) in trace.lights.items()}
+    for line in lines:
+        if not line.strip():
+            continue
+        time, kind, *fields = json.loads(line)
+        if kind == TRACE_CALL:
+            trace.events.append(TraceCall(time, *fields))
+        elif kind == TRACE_STATE:
+            entity_id, state, changed, removed, context_id, parent_id = fields
+            if state is None:
+                attrs = {}
+                attributes.pop(entity_id, None)
+            else:
+                attrs = {**attributes.get(entity_id, {}), **changed}
+                for key in removed:
+                    attrs.pop(key, None)
+                attributes[entity_id] = attrs
+            trace.events.append(
+                TraceState(time, entity_id, state, attrs, context_id, parent_id),
+            )
+        else:
+            msg = f"Unknown trace event kind: {kind}"
+            raise ValueError(msg)
+    return trace
@@ -0,0 +1,174 @@
+"""Watchdog for Adaptive Lighting callbacks that block the event loop."""
+
+from __future__ import annotations
+
+import functools
+import logging
+from collections import deque
+from dataclasses import asdict, dataclass
+from time import perf_counter, time
+from typing import TYPE_CHECKING, Any, Concatenate, ParamSpec, TypeVar
+
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_SERVICE_DATA
+from homeassistant.core import Event, ServiceCall
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Coroutine, Generator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of blocking callbacks kept for the diagnostics
+BLOCK_HISTORY_SIZE = 50
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True, slots=True)
+class LoopBlock:
+    """A single synchronous step of a callback that took longer than the threshold."""
+
+    callback: str
+    target: str | None
+    duration_ms: float
+    timestamp: float
+
+
+class LoopWatchdog:
+    """Measure the time callbacks spend on the event loop between awaits."""
+
+    def __init__(self) -> None:
+        """Initialize a disabled watchdog."""
+        self.threshold: float | None = None  # seconds
+        self.count = 0
+        self.blocks: deque[LoopBlock] = deque(maxlen=BLOCK_HISTORY_SIZE)
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether callbacks are watched."""
+        return self.threshold is not None
+
+    def report(self, callback: str, target: str | None, seconds: float) -> None:
+        """Record that 'callback' blocked the event loop for 'seconds'."""
+        block = LoopBlock(callback, target, seconds * 1000, time())
+        self.count += 1
+        self.blocks.append(block)
+        _LOGGER.warning(
+            "'%s' for '%s' blocked the event loop for %.1f ms",
+            callback,
+            target,
+            block.duration_ms,
+        )
+
+    def watch(
+        self,
+        coro: Coroutine[Any, Any, _R],
+        callback: str,
+        target: str | None,
+    ) -> Awaitable[_R]:
+        """Return an awaitable that runs 'coro' and reports blocking steps."""
+        return _WatchedCoroutine(self, coro, callback, target)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of the blocking callbacks."""
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": None if self.threshold is None else self.threshold * 1000,
+            "count": self.count,
+            "recent": [asdict(block) for block in self.blocks],
+        }
+
+
+class _WatchedCoroutine:
+    """Drive a coroutine and measure every step between two awaits."""
+
+    __slots__ = ("_callback", "_coro", "_target", "_watchdog")
+
+    def __init__(
+        self,
+        watchdog: LoopWatchdog,
+        coro: Coroutine[Any, Any, Any],
+        callback: str,
+        target: str | None,
+    ) -> None:
+        self._watchdog = watchdog
+        self._coro = coro
+        self._callback = callback
+        self._target = target
+
+    def _check(self, start: float) -> None:
+        duration = perf_counter() - start
+        threshold = self._watchdog.threshold
+        if threshold is not None and duration > threshold:
+            self._watchdog.report(self._callback, self._target, duration)
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        coro = self._coro
+        value: Any = None
+        exception: BaseException | None = None
+        while True:
+            start = perf_counter()
+            try:
+                if exception is None:
+                    yielded = coro.send(value)
+                else:
+                    yielded = coro.throw(exception)
+            except StopIteration as stop:
+                self._check(start)
+                return stop.value
+            except BaseException:
+                self._check(start)
+                raise
+            self._check(start)
+            try:
+                value = yield yielded
+                exception = None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as err:  # noqa: BLE001
+                value = None
+                exception = err
+
+
+def _target(obj: Any, args: tuple[Any, ...]) -> str | None:
+    """Describe the switch and the light(s) a callback is handling."""
+    parts = []
+    if (name := getattr(obj, "_name", None)) is not None:
+        parts.append(str(name))
+    if args:
+        arg = args[0]
+        if isinstance(arg, str):
+            entity_id = arg
+        elif isinstance(arg, Event | ServiceCall):
+            data = arg.data
+            entity_id = data.get(ATTR_ENTITY_ID) or data.get(
+                ATTR_SERVICE_DATA,
+                {},
+            ).get(ATTR_ENTITY_ID)
+        else:  # e.g., AdaptationData
+            entity_id = getattr(arg, "entity_id", None)
+        if entity_id:
+            parts.append(str(entity_id))
+    return ", ".join(parts) or None
+
+
+def watched(
+    func: Callable[Concatenate[_T, _P], Coroutine[Any, Any, _R]],
+) -> Callable[Concatenate[_T, _P], Coroutine[Any, Any, _R]]:
+    """Watch an async method of an object with a `watchdog` attribute."""
+    callback = func.__qualname__
+
+    @functools.wraps(func)
+    async def wrapper(self: _T, *args: _P.args, **kwargs: _P.kwargs) -> _R:
+        watchdog: LoopWatchdog = self.watchdog  # type: ignore[attr-defined]
+        if not watchdog.enabled:
+            return await func(self, *args, **kwargs)
+        return await watchdog.watch(
+            func(self, *args, **kwargs),
+            callback,
+            _target(self, args),
+        )
+
+    return wrapper
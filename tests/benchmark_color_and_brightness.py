@@ -0,0 +1,256 @@
+"""Micro-benchmarks for the hot functions in `color_and_brightness.py`.
+
+The inputs are generated from a fixed seed for three locations (equator,
+mid-latitude and near-polar), so results of different runs are comparable.
+Run from the Home Assistant core checkout (see README.md in this directory):
+
+    python -m tests.components.adaptive_lighting.benchmark_color_and_brightness \
+        --output benchmark.json
+
+`test_color_and_brightness.py` runs every benchmark once to keep them working.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import platform
+import random
+import statistics
+import timeit
+import zoneinfo
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from astral import LocationInfo
+from astral.location import Location
+from homeassistant.components.adaptive_lighting.color_and_brightness import (
+    SunLightSettings,
+    lerp_color_hsv,
+    scaled_tanh,
+)
+from homeassistant.components.adaptive_lighting.helpers import (
+    color_difference_redmean,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+SEED = 42
+# Number of inputs per benchmark
+SIZE = 100
+# Name → (latitude, longitude, timezone), the sun rises every day at all of them
+LOCATIONS = {
+    "equator": (0.3476, 32.5825, "Africa/Kampala"),
+    "mid_latitude": (52.379189, 4.899431, "Europe/Amsterdam"),
+    "near_polar": (64.1466, -21.9426, "Atlantic/Reykjavik"),
+}
+BRIGHTNESS_MODES = ("default", "linear", "tanh")
+VARIANTS = ("sun", "lux", "sleep")
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A function that is called once for each of its inputs."""
+
+    name: str
+    func: Callable[[Any], Any]
+    inputs: Sequence[Any]
+
+    def run(self, number: int, repeat: int) -> dict[str, Any]:
+        """Time 'number' passes over the inputs, 'repeat' times."""
+        func, inputs = self.func, self.inputs
+
+        def loop() -> None:
+            for x in inputs:
+                func(x)
+
+        calls = number * len(inputs)
+        per_call_us = [
+            t / calls * 1e6 for t in timeit.repeat(loop, number=number, repeat=repeat)
+        ]
+        return {
+            "name": self.name,
+            "calls": calls,
+            "repeat": repeat,
+            "min_us": min(per_call_us),
+            "median_us": statistics.median(per_call_us),
+            "max_us": max(per_call_us),
+        }
+
+
+def location(name: str) -> tuple[Location, zoneinfo.ZoneInfo]:
+    """Return the astral location and timezone of one of `LOCATIONS`."""
+    latitude, longitude, timezone = LOCATIONS[name]
+    astral_location = Location(
+        LocationInfo(
+            name=name,
+            region="region",
+            timezone=timezone,
+            latitude=latitude,
+            longitude=longitude,
+        ),
+    )
+    return astral_location, zoneinfo.ZoneInfo(timezone)
+
+
+def light_settings(
+    location_name: str,
+    brightness_mode: str = "default",
+    lux_sensor: str | None = None,
+) -> SunLightSettings:
+    """Return the settings that the benchmarks use at a location."""
+    astral_location, timezone = location(location_name)
+    return SunLightSettings(
+        name="benchmark",
+        astral_location=astral_location,
+        adapt_until_sleep=False,
+        max_brightness=100,
+        max_color_temp=5500,
+        min_brightness=1,
+        min_color_temp=2000,
+        sleep_brightness=1,
+        sleep_rgb_or_color_temp="color_temp",
+        sleep_color_temp=1000,
+        sleep_rgb_color=(255, 56, 0),
+        sunrise_time=None,
+        min_sunrise_time=None,
+        max_sunrise_time=None,
+        sunset_time=None,
+        min_sunset_time=None,
+        max_sunset_time=None,
+        brightness_mode_time_dark=dt.timedelta(seconds=900),
+        brightness_mode_time_light=dt.timedelta(seconds=3600),
+        brightness_mode=brightness_mode,
+        lux_sensor=lux_sensor,
+        timezone=timezone,
+    )
+
+
+def random_datetimes(rng: random.Random, size: int) -> list[dt.datetime]:
+    """Return 'size' random moments in 2024."""
+    start = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+    seconds = 366 * 24 * 3600
+    return [start + dt.timedelta(seconds=rng.uniform(0, seconds)) for _ in range(size)]
+
+
+def random_colors(rng: random.Random, size: int) -> list[tuple[int, int, int]]:
+    """Return 'size' random RGB colors."""
+    return [
+        (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255))
+        for _ in range(size)
+    ]
+
+
+def benchmarks(size: int = SIZE, seed: int = SEED) -> list[Benchmark]:
+    """Return all benchmarks with their inputs."""
+    rng = random.Random(seed)
+    result = []
+    for name in LOCATIONS:
+        datetimes = random_datetimes(rng, size)
+        sun = light_settings(name).sun
+        result += [
+            Benchmark(f"sun_position[{name}]", sun.sun_position, datetimes),
+            Benchmark(
+                f"prev_and_next_events[{name}]",
+                sun.prev_and_next_events,
+                datetimes,
+            ),
+            Benchmark(f"closest_event[{name}]", sun.closest_event, datetimes),
+        ]
+        lux_inputs = [(t, rng.uniform(0, 1200)) for t in datetimes]
+        for mode in BRIGHTNESS_MODES:
+            settings = light_settings(name, mode)
+            lux_settings = light_settings(name, mode, lux_sensor="sensor.lux")
+            funcs = {
+                "sun": lambda t, s=settings: s.brightness_and_color(t, False),
+                "lux": lambda x, s=lux_settings: s.brightness_and_color(
+                    x[0],
+                    False,
+                    x[1],
+                ),
+                "sleep": lambda t, s=settings: s.brightness_and_color(t, True),
+            }
+            result += [
+                Benchmark(
+                    f"brightness_and_color[{name}-{mode}-{variant}]",
+                    funcs[variant],
+                    lux_inputs if variant == "lux" else datetimes,
+                )
+                for variant in VARIANTS
+            ]
+
+    xs = [rng.uniform(-7200, 7200) for _ in range(size)]
+    colors = random_colors(rng, size)
+    other_colors = random_colors(rng, size)
+    ts = [rng.uniform(-1, 1) for _ in range(size)]
+    result += [
+        Benchmark("scaled_tanh", lambda x: scaled_tanh(x, x1=-900, x2=3600), xs),
+        Benchmark(
+            "lerp_color_hsv",
+            lambda x: lerp_color_hsv(*x),
+            list(zip(colors, other_colors, ts, strict=True)),
+        ),
+        Benchmark(
+            "color_difference_redmean",
+            lambda x: color_difference_redmean(*x),
+            list(zip(colors, other_colors, strict=True)),
+        ),
+    ]
+    return result
+
+
+def run_benchmarks(
+    number: int = 10,
+    repeat: int = 5,
+    size: int = SIZE,
+    seed: int = SEED,
+    name_filter: str | None = None,
+    output: Path | None = None,
+) -> dict[str, Any]:
+    """Run the benchmarks and optionally write the results as JSON to 'output'."""
+    results = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "seed": seed,
+        "size": size,
+        "number": number,
+        "benchmarks": [
+            benchmark.run(number, repeat)
+            for benchmark in benchmarks(size, seed)
+            if name_filter is None or name_filter in benchmark.name
+        ],
+    }
+    if output is not None:
+        output.write_text(json.dumps(results, indent=2) + "\n")
+    return results
+
+
+def main() -> None:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=10, help="passes per timing")
+    parser.add_argument("--repeat", type=int, default=5, help="timings per benchmark")
+    parser.add_argument("--size", type=int, default=SIZE, help="inputs per benchmark")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--filter", help="only run benchmarks containing this")
+    parser.add_argument("--output", type=Path, help="JSON file for the results")
+    args = parser.parse_args()
+    results = run_benchmarks(
+        args.number,
+        args.repeat,
+        args.size,
+        args.seed,
+        args.filter,
+        args.output,
+    )
+    width = max(len(b["name"]) for b in results["benchmarks"])
+    for b in results["benchmarks"]:
+        print(f"{b['name']:<{width}}  {b['median_us']:10.2f} µs")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import datetime as dt
+import json
 import zoneinfo
 
 import pytest
@@ -10,6 +11,8 @@ from homeassistant.components.adaptive_lighting.color_and_brightness import (
     SunEvents,
 )
 
+from .benchmark_color_and_brightness import LOCATIONS, run_benchmarks
+
 # Create a mock astral_location object
 location = Location(LocationInfo())
 
@@ -1002,3 +1005,20 @@ def test_lux_no_sensor_configured(tzinfo_and_location):
     # Even with lux_reading provided, should use sun position since no sensor configured
     brightness = settings.brightness_pct(noon_time, is_sleep=False, lux_reading=500.0)
     assert brightness == 100  # Noon should be max brightness with sun
+
+
+def test_benchmarks(tmp_path):
+    """Test that every benchmark runs and that the results are written."""
+    output = tmp_path / "benchmark.json"
+    results = run_benchmarks(number=1, repeat=1, size=2, output=output)
+
+    assert json.loads(output.read_text()) == results
+    names = [b["name"] for b in results["benchmarks"]]
+    assert len(names) == len(set(names))
+    for location in LOCATIONS:
+        assert f"sun_position[{location}]" in names
+        assert f"brightness_and_color[{location}-tanh-lux]" in names
+    assert all(b["calls"] == 2 and b["min_us"] > 0 for b in results["benchmarks"])
+
+    results = run_benchmarks(number=1, repeat=1, size=2, name_filter="redmean")
+    assert [b["name"] for b in results["benchmarks"]] == ["color_difference_redmean"]
@@ -0,0 +1,40 @@
+"""Tests for Adaptive Lighting diagnostics."""
+
+from homeassistant.components.adaptive_lighting.const import DEFAULT_NAME, DOMAIN
+from homeassistant.components.adaptive_lighting.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from homeassistant.components.adaptive_lighting.light_records import LightRecord
+from homeassistant.const import CONF_NAME
+
+from tests.common import MockConfigEntry
+
+
+async def test_config_entry_diagnostics(hass):
+    """Test that the diagnostics contain the manager internals."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_NAME: DEFAULT_NAME})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["data"] == {CONF_NAME: DEFAULT_NAME}
+    switch = diagnostics["switch"]
+    assert switch["is_on"]
+    assert "adaptation_interval" in switch
+    assert switch["counters"]["ticks"] >= 1
+
+    manager = diagnostics["manager"]
+    assert manager["records"] == 0
+    assert set(manager["record_attributes"]) == set(LightRecord.__slots__) - {
+        "entity_id",
+    }
+    assert manager["proactively_adapting_contexts"] == 0
+    assert manager["running"]["sleep_task"] == 0
+
+    caches = diagnostics["caches"]
+    assert {"area_lights", "parse_context_id", "target_payload"} <= set(caches)
+    assert caches["parse_context_id"]["hits"] >= 0
+    assert diagnostics["metrics"]["enabled"] is False
+    assert diagnostics["watchdog"]["enabled"] is False
@@ -1,16 +1,41 @@
 """Tests for Adaptive Lighting HASS utils."""
 
+import logging
+import time
 from unittest.mock import AsyncMock
 
 from homeassistant.components.adaptive_lighting.adaptation_utils import ServiceData
+from homeassistant.components.adaptive_lighting.const import (
+    ATTR_ADAPTIVE_LIGHTING_MANAGER,
+    CONF_COLLECT_METRICS,
+    DOMAIN,
+)
 from homeassistant.components.adaptive_lighting.hass_utils import (
     setup_service_call_interceptor,
 )
+from homeassistant.components.adaptive_lighting.metrics import (
+    METRIC_INTERCEPT_TURN_ON,
+    METRIC_SERVICE_CALL_PROXY,
+)
 from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
-from homeassistant.const import SERVICE_TURN_ON
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    CONF_LIGHTS,
+    CONF_NAME,
+    SERVICE_TURN_ON,
+    STATE_OFF,
+)
 from homeassistant.core import ServiceCall
+from homeassistant.setup import async_setup_component
 from homeassistant.util.read_only_dict import ReadOnlyDict
 
+from tests.common import MockConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+ENTITY_MANAGED = "light.managed"
+ENTITY_UNTRACKED = "light.untracked"
+
 
 async def test_setup_service_call_interceptor(hass):
     """Test setup and removal of service call interceptor."""
@@ -78,3 +103,103 @@ async def test_service_call_interceptor_data_manipulation(hass):
     (service_call,) = service_func_mock.call_args[0]
     assert service_call.data == {"test1": "changed", "test2": "added"}
     assert isinstance(service_call.data, ReadOnlyDict)
+
+
+async def test_service_call_interceptor_should_intercept(hass):
+    """Test that calls rejected by 'should_intercept' are passed through untouched."""
+    service_func_mock = AsyncMock()
+    hass.services.async_register(LIGHT_DOMAIN, SERVICE_TURN_ON, service_func_mock)
+    intercept_func_mock = AsyncMock()
+
+    setup_service_call_interceptor(
+        hass,
+        LIGHT_DOMAIN,
+        SERVICE_TURN_ON,
+        intercept_func_mock,
+        lambda call: call.data.get("entity_id") == "light.managed",
+    )
+
+    await hass.services.async_call(
+        LIGHT_DOMAIN,
+        SERVICE_TURN_ON,
+        {"entity_id": "light.unmanaged"},
+        blocking=True,
+    )
+    assert intercept_func_mock.call_count == 0
+    assert service_func_mock.call_count == 1
+
+    await hass.services.async_call(
+        LIGHT_DOMAIN,
+        SERVICE_TURN_ON,
+        {"entity_id": "light.managed"},
+        blocking=True,
+    )
+    assert intercept_func_mock.call_count == 1
+    assert service_func_mock.call_count == 2
+
+
+async def test_service_call_interceptor_overhead_benchmark(hass):
+    """Benchmark the latency the manager's interceptor adds for untracked lights.
+
+    The numbers are logged and not asserted, because wall-clock timings are too
+    noisy on CI. Run with `--log-cli-level=INFO` to see them.
+    """
+    n_calls = 200
+    n_repeats = 5
+    # Set up 'light' first, otherwise the entry's dependency replaces the mock
+    assert await async_setup_component(hass, LIGHT_DOMAIN, {})
+    calls: list[ServiceCall] = []
+
+    async def turn_on(call: ServiceCall) -> None:
+        calls.append(call)
+
+    hass.services.async_register(LIGHT_DOMAIN, SERVICE_TURN_ON, turn_on)
+    hass.states.async_set(ENTITY_MANAGED, STATE_OFF)
+    hass.states.async_set(ENTITY_UNTRACKED, STATE_OFF)
+
+    async def best_time():
+        timings = []
+        for _ in range(n_repeats):
+            start = time.perf_counter()
+            for _ in range(n_calls):
+                await hass.services.async_call(
+                    LIGHT_DOMAIN,
+                    SERVICE_TURN_ON,
+                    {ATTR_ENTITY_ID: ENTITY_UNTRACKED},
+                    blocking=True,
+                )
+            timings.append((time.perf_counter() - start) / n_calls)
+        return min(timings)
+
+    baseline = await best_time()
+
+    # The manager installs the interceptor with its own `should_intercept`
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_NAME: "benchmark",
+            CONF_LIGHTS: [ENTITY_MANAGED],
+            CONF_COLLECT_METRICS: True,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    manager = hass.data[DOMAIN][ATTR_ADAPTIVE_LIGHTING_MANAGER]
+    manager.metrics.reset()
+    calls.clear()
+
+    intercepted = await best_time()
+
+    _LOGGER.info(
+        "light.turn_on for an untracked light: %.1f µs without and %.1f µs with"
+        " the interceptor",
+        baseline * 1e6,
+        intercepted * 1e6,
+    )
+    # Every call went through the proxy, but none was handed to the interceptor
+    n_proxied = manager.metrics.histogram(METRIC_SERVICE_CALL_PROXY).count
+    assert n_proxied == n_calls * n_repeats
+    assert manager.metrics.histogram(METRIC_INTERCEPT_TURN_ON).count == 0
+    assert len(calls) == n_calls * n_repeats
+    assert all(call.data == {ATTR_ENTITY_ID: ENTITY_UNTRACKED} for call in calls)
@@ -0,0 +1,212 @@
+"""Tests for Adaptive Lighting per-light records."""
+
+import datetime
+import tracemalloc
+
+from homeassistant.components.adaptive_lighting.light_records import (
+    DECISION_ADAPT,
+    DECISION_HISTORY_SIZE,
+    DECISION_SKIP,
+    REASON_MANUAL_CONTROL,
+    REASON_UPDATE,
+    STATE_HISTORY_SIZE,
+    EventSnapshot,
+    LightCapabilities,
+    LightRecord,
+    RecordAttributeView,
+    StateHistory,
+    StateSnapshot,
+    capability_attributes_changed,
+)
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_COLOR_TEMP_KELVIN,
+    ATTR_MAX_COLOR_TEMP_KELVIN,
+    ATTR_MIN_COLOR_TEMP_KELVIN,
+    ATTR_RGB_COLOR,
+    ATTR_SUPPORTED_COLOR_MODES,
+    ColorMode,
+    LightEntityFeature,
+)
+from homeassistant.const import (
+    ATTR_DOMAIN,
+    ATTR_ENTITY_ID,
+    ATTR_SERVICE,
+    ATTR_SERVICE_DATA,
+    ATTR_SUPPORTED_FEATURES,
+    EVENT_CALL_SERVICE,
+    STATE_ON,
+)
+from homeassistant.core import Context, Event, State
+
+ENTITY_LIGHT = "light.test"
+
+
+def test_state_snapshot_from_state():
+    """Test that a snapshot holds the relevant attributes of a state."""
+    context = Context()
+    state = State(
+        ENTITY_LIGHT,
+        STATE_ON,
+        {
+            ATTR_BRIGHTNESS: 100,
+            ATTR_COLOR_TEMP_KELVIN: 3000,
+            ATTR_RGB_COLOR: (255, 180, 107),
+            "friendly_name": "Test",
+        },
+        context=context,
+    )
+    snapshot = StateSnapshot.from_state(state)
+    assert snapshot.context_id == context.id
+    assert snapshot.brightness == 100
+    assert snapshot.color_temp_kelvin == 3000
+    assert snapshot.rgb_color == (255, 180, 107)
+    assert snapshot.timestamp == state.last_updated.timestamp()
+
+
+def test_event_snapshot_from_event():
+    """Test that an event snapshot only keeps what the manager reads."""
+    context = Context(user_id="user", parent_id="parent")
+    event = Event(
+        EVENT_CALL_SERVICE,
+        {
+            ATTR_DOMAIN: "light",
+            ATTR_SERVICE: "turn_off",
+            ATTR_SERVICE_DATA: {ATTR_ENTITY_ID: ENTITY_LIGHT, "transition": 2},
+        },
+        context=context,
+    )
+    snapshot = EventSnapshot.from_event(event)
+    assert snapshot.context_id == context.id
+    assert snapshot.time_fired == event.time_fired
+    assert snapshot.transition == 2
+    assert snapshot.service_data_keys == {ATTR_ENTITY_ID, "transition"}
+    assert snapshot.context == context
+
+    state_event = Event("state_changed", {ATTR_ENTITY_ID: ENTITY_LIGHT})
+    snapshot = EventSnapshot.from_event(state_event)
+    assert snapshot.transition is None
+    assert snapshot.service_data_keys == frozenset()
+
+
+def test_light_capabilities_from_state():
+    """Test that the capabilities follow the supported features and color modes."""
+    attributes = {
+        ATTR_SUPPORTED_FEATURES: LightEntityFeature.TRANSITION,
+        ATTR_SUPPORTED_COLOR_MODES: [ColorMode.COLOR_TEMP],
+        ATTR_MIN_COLOR_TEMP_KELVIN: 2000,
+        ATTR_MAX_COLOR_TEMP_KELVIN: 6500,
+    }
+    capabilities = LightCapabilities.from_state(
+        State(ENTITY_LIGHT, STATE_ON, attributes),
+    )
+    assert capabilities.features == {"transition", "color_temp", "brightness"}
+    assert capabilities.supports_transition
+    assert capabilities.supports_color_temp
+    assert not capabilities.supports_color
+    assert (capabilities.min_kelvin, capabilities.max_kelvin) == (2000, 6500)
+
+    rgb = {**attributes, ATTR_SUPPORTED_COLOR_MODES: [ColorMode.RGB]}
+    capabilities = LightCapabilities.from_state(State(ENTITY_LIGHT, STATE_ON, rgb))
+    assert capabilities.features == {"transition", "color", "brightness"}
+
+    assert capability_attributes_changed(attributes, rgb)
+    assert not capability_attributes_changed(
+        attributes,
+        {**attributes, ATTR_BRIGHTNESS: 10},
+    )
+
+
+def _snapshot(context_id: str, brightness: int = 1, timestamp: float = 0.0):
+    return StateSnapshot(
+        context_id=context_id,
+        brightness=brightness,
+        color_temp_kelvin=None,
+        rgb_color=None,
+        timestamp=timestamp,
+    )
+
+
+def test_state_history_is_bounded():
+    """Test that the oldest reports are dropped but the context is kept."""
+    history = StateHistory(_snapshot("ours"))
+    assert len(history) == 1
+    assert history.context_id == "ours"
+
+    for i in range(STATE_HISTORY_SIZE * 3):
+        history.append(_snapshot("other", brightness=i))
+
+    assert len(history) == STATE_HISTORY_SIZE
+    assert history.context_id == "ours"
+    assert history.last.brightness == STATE_HISTORY_SIZE * 3 - 1
+    assert [s.brightness for s in history] == list(
+        range(STATE_HISTORY_SIZE * 2, STATE_HISTORY_SIZE * 3),
+    )
+
+
+def test_state_history_memory_is_flat_over_a_week():
+    """Test that a light that reports every 10 seconds for a week uses constant memory."""
+    report_interval = 10  # seconds
+    reports_per_day = int(datetime.timedelta(days=1).total_seconds()) // report_interval
+    states = [
+        State(ENTITY_LIGHT, STATE_ON, {ATTR_BRIGHTNESS: i}, context=Context())
+        for i in range(256)
+    ]
+    history = StateHistory(StateSnapshot.from_state(states[0]))
+
+    tracemalloc.start()
+    try:
+        sizes = []
+        for day in range(7):
+            for i in range(reports_per_day):
+                history.append(StateSnapshot.from_state(states[i % len(states)]))
+            sizes.append(tracemalloc.get_traced_memory()[0])
+            assert len(history) == STATE_HISTORY_SIZE, day
+    finally:
+        tracemalloc.stop()
+
+    # Allow for some noise of the interpreter, but nothing that scales with time.
+    assert max(sizes) - sizes[0] < 10_000
+
+
+def test_light_record_reset():
+    """Test that resetting a record clears the adaptation state."""
+    record = LightRecord(ENTITY_LIGHT)
+    record.manual_control = True
+    record.last_service_data = {ATTR_BRIGHTNESS: 10}
+    record.state_history = StateHistory(_snapshot("ours"))
+
+    record.reset(reset_manual_control=False)
+    assert record.manual_control
+    assert record.last_service_data is None
+    assert record.state_history is None
+
+    record.reset()
+    assert not record.manual_control
+
+
+def test_record_attribute_view():
+    """Test that the view only contains lights with the attribute set."""
+    records = {"light.a": LightRecord("light.a"), "light.b": LightRecord("light.b")}
+    records["light.a"].last_service_data = {ATTR_BRIGHTNESS: 10}
+    view = RecordAttributeView(records, "last_service_data")
+    assert dict(view) == {"light.a": {ATTR_BRIGHTNESS: 10}}
+    assert "light.b" not in view
+    assert len(view) == 1
+
+
+def test_light_record_decisions_are_bounded():
+    """Test that only the last decisions are kept and survive a reset."""
+    record = LightRecord(ENTITY_LIGHT)
+    assert record.decisions is None
+
+    record.add_decision(DECISION_SKIP, REASON_MANUAL_CONTROL, "context", "switch")
+    for i in range(DECISION_HISTORY_SIZE * 2):
+        record.add_decision(DECISION_ADAPT, REASON_UPDATE, str(i))
+    record.reset()
+
+    assert len(record.decisions) == DECISION_HISTORY_SIZE
+    last = record.decisions[-1]
+    assert (last.decision, last.reason) == (DECISION_ADAPT, REASON_UPDATE)
+    assert last.context_id == str(DECISION_HISTORY_SIZE * 2 - 1)
+    assert last.switch is None
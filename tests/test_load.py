@@ -0,0 +1,238 @@
+"""Load test for installations with many lights and switches.
+
+The size is configured with environment variables and is small by default, so
+the test runs with the rest of the suite. For example, to simulate a large
+installation and keep the report (see README.md in this directory):
+
+    ADAPTIVE_LIGHTING_LOAD_LIGHTS=1000 ADAPTIVE_LIGHTING_LOAD_SWITCHES=50 \
+    ADAPTIVE_LIGHTING_LOAD_OUTPUT=load.json \
+    python -m pytest --timeout=0 tests/components/adaptive_lighting/test_load.py
+"""
+
+import json
+import logging
+import os
+import random
+import statistics
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+from homeassistant.components.adaptive_lighting.const import (
+    ATTR_ADAPTIVE_LIGHTING_MANAGER,
+    CONF_INITIAL_TRANSITION,
+    CONF_SEPARATE_TURN_ON_COMMANDS,
+    CONF_TRANSITION,
+    DOMAIN,
+)
+from homeassistant.components.adaptive_lighting.switch import is_our_context
+from homeassistant.components.light import ATTR_BRIGHTNESS
+from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import (
+    ATTR_DOMAIN,
+    ATTR_ENTITY_ID,
+    CONF_LIGHTS,
+    CONF_NAME,
+    EVENT_CALL_SERVICE,
+    MATCH_ALL,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_ON,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.setup import async_setup_component
+
+from tests.common import MockConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+SEED = 42
+LOAD_LIGHTS = int(os.environ.get("ADAPTIVE_LIGHTING_LOAD_LIGHTS", "24"))
+LOAD_SWITCHES = int(os.environ.get("ADAPTIVE_LIGHTING_LOAD_SWITCHES", "3"))
+LOAD_ROUNDS = int(os.environ.get("ADAPTIVE_LIGHTING_LOAD_ROUNDS", "2"))
+LOAD_OUTPUT = os.environ.get("ADAPTIVE_LIGHTING_LOAD_OUTPUT")
+
+# Template light scripts that determine the capabilities, cycled over the lights
+CAPABILITIES = (
+    (),  # on/off only
+    ("set_level",),
+    ("set_level", "set_temperature"),
+    ("set_level", "set_temperature", "set_color"),
+)
+
+
+async def setup_many_lights(hass: HomeAssistant, n_lights: int, n_groups: int):
+    """Set up 'n_lights' template lights and 'n_groups' groups of two lights."""
+    template_lights = {
+        f"load_{i}": {
+            "unique_id": f"load_{i}",
+            "friendly_name": f"load_{i}",
+            "turn_on": None,
+            "turn_off": None,
+            **dict.fromkeys(CAPABILITIES[i % len(CAPABILITIES)]),
+        }
+        for i in range(n_lights)
+    }
+    platforms = [{"platform": "template", "lights": template_lights}]
+    platforms += [
+        {
+            "platform": "group",
+            "entities": [f"light.load_{2 * i}", f"light.load_{2 * i + 1}"],
+            "name": f"Load Group {i}",
+            "unique_id": f"load_group_{i}",
+        }
+        for i in range(n_groups)
+    ]
+    assert await async_setup_component(hass, LIGHT_DOMAIN, {LIGHT_DOMAIN: platforms})
+    await hass.async_block_till_done()
+    lights = [f"light.load_{i}" for i in range(n_lights)]
+    groups = [f"light.load_group_{i}" for i in range(n_groups)]
+    assert all(hass.states.get(light) is not None for light in lights + groups)
+    return lights, groups
+
+
+def switch_lights(
+    lights: list[str],
+    groups: list[str],
+    n_switches: int,
+) -> list[list[str]]:
+    """Divide the lights over the switches.
+
+    Every switch gets a group and shares its first light with the previous switch.
+    """
+    per_switch = len(lights) // n_switches
+    result = []
+    for i in range(n_switches):
+        start = i * per_switch
+        own = lights[start : start + per_switch]
+        shared = [lights[start - 1]] if i > 0 else []
+        group = [groups[start // 2]] if start // 2 < len(groups) else []
+        result.append(own + shared + group)
+    return result
+
+
+async def test_load_harness(hass):
+    """Drive ticks, sleep mode and light calls for many lights and switches."""
+    n_switches = max(1, LOAD_SWITCHES)
+    n_lights = max(2 * n_switches, LOAD_LIGHTS)
+    rng = random.Random(SEED)
+    tracemalloc.start()
+    try:
+        lights, groups = await setup_many_lights(hass, n_lights, n_lights // 10)
+        await hass.services.async_call(
+            LIGHT_DOMAIN,
+            SERVICE_TURN_ON,
+            {ATTR_ENTITY_ID: lights},
+            blocking=True,
+        )
+
+        switches = []
+        for i, entity_ids in enumerate(switch_lights(lights, groups, n_switches)):
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                data={
+                    CONF_NAME: f"load_{i}",
+                    CONF_LIGHTS: entity_ids,
+                    CONF_INITIAL_TRANSITION: 0,
+                    CONF_TRANSITION: 0,
+                    CONF_SEPARATE_TURN_ON_COMMANDS: i % 2 == 1,
+                },
+            )
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+            assert entry.state is ConfigEntryState.LOADED
+            switches.append(hass.data[DOMAIN][entry.entry_id][SWITCH_DOMAIN])
+
+        events = 0
+        service_calls = 0
+
+        @callback
+        def count_events(event: Event) -> None:
+            nonlocal events, service_calls
+            events += 1
+            if (
+                event.event_type == EVENT_CALL_SERVICE
+                and event.data[ATTR_DOMAIN] == LIGHT_DOMAIN
+                and is_our_context(event.context)
+            ):
+                service_calls += 1
+
+        remove_listener = hass.bus.async_listen(MATCH_ALL, count_events)
+        tick_ms = []
+        start = perf_counter()
+        for _ in range(max(1, LOAD_ROUNDS)):
+            # Interval ticks
+            for switch in switches:
+                tick_start = perf_counter()
+                await switch._update_attrs_and_maybe_adapt_lights(
+                    context=switch.create_context("interval"),
+                    transition=0,
+                )
+                tick_ms.append((perf_counter() - tick_start) * 1000)
+            await hass.async_block_till_done()
+
+            # Sleep mode toggles
+            sleep_switches = [switch.sleep_mode_switch.entity_id for switch in switches]
+            for service in (SERVICE_TURN_ON, SERVICE_TURN_OFF):
+                await hass.services.async_call(
+                    SWITCH_DOMAIN,
+                    service,
+                    {ATTR_ENTITY_ID: sleep_switches},
+                    blocking=True,
+                )
+                await hass.async_block_till_done()
+
+            # Bursts of user calls
+            burst = rng.sample(lights, max(1, len(lights) // 5))
+            for service in (SERVICE_TURN_OFF, SERVICE_TURN_ON):
+                for light in burst:
+                    hass.async_create_task(
+                        hass.services.async_call(
+                            LIGHT_DOMAIN,
+                            service,
+                            {ATTR_ENTITY_ID: light},
+                        ),
+                    )
+                await hass.async_block_till_done()
+
+            # State reports, e.g., from a light that was changed with its remote
+            for light in rng.sample(lights, max(1, len(lights) // 5)):
+                state = hass.states.get(light)
+                if state.attributes.get(ATTR_BRIGHTNESS) is not None:
+                    hass.states.async_set(
+                        light,
+                        STATE_ON,
+                        {**state.attributes, ATTR_BRIGHTNESS: rng.randint(1, 255)},
+                    )
+            await hass.async_block_till_done()
+        elapsed = perf_counter() - start
+        remove_listener()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    report = {
+        "lights": n_lights,
+        "groups": len(groups),
+        "switches": n_switches,
+        "rounds": max(1, LOAD_ROUNDS),
+        "elapsed_s": elapsed,
+        "tick_ms_mean": statistics.mean(tick_ms),
+        "tick_ms_max": max(tick_ms),
+        "events": events,
+        "events_per_second": events / elapsed,
+        "service_calls": service_calls,
+        "commands_sent": sum(switch.counters.commands_sent for switch in switches),
+        "peak_memory_mb": peak_memory / 2**20,
+    }
+    _LOGGER.info("Load test report: %s", report)
+    if LOAD_OUTPUT:
+        Path(LOAD_OUTPUT).write_text(json.dumps(report, indent=2) + "\n")
+
+    assert all(switch.is_on for switch in switches)
+    assert len(hass.data[DOMAIN][ATTR_ADAPTIVE_LIGHTING_MANAGER].lights) >= n_lights
+    assert service_calls > 0
+    assert report["commands_sent"] > 0
@@ -0,0 +1,86 @@
+"""Tests for smoothing the readings of lux sensors."""
+
+import pytest
+from homeassistant.components.adaptive_lighting.lux import (
+    LUX_AGGREGATION_MAX,
+    LUX_AGGREGATION_MEAN,
+    LUX_AGGREGATION_MEDIAN,
+    LUX_AGGREGATION_MIN,
+    LUX_AGGREGATION_WEIGHTED,
+    LUX_FILTER_EMA,
+    LUX_FILTER_MEDIAN,
+    LUX_FILTER_NONE,
+    LuxFilter,
+    aggregate_lux,
+    lux_settings_changed,
+)
+
+
+def test_lux_filter_none():
+    """Test that without smoothing the latest reading is used."""
+    lux_filter = LuxFilter(LUX_FILTER_NONE, window=5)
+    assert [lux_filter.update(x) for x in (10, 500, 20)] == [10, 500, 20]
+
+
+def test_lux_filter_ema():
+    """Test the exponential moving average with alpha = 2 / (window + 1)."""
+    lux_filter = LuxFilter(LUX_FILTER_EMA, window=3)
+    assert lux_filter.update(100) == 100
+    assert lux_filter.update(200) == pytest.approx(150)
+    assert lux_filter.update(200) == pytest.approx(175)
+
+
+def test_lux_filter_median():
+    """Test that the median of the window removes spikes."""
+    lux_filter = LuxFilter(LUX_FILTER_MEDIAN, window=3)
+    outputs = [lux_filter.update(x) for x in (100, 100, 5000, 100, 120, 130)]
+    assert outputs == [100, 100, 100, 100, 120, 120]
+
+
+def test_lux_filter_hysteresis():
+    """Test that the output only changes when it leaves the band."""
+    lux_filter = LuxFilter(LUX_FILTER_NONE, window=1, band=50)
+    outputs = [lux_filter.update(x) for x in (300, 340, 260, 351, 310, 299)]
+    assert outputs == [300, 300, 300, 351, 351, 299]
+
+
+def test_lux_filter_same_timestamp():
+    """Test that reading the same sensor state again adds no sample."""
+    lux_filter = LuxFilter(LUX_FILTER_EMA, window=3)
+    assert lux_filter.update(100, timestamp=1.0) == 100
+    assert lux_filter.update(200, timestamp=2.0) == pytest.approx(150)
+    assert lux_filter.update(200, timestamp=2.0) == pytest.approx(150)
+    lux_filter.reset()
+    assert lux_filter.update(200, timestamp=2.0) == 200
+
+
+def test_lux_filter_unknown_mode():
+    """Test that an unknown filter is rejected."""
+    with pytest.raises(ValueError, match="Unknown lux filter"):
+        LuxFilter("mean", window=3)
+
+
+def test_lux_settings_changed():
+    """Test that only noticeable changes in the settings count."""
+    settings = {"brightness_pct": 50.0, "color_temp_kelvin": 4000}
+    assert not lux_settings_changed(settings, {**settings, "brightness_pct": 50.5})
+    assert lux_settings_changed(settings, {**settings, "brightness_pct": 51.0})
+    assert not lux_settings_changed(settings, {**settings, "color_temp_kelvin": 4030})
+    assert lux_settings_changed(settings, {**settings, "color_temp_kelvin": 3950})
+    assert lux_settings_changed({}, settings)
+
+
+def test_aggregate_lux():
+    """Test combining the readings of several sensors."""
+    readings = {"sensor.a": 100.0, "sensor.b": 200.0, "sensor.c": 600.0}
+    assert aggregate_lux(readings, LUX_AGGREGATION_MIN) == 100
+    assert aggregate_lux(readings, LUX_AGGREGATION_MAX) == 600
+    assert aggregate_lux(readings, LUX_AGGREGATION_MEAN) == 300
+    assert aggregate_lux(readings, LUX_AGGREGATION_MEDIAN) == 200
+    weights = {"sensor.a": 3.0, "sensor.b": 0.0}  # sensor.c counts as 1
+    assert aggregate_lux(readings, LUX_AGGREGATION_WEIGHTED, weights) == 225
+    # Without (usable) weights it is the mean
+    assert aggregate_lux(readings, LUX_AGGREGATION_WEIGHTED) == 300
+    zero = dict.fromkeys(readings, 0.0)
+    assert aggregate_lux(readings, LUX_AGGREGATION_WEIGHTED, zero) == 300
+    assert aggregate_lux({}, LUX_AGGREGATION_MEAN) is None
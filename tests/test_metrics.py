@@ -0,0 +1,77 @@
+"""Tests for Adaptive Lighting latency metrics."""
+
+from homeassistant.components.adaptive_lighting.metrics import (
+    COUNTERS,
+    LATENCY_BUCKETS_MS,
+    AdaptationCounters,
+    LatencyHistogram,
+    Metrics,
+    timed,
+)
+
+
+def test_latency_histogram_percentiles():
+    """Test that percentiles are reported as bucket upper bounds."""
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) is None
+    assert histogram.as_dict()["mean_ms"] is None
+
+    for _ in range(90):
+        histogram.record(0.0008)  # 0.8 ms, in the 1 ms bucket
+    for _ in range(10):
+        histogram.record(0.02)  # 20 ms, in the 25 ms bucket
+
+    assert histogram.count == 100
+    assert histogram.percentile(50) == 1
+    assert histogram.percentile(95) == 20  # capped at the maximum
+    summary = histogram.as_dict()
+    assert summary["max_ms"] == 20
+    assert round(summary["mean_ms"], 2) == 2.72
+
+    histogram.record(LATENCY_BUCKETS_MS[-1])  # seconds, so far beyond the buckets
+    assert histogram.percentile(100) == LATENCY_BUCKETS_MS[-1] * 1000
+
+
+def test_metrics_disabled_is_noop():
+    """Test that nothing is recorded while disabled."""
+    metrics = Metrics()
+    metrics.record("test", 1)
+    with metrics.time("test"):
+        pass
+    assert metrics.histograms == {}
+
+    metrics.enabled = True
+    with metrics.time("test"):
+        pass
+    metrics.record("test", 1)
+    assert metrics.histograms["test"].count == 2
+    assert metrics.as_dict()["latency"]["test"]["count"] == 2
+
+    metrics.reset()
+    assert metrics.as_dict() == {"enabled": True, "latency": {}}
+
+
+async def test_timed_decorator():
+    """Test that the decorator records the duration of async methods."""
+
+    class Timed:
+        def __init__(self):
+            self.metrics = Metrics()
+
+        @timed("method")
+        async def method(self, value):
+            return value
+
+    obj = Timed()
+    assert await obj.method(1) == 1
+    assert obj.metrics.histograms == {}
+
+    obj.metrics.enabled = True
+    assert await obj.method(2) == 2
+    assert obj.metrics.histograms["method"].count == 1
+
+
+def test_adaptation_counters_names():
+    """Test that every counter has a name for its sensor."""
+    counters = AdaptationCounters()
+    assert tuple(counters.as_dict()) == COUNTERS
@@ -0,0 +1,37 @@
+"""Tests for Adaptive Lighting on-demand profiling."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from homeassistant.components.adaptive_lighting.helpers import clamp
+from homeassistant.components.adaptive_lighting.profiling import (
+    ProfilerBusyError,
+    async_profile,
+)
+
+
+async def test_async_profile(hass, tmp_path):
+    """Test that only the integration's functions are returned."""
+    hass.config.config_dir = str(tmp_path)
+    hass.loop.call_soon(clamp, 5, 0, 1)
+    hass.loop.call_soon(sorted, [3, 2, 1])
+
+    result = await async_profile(hass, 0.05, 10)
+
+    assert Path(result["path"]).parent == tmp_path
+    assert Path(result["path"]).exists()
+    functions = result["functions"]
+    assert len(functions) <= 10
+    assert any("helpers.py" in f["function"] for f in functions)
+    assert all("sorted" not in f["function"] for f in functions)
+
+
+async def test_async_profile_busy(hass, tmp_path):
+    """Test that only one profile is recorded at a time."""
+    hass.config.config_dir = str(tmp_path)
+    task = hass.async_create_task(async_profile(hass, 0.05, 10))
+    await asyncio.sleep(0)
+    with pytest.raises(ProfilerBusyError):
+        await async_profile(hass, 0.05, 10)
+    await task
@@ -0,0 +1,31 @@
+"""Tests for the Adaptive Lighting diagnostic sensors."""
+
+from homeassistant.components.adaptive_lighting.const import (
+    CONF_COLLECT_METRICS,
+    DOMAIN,
+)
+from homeassistant.components.adaptive_lighting.metrics import LATENCY_METRICS
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.const import CONF_NAME
+
+from tests.common import MockConfigEntry
+
+
+async def test_latency_sensors_once(hass):
+    """Test that the shared latency histograms get one set of sensors."""
+    for name in ("first", "second"):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={CONF_NAME: name, CONF_COLLECT_METRICS: True},
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    latency_sensors = [
+        entity_id
+        for entity_id in hass.states.async_entity_ids(SENSOR_DOMAIN)
+        if "latency" in entity_id
+    ]
+    assert len(latency_sensors) == len(LATENCY_METRICS)
+    assert all(entity_id.endswith("_first") for entity_id in latency_sensors)
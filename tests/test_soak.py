@@ -0,0 +1,282 @@
+"""Soak test for the growth of the manager's state over simulated weeks.
+
+The clock is frozen and moved forward an hour at a time, while lights are
+turned on and off, manually controlled, and temporary lights are added and
+removed again. The number of simulated days is small by default, so the test
+runs with the rest of the suite. Simulating four weeks is opt-in (see README.md
+in this directory):
+
+    ADAPTIVE_LIGHTING_LONG_SOAK=1 \
+    python -m pytest tests/components/adaptive_lighting/test_soak.py -k four_weeks
+"""
+
+import datetime as dt
+import inspect
+import os
+import tracemalloc
+from pathlib import Path
+
+import homeassistant.util.dt as dt_util
+import pytest
+from homeassistant.components.adaptive_lighting.const import (
+    ATTR_ADAPTIVE_LIGHTING_MANAGER,
+    CONF_INITIAL_TRANSITION,
+    CONF_MANUAL_CONTROL,
+    CONF_TRANSITION,
+    DOMAIN,
+    SERVICE_APPLY,
+    SERVICE_SET_MANUAL_CONTROL,
+)
+from homeassistant.components.adaptive_lighting.light_records import (
+    DECISION_HISTORY_SIZE,
+    REASON_INTERCEPTED,
+    STATE_HISTORY_SIZE,
+)
+from homeassistant.components.adaptive_lighting.switch import AdaptiveLightingManager
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_COLOR_MODE,
+    ATTR_COLOR_TEMP_KELVIN,
+    ATTR_MAX_COLOR_TEMP_KELVIN,
+    ATTR_MIN_COLOR_TEMP_KELVIN,
+    ATTR_SUPPORTED_COLOR_MODES,
+    ColorMode,
+)
+from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    CONF_LIGHTS,
+    CONF_NAME,
+    CONF_PARAMS,
+    SERVICE_TOGGLE,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_OFF,
+    STATE_ON,
+)
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers import config_validation as cv
+from homeassistant.setup import async_setup_component
+
+from tests.common import MockConfigEntry, async_fire_time_changed
+
+SOAK_DAYS = int(os.environ.get("ADAPTIVE_LIGHTING_SOAK_DAYS", "3"))
+LONG_SOAK_DAYS = 28
+RUN_LONG_SOAK = os.environ.get("ADAPTIVE_LIGHTING_LONG_SOAK") == "1"
+# The long soak takes minutes, so it is skipped unless asked for and not timed out
+LONG_SOAK = [
+    pytest.mark.skipif(
+        not RUN_LONG_SOAK,
+        reason="Set ADAPTIVE_LIGHTING_LONG_SOAK=1 to simulate four weeks",
+    ),
+    pytest.mark.timeout(0),
+]
+# Growth of the memory allocated by the integration after the first day
+MAX_GROWTH_PER_DAY = 16 * 1024  # bytes
+
+N_LIGHTS = 6
+LIGHTS = [f"light.soak_{i}" for i in range(N_LIGHTS)]
+TEMPORARY_LIGHT = "light.soak_temporary_{}"
+LIGHT_ATTRIBUTES = {
+    ATTR_SUPPORTED_COLOR_MODES: [ColorMode.COLOR_TEMP],
+    ATTR_MIN_COLOR_TEMP_KELVIN: 2000,
+    ATTR_MAX_COLOR_TEMP_KELVIN: 6535,
+}
+INTEGRATION_FILES = str(Path(inspect.getfile(AdaptiveLightingManager)).parent / "*")
+
+
+async def setup_lights(hass: HomeAssistant) -> None:
+    """Register light services that set the state of the lights they are called for."""
+    # Set up 'light' first, otherwise the entry's dependency replaces the services
+    assert await async_setup_component(hass, LIGHT_DOMAIN, {})
+    services = hass.services.async_services_for_domain(LIGHT_DOMAIN)
+
+    async def handle(call: ServiceCall) -> None:
+        params = call.data[CONF_PARAMS]
+        for entity_id in cv.ensure_list(call.data[ATTR_ENTITY_ID]):
+            state = hass.states.get(entity_id)
+            if state is None:
+                continue
+            turn_on = call.service == SERVICE_TURN_ON or (
+                call.service == SERVICE_TOGGLE and state.state == STATE_OFF
+            )
+            attributes = dict(LIGHT_ATTRIBUTES)
+            if turn_on:
+                attributes.update(
+                    {
+                        ATTR_BRIGHTNESS: params.get(
+                            ATTR_BRIGHTNESS,
+                            state.attributes.get(ATTR_BRIGHTNESS, 255),
+                        ),
+                        ATTR_COLOR_MODE: ColorMode.COLOR_TEMP,
+                        ATTR_COLOR_TEMP_KELVIN: params.get(
+                            ATTR_COLOR_TEMP_KELVIN,
+                            state.attributes.get(ATTR_COLOR_TEMP_KELVIN, 4000),
+                        ),
+                    },
+                )
+            hass.states.async_set(
+                entity_id,
+                STATE_ON if turn_on else STATE_OFF,
+                attributes,
+                context=call.context,
+            )
+
+    for service in (SERVICE_TURN_ON, SERVICE_TURN_OFF, SERVICE_TOGGLE):
+        # Keep the schema, which the interceptor relies on
+        schema = services[service].schema
+        hass.services.async_register(LIGHT_DOMAIN, service, handle, schema)
+    for light in LIGHTS:
+        hass.states.async_set(light, STATE_OFF, LIGHT_ATTRIBUTES)
+
+
+async def call_light(hass: HomeAssistant, service: str, lights: list[str], **data):
+    """Call a light service like a user would."""
+    await hass.services.async_call(
+        LIGHT_DOMAIN,
+        service,
+        {ATTR_ENTITY_ID: lights, **data},
+        blocking=True,
+    )
+
+
+async def simulate_hour(
+    hass: HomeAssistant,
+    hour: int,
+    day: int,
+    switch_entity_ids: dict[str, str],
+) -> None:
+    """Simulate what happens with the lights during one hour of a day."""
+    evening = LIGHTS[: N_LIGHTS // 2]
+    night = LIGHTS[N_LIGHTS // 2 :]
+    temporary = TEMPORARY_LIGHT.format(day)
+    if hour == 7:
+        await call_light(hass, SERVICE_TURN_ON, LIGHTS)
+    elif hour == 8:
+        # Manually change a light that is on, mark another one
+        await call_light(hass, SERVICE_TURN_ON, LIGHTS[:1], brightness=10)
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_MANUAL_CONTROL,
+            {
+                ATTR_ENTITY_ID: switch_entity_ids["main"],
+                CONF_LIGHTS: LIGHTS[1:2],
+                CONF_MANUAL_CONTROL: True,
+            },
+            blocking=True,
+        )
+    elif hour == 9:
+        await call_light(hass, SERVICE_TURN_OFF, LIGHTS)
+    elif hour == 12:
+        # A light that only exists today, adapted through the 'apply' service
+        hass.states.async_set(temporary, STATE_ON, LIGHT_ATTRIBUTES)
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_APPLY,
+            {ATTR_ENTITY_ID: switch_entity_ids["main"], CONF_LIGHTS: [temporary]},
+            blocking=True,
+        )
+        await call_light(hass, SERVICE_TOGGLE, [*LIGHTS, temporary])
+    elif hour == 13:
+        await call_light(hass, SERVICE_TURN_OFF, [*LIGHTS, temporary])
+        hass.states.async_remove(temporary)
+    elif hour == 19:
+        await call_light(hass, SERVICE_TURN_ON, evening)
+    elif hour == 22:
+        await hass.services.async_call(
+            SWITCH_DOMAIN,
+            SERVICE_TURN_ON,
+            {ATTR_ENTITY_ID: switch_entity_ids["sleep"]},
+            blocking=True,
+        )
+        await call_light(hass, SERVICE_TURN_ON, night)
+    elif hour == 23:
+        await call_light(hass, SERVICE_TURN_OFF, LIGHTS)
+        await hass.services.async_call(
+            SWITCH_DOMAIN,
+            SERVICE_TURN_OFF,
+            {ATTR_ENTITY_ID: switch_entity_ids["sleep"]},
+            blocking=True,
+        )
+
+
+def assert_bounded(manager: AdaptiveLightingManager) -> None:
+    """Check that the manager only keeps state for the lights it tracks."""
+    assert set(manager.records) <= set(LIGHTS)
+    assert manager.lights == set(LIGHTS)
+    assert len(manager._proactively_adapting_contexts) <= 2 * N_LIGHTS
+    assert sum(not task.done() for task in manager.adaptation_tasks) <= N_LIGHTS
+    for record in manager.records.values():
+        history = record.state_history
+        assert history is None or len(history) <= STATE_HISTORY_SIZE
+        decisions = record.decisions
+        assert decisions is None or len(decisions) <= DECISION_HISTORY_SIZE
+
+
+def integration_memory() -> int:
+    """Return the size of the traced memory allocated by the integration."""
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(inclusive=True, filename_pattern=INTEGRATION_FILES)],
+    )
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+@pytest.mark.parametrize(
+    "soak_days",
+    [
+        pytest.param(SOAK_DAYS, id="days"),
+        pytest.param(LONG_SOAK_DAYS, id="four_weeks", marks=LONG_SOAK),
+    ],
+)
+async def test_soak(hass, freezer, soak_days):
+    """Test that the manager's state stays bounded over many simulated days."""
+    freezer.move_to(dt.datetime(2024, 3, 1, tzinfo=dt_util.DEFAULT_TIME_ZONE))
+    await setup_lights(hass)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_NAME: "soak",
+            CONF_LIGHTS: LIGHTS,
+            CONF_INITIAL_TRANSITION: 0,
+            CONF_TRANSITION: 0,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    data = hass.data[DOMAIN]
+    manager: AdaptiveLightingManager = data[ATTR_ADAPTIVE_LIGHTING_MANAGER]
+    switch = data[entry.entry_id][SWITCH_DOMAIN]
+    switch_entity_ids = {
+        "main": switch.entity_id,
+        "sleep": switch.sleep_mode_switch.entity_id,
+    }
+
+    days = max(2, soak_days)
+    tracemalloc.start()
+    try:
+        for day in range(days):
+            for hour in range(24):
+                freezer.tick(dt.timedelta(hours=1))
+                async_fire_time_changed(hass)
+                await hass.async_block_till_done()
+                await simulate_hour(hass, hour, day, switch_entity_ids)
+                await hass.async_block_till_done()
+            assert_bounded(manager)
+            assert TEMPORARY_LIGHT.format(day) not in manager.lights
+            if day == 0:
+                baseline = integration_memory()
+        growth = integration_memory() - baseline
+        # The user's calls reached the integration and were adapted
+        assert any(
+            decision.reason == REASON_INTERCEPTED
+            for record in manager.records.values()
+            for decision in record.decisions or ()
+        )
+    finally:
+        tracemalloc.stop()
+        for record in manager.records.values():
+            record.close()
+
+    assert growth < MAX_GROWTH_PER_DAY * (days - 1), growth
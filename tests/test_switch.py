@@ -29,6 +29,7 @@ from homeassistant.components.adaptive_lighting.const import (
     ATTR_ADAPTIVE_LIGHTING_MANAGER,
     CONF_ADAPT_ONLY_ON_BARE_TURN_ON,
     CONF_ADAPT_UNTIL_SLEEP,
+    CONF_ATTRIBUTE_PROFILE,
     CONF_AUTORESET_CONTROL,
     CONF_BRIGHTNESS_MODE,
     CONF_BRIGHTNESS_MODE_TIME_DARK,
@@ -38,7 +39,9 @@ from homeassistant.components.adaptive_lighting.const import (
     CONF_INITIAL_TRANSITION,
     CONF_MANUAL_CONTROL,
     CONF_MAX_BRIGHTNESS,
+    CONF_MIN_BRIGHTNESS,
     CONF_MIN_COLOR_TEMP,
+    CONF_MIN_STATE_WRITE_INTERVAL,
     CONF_MULTI_LIGHT_INTERCEPT,
     CONF_PREFER_RGB_COLOR,
     CONF_SEPARATE_TURN_ON_COMMANDS,
@@ -62,6 +65,15 @@ from homeassistant.components.adaptive_lighting.const import (
     SLEEP_MODE_SWITCH,
     UNDO_UPDATE_LISTENER,
 )
+from homeassistant.components.adaptive_lighting.light_records import (
+    DECISION_ADAPT,
+    DECISION_SKIP,
+    REASON_INTERCEPTED,
+    REASON_MANUAL_CONTROL,
+    REASON_UPDATE,
+    TARGET_PAYLOAD_MAX_AGE,
+    LightCapabilities,
+)
 from homeassistant.components.adaptive_lighting.switch import (
     CONF_INTERCEPT,
     AdaptiveLightingManager,
@@ -71,6 +83,7 @@ from homeassistant.components.adaptive_lighting.switch import (
     create_context,
     is_our_context,
     is_our_context_id,
+    parse_context_id,
 )
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
@@ -106,7 +119,7 @@ from homeassistant.helpers.entity_platform import async_get_platforms
 from homeassistant.setup import async_setup_component
 from homeassistant.util.color import color_temperature_mired_to_kelvin
 
-from tests.common import MockConfigEntry
+from tests.common import MockConfigEntry, async_fire_time_changed
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -1236,6 +1249,19 @@ def test_is_our_context():
     assert not is_our_context(Context())
 
 
+def test_parse_context_id():
+    """Test that our context ids can be parsed and classified."""
+    context = create_context(DOMAIN, "interval", 12)
+    assert len(context.id) == 26
+    is_ours, name_hash, which_short = parse_context_id(context.id)
+    assert is_ours
+    assert name_hash == create_context(DOMAIN, "service", 0).id.split(":")[2]
+    assert which_short == "ntrv"
+    assert is_our_context_id(context.id, "interval")
+    assert not is_our_context_id(context.id, "service")
+    assert parse_context_id(Context().id) == (False, None, None)
+
+
 async def test_unload_switch(hass):
     """Test removing Adaptive Lighting."""
     entry, _ = await setup_switch(hass, {})
@@ -1308,6 +1334,183 @@ async def test_async_update_at_interval_action(hass):
     await switch._async_update_at_interval_action()
 
 
+async def test_adaptation_counters(hass):
+    """Test that the counters follow what the switch did."""
+    switch, _ = await setup_lights_and_switch(hass)
+    counters = switch.counters
+    ticks = counters.ticks
+    commands_sent = counters.commands_sent
+    context = switch.create_context("test")
+    on_lights = [
+        light for light in switch.lights if hass.states.get(light).state == STATE_ON
+    ]
+    assert ENTITY_LIGHT_1 in on_lights
+
+    await switch._update_attrs_and_maybe_adapt_lights(context=context, transition=0)
+    assert counters.ticks == ticks + 1
+    assert counters.lights_evaluated >= len(on_lights)
+    assert counters.commands_sent == commands_sent + len(on_lights)
+    assert counters.tick_duration > 0
+
+    # The manually controlled light is skipped, the others are adapted again
+    switch.manager.mark_as_manual_control(ENTITY_LIGHT_1)
+    await switch._update_attrs_and_maybe_adapt_lights(context=context, transition=0)
+    assert counters.ticks == ticks + 2
+    assert counters.manual_control_skipped == 1
+    assert counters.commands_sent == commands_sent + 2 * len(on_lights) - 1
+
+
+async def test_min_state_write_interval(hass, freezer):
+    """Test that the switch state is only written when it changed, throttled."""
+    switch, _ = await setup_lights_and_switch(
+        hass,
+        {CONF_MIN_STATE_WRITE_INTERVAL: 3600},
+    )
+    counters = switch.counters
+    context = switch.create_context("test")
+
+    async def tick(sun_position: float) -> None:
+        settings = {**switch._settings, "sun_position": sun_position}
+        with patch.object(
+            type(switch._sun_light_settings),
+            "get_settings",
+            return_value=settings,
+        ):
+            await switch._update_attrs_and_maybe_adapt_lights(
+                context=context,
+                transition=0,
+            )
+        await hass.async_block_till_done()
+
+    # Nothing changed (the time is frozen)
+    sun_position = hass.states.get(switch.entity_id).attributes["sun_position"]
+    unchanged = counters.state_writes_unchanged
+    throttled = counters.state_writes_throttled
+    await tick(switch._settings["sun_position"])
+    assert counters.state_writes_unchanged == unchanged + 1
+
+    # A change is written after the interval
+    await tick(sun_position + 0.1)
+    assert counters.state_writes_throttled == throttled + 1
+    state = hass.states.get(switch.entity_id)
+    assert state.attributes["sun_position"] == sun_position
+    freezer.tick(datetime.timedelta(hours=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    new_state = hass.states.get(switch.entity_id)
+    assert new_state.last_updated > state.last_updated
+    assert new_state.attributes["sun_position"] != sun_position
+
+
+async def test_unchanged_state_not_written(hass):
+    """Test that ticks without changes do not write the state, when not throttled."""
+    switch, _ = await setup_lights_and_switch(
+        hass,
+        {CONF_MIN_STATE_WRITE_INTERVAL: 0},
+    )
+    counters = switch.counters
+    context = switch.create_context("test")
+
+    async def tick(sun_position: float) -> None:
+        settings = {**switch._settings, "sun_position": sun_position}
+        with patch.object(
+            type(switch._sun_light_settings),
+            "get_settings",
+            return_value=settings,
+        ):
+            await switch._update_attrs_and_maybe_adapt_lights(
+                context=context,
+                transition=0,
+            )
+        await hass.async_block_till_done()
+
+    await tick(0.5001)
+    last_updated = hass.states.get(switch.entity_id).last_updated
+    unchanged = counters.state_writes_unchanged
+
+    # Too small to matter
+    await tick(0.5004)
+    assert counters.state_writes_unchanged == unchanged + 1
+    assert counters.state_writes_throttled == 0
+    state = hass.states.get(switch.entity_id)
+    assert state.last_updated == last_updated
+    assert state.attributes["sun_position"] == 0.5001
+
+    # A change of a light's manual control is written without a settings change
+    switch.manager.mark_as_manual_control(ENTITY_LIGHT_1)
+    await tick(0.5004)
+    state = hass.states.get(switch.entity_id)
+    assert state.attributes["manual_control"] == [ENTITY_LIGHT_1]
+
+    await tick(0.52)
+    assert counters.state_writes_unchanged == unchanged + 1
+    state = hass.states.get(switch.entity_id)
+    assert state.attributes["sun_position"] == 0.52
+
+
+async def test_attribute_profile(hass):
+    """Test the compact attributes and that bulky ones are not recorded."""
+    assert {"configuration", "manual_control", "autoreset_time_remaining"} <= (
+        AdaptiveSwitch._unrecorded_attributes
+    )
+    switch, _ = await setup_lights_and_switch(hass)
+    attributes = hass.states.get(switch.entity_id).attributes
+    assert "xy_color" in attributes
+    assert "autoreset_time_remaining" in attributes
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CHANGE_SWITCH_SETTINGS,
+        {ATTR_ENTITY_ID: switch.entity_id, CONF_ATTRIBUTE_PROFILE: "compact"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    attributes = hass.states.get(switch.entity_id).attributes
+    assert "brightness_pct" in attributes
+    assert "color_temp_kelvin" in attributes
+    assert "manual_control" in attributes
+    for key in ("configuration", "xy_color", "hs_color", "autoreset_time_remaining"):
+        assert key not in attributes
+
+    # A change of an attribute that is left out does not write the state
+    unchanged = switch.counters.state_writes_unchanged
+    settings = {**switch._settings, "xy_color": (0.1, 0.1)}
+    with patch.object(
+        type(switch._sun_light_settings),
+        "get_settings",
+        return_value=settings,
+    ):
+        await switch._update_attrs_and_maybe_adapt_lights(
+            context=switch.create_context("test"),
+            transition=0,
+        )
+    assert switch.counters.state_writes_unchanged == unchanged + 1
+
+
+async def test_decision_history(hass):
+    """Test that the reasons for (not) adapting a light are kept."""
+    switch, _ = await setup_lights_and_switch(hass)
+    context = switch.create_context("test")
+
+    await switch._update_attrs_and_maybe_adapt_lights(context=context, transition=0)
+    decision = switch.manager.record(ENTITY_LIGHT_1).decisions[-1]
+    assert (decision.decision, decision.reason) == (DECISION_ADAPT, REASON_UPDATE)
+    assert decision.context_id == context.id
+    assert decision.switch == switch._name
+
+    switch.manager.mark_as_manual_control(ENTITY_LIGHT_1)
+    await switch._update_attrs_and_maybe_adapt_lights(context=context, transition=0)
+    decision = switch.manager.record(ENTITY_LIGHT_1).decisions[-1]
+    assert (decision.decision, decision.reason) == (
+        DECISION_SKIP,
+        REASON_MANUAL_CONTROL,
+    )
+
+    # Lights that are not tracked get no record
+    switch.manager.add_decision("light.untracked", DECISION_SKIP, "test", None)
+    assert "light.untracked" not in switch.manager.records
+
+
 @pytest.mark.parametrize("separate_turn_on_commands", (True, False))
 async def test_separate_turn_on_commands(hass, separate_turn_on_commands):
     """Test 'separate_turn_on_commands' argument."""
@@ -1436,6 +1639,25 @@ async def test_light_switch_in_specific_area(hass):
     assert light.entity_id not in switch.manager.last_service_data
 
 
+async def test_area_lights_index_invalidation(hass):
+    """Test that the area → lights index follows entity registry updates."""
+    switch, (light, *_) = await setup_lights_and_switch(hass)
+
+    area = ar.async_get(hass).async_create("Index Area")
+    await hass.async_block_till_done()
+    registry = entity_registry.async_get(hass)
+    entity = registry.async_get_or_create(LIGHT_DOMAIN, "template", light.unique_id)
+    assert switch.manager.area_lights(area.id) == ()
+
+    registry.async_update_entity(entity.entity_id, area_id=area.id)
+    await hass.async_block_till_done()
+    assert switch.manager.area_lights(area.id) == (light.entity_id,)
+
+    registry.async_update_entity(entity.entity_id, area_id=None)
+    await hass.async_block_till_done()
+    assert switch.manager.area_lights(area.id) == ()
+
+
 async def test_change_switch_settings_service(hass):
     """Test adaptive_lighting.change_switch_settings service."""
     switch, (_, _, light) = await setup_lights_and_switch(hass)
@@ -1525,13 +1747,133 @@ async def test_cancellable_service_calls_task(hass):
     assert task.done()
 
 
+async def test_target_payload_reuse(hass):
+    """Test that intercepted calls reuse the target attributes of the last update."""
+    switch, _ = await setup_lights_and_switch(hass)
+    record = switch.manager.record(ENTITY_LIGHT_1)
+
+    # An update computes and stores the target attributes
+    data = await switch.prepare_adaptation_data(ENTITY_LIGHT_1)
+    assert data is not None
+    assert record.target_payload is not None
+
+    with patch.object(
+        switch,
+        "_target_attributes",
+        wraps=switch._target_attributes,
+    ) as target_attributes:
+        data = await switch.prepare_adaptation_data(
+            ENTITY_LIGHT_1,
+            use_target_payload=True,
+        )
+        assert data is not None
+        assert target_attributes.call_count == 0
+
+        # Changing the settings invalidates the payload
+        switch._settings_version += 1
+        await switch.prepare_adaptation_data(ENTITY_LIGHT_1, use_target_payload=True)
+        assert target_attributes.call_count == 1
+
+        # The settings are computed for the end of the transition
+        transition = TARGET_PAYLOAD_MAX_AGE.total_seconds() + 1
+        await switch.prepare_adaptation_data(
+            ENTITY_LIGHT_1,
+            transition=transition,
+            use_target_payload=True,
+        )
+        assert target_attributes.call_count == 2
+
+        # A payload that is too old is recomputed, however long the interval
+        switch._interval = datetime.timedelta(hours=1)
+        stale = record.target_payload.settings_time + datetime.timedelta(
+            seconds=transition,
+        )
+        with patch(
+            "homeassistant.components.adaptive_lighting.switch.dt_util.utcnow",
+            return_value=stale,
+        ):
+            await switch.prepare_adaptation_data(
+                ENTITY_LIGHT_1,
+                transition=0,
+                use_target_payload=True,
+            )
+        assert target_attributes.call_count == 3
+
+
+async def test_target_payload_for_lights_that_are_off(hass):
+    """Test that turning on a light that is off uses the payload of the last update."""
+    switch, _ = await setup_lights_and_switch(hass, {CONF_INTERCEPT: True})
+    await hass.services.async_call(
+        LIGHT_DOMAIN,
+        SERVICE_TURN_OFF,
+        {ATTR_ENTITY_ID: ENTITY_LIGHT_2},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    record = switch.manager.record(ENTITY_LIGHT_2)
+    record.target_payload = None
+
+    # An update prepares the payload of the light that is off
+    await switch._update_attrs_and_maybe_adapt_lights(
+        context=switch.create_context("interval"),
+        transition=0,
+    )
+    payload = record.target_payload
+    assert payload is not None
+    assert ATTR_BRIGHTNESS in payload.attributes
+
+    stats = switch.manager.target_payload_stats
+    hits, misses = stats.hits, stats.misses
+    with patch.object(
+        switch,
+        "_target_attributes",
+        wraps=switch._target_attributes,
+    ) as target_attributes:
+        await hass.services.async_call(
+            LIGHT_DOMAIN,
+            SERVICE_TURN_ON,
+            {ATTR_ENTITY_ID: ENTITY_LIGHT_2},
+            blocking=True,
+        )
+        await hass.async_block_till_done()
+    assert target_attributes.call_count == 0
+    assert (stats.hits, stats.misses) == (hits + 1, misses)
+    assert any(decision.reason == REASON_INTERCEPTED for decision in record.decisions)
+    assert hass.states.get(ENTITY_LIGHT_2).state == STATE_ON
+
+
+async def test_target_attributes_without_kelvin_range(hass):
+    """Test the color temperature of a light that does not report its range."""
+    switch, _ = await setup_lights_and_switch(hass)
+    capabilities = LightCapabilities(
+        features=frozenset({"brightness", "color_temp"}),
+        min_kelvin=None,
+        max_kelvin=None,
+    )
+    settings = {
+        "brightness_pct": 50,
+        "color_temp_kelvin": 1000,
+        "rgb_color": (255, 56, 0),
+        "force_rgb_color": False,
+    }
+    attributes = switch._target_attributes(
+        ENTITY_LIGHT_1,
+        capabilities,
+        settings,
+        adapt_brightness=True,
+        adapt_color=True,
+        prefer_rgb_color=False,
+    )
+    assert attributes == {ATTR_BRIGHTNESS: 128, ATTR_COLOR_TEMP_KELVIN: 1000}
+
+
 async def test_service_calls_task_cancellation(hass):
     """Tests if the task that wraps ongoing adaptation service calls gets cancelled."""
     _, switch = await setup_switch(hass, {})
     entity_id = "test_id"
 
     task = asyncio.ensure_future(asyncio.sleep(1))
-    switch.manager.adaptation_tasks_brightness[entity_id] = task
+    switch.manager.record(entity_id).adaptation_task_brightness = task
 
     switch.manager.cancel_ongoing_adaptation_calls(entity_id)
 
@@ -1574,6 +1916,8 @@ def _mock_sun_light_settings(switch: AdaptiveSwitch, settings: dict[str, Any]):
     sun_light_settings_mock = Mock()
     sun_light_settings_mock.get_settings = Mock(return_value=settings)
     switch._sun_light_settings = sun_light_settings_mock
+    # Like changing the settings, which invalidates the target payloads
+    switch._settings_version += 1
 
 
 async def test_proactive_adaptation(hass):
@@ -1722,7 +2066,10 @@ async def test_proactive_adaptation_transition_override(hass):
     switch.manager.cancel_ongoing_adaptation_calls(ENTITY_LIGHT_3)
 
 
-async def setup_proactive_multiple_lights_two_switches(hass):
+async def setup_proactive_multiple_lights_two_switches(
+    hass,
+    switch2_lights: list[str] | None = None,
+):
     await setup_lights(hass)
     # Setup switches
     lights = [
@@ -1752,7 +2099,11 @@ async def setup_proactive_multiple_lights_two_switches(hass):
     )
     _, switch2 = await setup_switch(
         hass,
-        {CONF_NAME: "switch2", CONF_LIGHTS: [ENTITY_LIGHT_2], **defaults},
+        {
+            CONF_NAME: "switch2",
+            CONF_LIGHTS: switch2_lights or [ENTITY_LIGHT_2],
+            **defaults,
+        },
     )
     assert hass.states.get(switch1.entity_id).state == STATE_ON
     assert hass.states.get(switch2.entity_id).state == STATE_ON
@@ -1777,13 +2128,16 @@ async def test_proactive_multiple_lights_all_at_once(hass):
     assert events[0].context.id == "test1"
     assert events[0].data["service_data"][ATTR_ENTITY_ID] == lights
 
+    # The other calls are made concurrently, so their order is not fixed
+    intercepted, skipped = sorted(events[1:], key=lambda e: ":skpp:" in e.context.id)
+
     # The `has_intercepted` path
-    assert events[1].data["service_data"][ATTR_ENTITY_ID] == ENTITY_LIGHT_2
-    assert ":ntrc:" in events[1].context.id
+    assert intercepted.data["service_data"][ATTR_ENTITY_ID] == ENTITY_LIGHT_2
+    assert ":ntrc:" in intercepted.context.id
 
     # The skipped lights, the one not in a switch
-    assert events[2].data["service_data"][ATTR_ENTITY_ID] == [ENTITY_LIGHT_3]
-    assert ":skpp:" in events[2].context.id
+    assert skipped.data["service_data"][ATTR_ENTITY_ID] == [ENTITY_LIGHT_3]
+    assert ":skpp:" in skipped.context.id
 
     assert switch1.manager.is_proactively_adapting("test1")
     assert switch2.manager.is_proactively_adapting("test1")
@@ -1878,6 +2232,53 @@ async def test_proactive_multiple_lights_one_switch_and_one_skipped(hass):
     assert all(hass.states.get(light).state == STATE_ON for light in two_lights)
 
 
+async def test_proactive_multiple_lights_concurrent_adaptation(hass, caplog):
+    """Test that the other switch's lights are adapted concurrently and independently."""
+    lights, _, switch2 = await setup_proactive_multiple_lights_two_switches(
+        hass,
+        switch2_lights=[ENTITY_LIGHT_2, ENTITY_LIGHT_3],
+    )
+    started = {light: asyncio.Event() for light in lights[1:]}
+    adapted = []
+    adapt_light = switch2._adapt_light
+
+    async def _adapt_light(light, *args, **kwargs):
+        started[light].set()
+        if light == ENTITY_LIGHT_2:
+            # Only returns if the adaptation of ENTITY_LIGHT_3 runs concurrently
+            await asyncio.wait_for(started[ENTITY_LIGHT_3].wait(), timeout=1)
+            msg = "Light is unreachable"
+            raise RuntimeError(msg)
+        await adapt_light(light, *args, **kwargs)
+        adapted.append(light)
+
+    with patch.object(switch2, "_adapt_light", side_effect=_adapt_light):
+        events = await _turn_on_and_track_event_contexts(
+            hass,
+            "test1",
+            lights,
+            return_full_events=True,
+        )
+    await hass.async_block_till_done()
+
+    # The error for ENTITY_LIGHT_2 did not drop the adaptation of ENTITY_LIGHT_3
+    assert adapted == [ENTITY_LIGHT_3]
+    assert "Light is unreachable" in caplog.text
+    assert "TimeoutError" not in caplog.text
+    adapt_calls = [
+        event.data["service_data"]
+        for event in events
+        if ":ntrc:" in event.context.id
+    ]
+    assert [data[ATTR_ENTITY_ID] for data in adapt_calls] == [ENTITY_LIGHT_3]
+    assert ATTR_BRIGHTNESS in adapt_calls[0]
+    # The call itself was intercepted for the first switch
+    assert switch2.manager.is_proactively_adapting("test1")
+    assert hass.states.get(ENTITY_LIGHT_1).state == STATE_ON
+    assert hass.states.get(ENTITY_LIGHT_3).state == STATE_ON
+    assert hass.states.get(ENTITY_LIGHT_2).state == STATE_OFF
+
+
 async def test_two_switches_for_single_light(hass):
     """Test the case where someone has two switches for a single light.
 
@@ -2502,6 +2903,128 @@ async def test_lux_sensor_reading(hass):
     assert lux_reading == 300.5
 
 
+async def test_lux_sensor_filter_and_hysteresis(hass):
+    """Test that lux readings are smoothed and small changes are ignored."""
+    from custom_components.adaptive_lighting.const import (
+        CONF_LUX_FILTER,
+        CONF_LUX_FILTER_WINDOW,
+        CONF_LUX_HYSTERESIS,
+        CONF_LUX_MAX,
+        CONF_LUX_MIN,
+        CONF_LUX_SENSOR,
+    )
+
+    hass.states.async_set("sensor.lux", "300")
+    config = {
+        CONF_NAME: "test_lux",
+        CONF_LIGHTS: ["light.test"],
+        CONF_LUX_SENSOR: "sensor.lux",
+        CONF_LUX_MIN: 0,
+        CONF_LUX_MAX: 1000,
+        CONF_LUX_FILTER: "median",
+        CONF_LUX_FILTER_WINDOW: 3,
+        CONF_LUX_HYSTERESIS: 5,  # 50 lux
+    }
+    _, switch = await setup_switch(hass, config)
+    assert switch._get_lux_reading() == 300
+    # Reading the same state again (e.g., for the next light) adds no sample
+    assert switch._get_lux_reading() == 300
+
+    # Within the hysteresis band
+    hass.states.async_set("sensor.lux", "310")
+    assert switch._get_lux_reading() == 300
+    # A single spike is removed by the median
+    hass.states.async_set("sensor.lux", "900")
+    assert switch._get_lux_reading() == 300
+    # The median of 900, 340 and before that 310 is still within the band
+    hass.states.async_set("sensor.lux", "340")
+    assert switch._get_lux_reading() == 300
+    hass.states.async_set("sensor.lux", "360")
+    assert switch._get_lux_reading() == 360
+
+    # The filter starts over when the sensor was unavailable
+    hass.states.async_set("sensor.lux", "unavailable")
+    assert switch._get_lux_reading() is None
+    hass.states.async_set("sensor.lux", "100")
+    assert switch._get_lux_reading() == 100
+
+
+async def test_lux_sensor_changes_adapt_lights(hass):
+    """Test that lux sensor updates adapt the lights when the settings change."""
+    from custom_components.adaptive_lighting.const import (
+        CONF_LUX_MAX,
+        CONF_LUX_MIN,
+        CONF_LUX_SENSOR,
+    )
+
+    hass.states.async_set("sensor.lux", "500")
+    switch, _ = await setup_lights_and_switch(
+        hass,
+        {
+            CONF_LUX_SENSOR: "sensor.lux",
+            CONF_LUX_MIN: 0,
+            CONF_LUX_MAX: 1000,
+            CONF_MIN_BRIGHTNESS: 1,
+            CONF_MAX_BRIGHTNESS: 100,
+        },
+    )
+    ticks = switch.counters.ticks
+
+    # Less than a percent of brightness, no adaptation
+    hass.states.async_set("sensor.lux", "505")
+    await hass.async_block_till_done()
+    assert switch.counters.ticks == ticks
+
+    hass.states.async_set("sensor.lux", "700")
+    await hass.async_block_till_done()
+    assert switch.counters.ticks == ticks + 1
+    assert switch._settings[ATTR_BRIGHTNESS_PCT] == pytest.approx(100 - 0.7 * 99)
+    state = hass.states.get(ENTITY_LIGHT_1)
+    assert state.attributes[ATTR_BRIGHTNESS] == round(255 * (100 - 0.7 * 99) / 100)
+
+    # An unavailable sensor leaves it to the interval
+    hass.states.async_set("sensor.lux", "unavailable")
+    await hass.async_block_till_done()
+    assert switch.counters.ticks == ticks + 1
+
+
+async def test_multiple_lux_sensors(hass):
+    """Test that the readings of several lux sensors are combined once."""
+    from custom_components.adaptive_lighting.const import (
+        CONF_LUX_AGGREGATION,
+        CONF_LUX_SENSOR,
+        CONF_LUX_SENSORS,
+        CONF_LUX_WEIGHTS,
+    )
+
+    hass.states.async_set("sensor.lux_1", "100")
+    hass.states.async_set("sensor.lux_2", "400")
+    hass.states.async_set("sensor.lux_3", "unavailable")
+    config = {
+        CONF_NAME: "test_lux",
+        CONF_LIGHTS: ["light.test"],
+        CONF_LUX_SENSOR: "sensor.lux_1",
+        CONF_LUX_SENSORS: ["sensor.lux_1", "sensor.lux_2", "sensor.lux_3"],
+        CONF_LUX_AGGREGATION: "weighted",
+        CONF_LUX_WEIGHTS: {"sensor.lux_2": 2},
+    }
+    _, switch = await setup_switch(hass, config)
+    assert list(switch._lux_filters) == ["sensor.lux_1", "sensor.lux_2", "sensor.lux_3"]
+    # The unavailable sensor is left out
+    assert switch._get_lux_reading() == 300
+
+    # Unchanged states are not parsed again
+    with patch.object(switch, "_read_lux_sensor") as read_lux_sensor:
+        assert switch._get_lux_reading() == 300
+    read_lux_sensor.assert_not_called()
+
+    hass.states.async_set("sensor.lux_3", "700")
+    assert switch._get_lux_reading() == 400
+    for sensor in switch._lux_filters:
+        hass.states.async_set(sensor, "unknown")
+    assert switch._get_lux_reading() is None
+
+
 async def test_lux_sensor_unavailable(hass):
     """Test fallback when lux sensor is unavailable."""
     from custom_components.adaptive_lighting.const import (
@@ -0,0 +1,312 @@
+"""Tests for recording and replaying Adaptive Lighting event traces.
+
+`replay_trace` is also a harness to replay a trace that was recorded with the
+`adaptive_lighting.record_trace` service on a real installation, with the time
+under control of the test. Point ADAPTIVE_LIGHTING_TRACE at the trace file and
+optionally ADAPTIVE_LIGHTING_TRACE_OUTPUT at a JSON file for the report, which
+contains the light service calls that the integration made, so the decisions
+of two versions can be compared (see README.md in this directory):
+
+    ADAPTIVE_LIGHTING_TRACE=adaptive_lighting_trace_20240621_120000.jsonl \
+    ADAPTIVE_LIGHTING_TRACE_OUTPUT=replay.json \
+    python -m pytest --timeout=0 tests/components/adaptive_lighting/test_trace.py
+"""
+
+import datetime as dt
+import json
+import logging
+import os
+from collections import Counter
+from pathlib import Path
+from time import perf_counter
+
+from homeassistant.components.adaptive_lighting.const import (
+    ATTR_ADAPTIVE_LIGHTING_MANAGER,
+    CONF_INITIAL_TRANSITION,
+    DOMAIN,
+    SLEEP_MODE_SWITCH,
+)
+from homeassistant.components.adaptive_lighting.switch import is_our_context_id
+from homeassistant.components.adaptive_lighting.trace import (
+    TRACE_VERSION,
+    Trace,
+    TraceCall,
+    TraceRecorder,
+    TraceState,
+    async_record_trace,
+    parse_trace,
+)
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_COLOR_MODE,
+    ATTR_COLOR_TEMP_KELVIN,
+    ATTR_MAX_COLOR_TEMP_KELVIN,
+    ATTR_MIN_COLOR_TEMP_KELVIN,
+    ATTR_SUPPORTED_COLOR_MODES,
+    ColorMode,
+)
+from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_FRIENDLY_NAME,
+    CONF_LIGHTS,
+    CONF_NAME,
+    CONF_PARAMS,
+    SERVICE_TOGGLE,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_OFF,
+    STATE_ON,
+)
+from homeassistant.core import Context, HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import async_setup_component
+
+from tests.common import MockConfigEntry, async_fire_time_changed
+
+_LOGGER = logging.getLogger(__name__)
+
+ENTITY_LIGHT = "light.trace"
+ENTITY_OTHER_SWITCH = "switch.other"  # not an Adaptive Lighting switch
+LIGHT_ATTRIBUTES = {
+    ATTR_FRIENDLY_NAME: "trace",
+    ATTR_SUPPORTED_COLOR_MODES: [ColorMode.COLOR_TEMP],
+    ATTR_MIN_COLOR_TEMP_KELVIN: 2000,
+    ATTR_MAX_COLOR_TEMP_KELVIN: 6535,
+}
+ENTRY_DATA = {
+    CONF_NAME: "trace",
+    CONF_LIGHTS: [ENTITY_LIGHT],
+    CONF_INITIAL_TRANSITION: 0,
+}
+LIGHT_SERVICES = (SERVICE_TURN_ON, SERVICE_TURN_OFF, SERVICE_TOGGLE)
+
+TRACE_PATH = os.environ.get("ADAPTIVE_LIGHTING_TRACE")
+TRACE_OUTPUT = os.environ.get("ADAPTIVE_LIGHTING_TRACE_OUTPUT")
+
+# A user turns on the light, it is left on for a few adaptation intervals and
+# is turned off again
+SAMPLE_TRACE = [
+    {
+        "version": TRACE_VERSION,
+        "start": "2024-06-21T18:00:00+00:00",
+        "entries": [{"title": "trace", "data": ENTRY_DATA, "options": {}}],
+        "lights": {ENTITY_LIGHT: [STATE_OFF, LIGHT_ATTRIBUTES]},
+        "switches": {},
+    },
+    [1.0, "call", LIGHT_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: ENTITY_LIGHT}, "user", None],
+    [1.2, "state", ENTITY_LIGHT, STATE_ON, {ATTR_BRIGHTNESS: 255, ATTR_COLOR_MODE: ColorMode.COLOR_TEMP, ATTR_COLOR_TEMP_KELVIN: 4000}, [], "user", None],
+    [400.0, "call", LIGHT_DOMAIN, SERVICE_TURN_OFF, {ATTR_ENTITY_ID: ENTITY_LIGHT}, "user", None],
+    [400.1, "state", ENTITY_LIGHT, STATE_OFF, {}, [ATTR_BRIGHTNESS, ATTR_COLOR_MODE, ATTR_COLOR_TEMP_KELVIN], "user", None],
+]  # fmt: skip
+
+
+async def async_mock_light_services(hass: HomeAssistant) -> dict[str, list]:
+    """Replace the light services by mocks and return their calls per service."""
+    # Set up 'light' first, otherwise the entry's dependency replaces the mocks
+    assert await async_setup_component(hass, LIGHT_DOMAIN, {})
+    services = hass.services.async_services_for_domain(LIGHT_DOMAIN)
+    calls: dict[str, list[ServiceCall]] = {service: [] for service in LIGHT_SERVICES}
+    for service, service_calls in calls.items():
+
+        async def mock_service(call: ServiceCall, calls=service_calls) -> None:
+            calls.append(call)
+
+        # Keep the schema, which the interceptor relies on
+        schema = services[service].schema
+        hass.services.async_register(LIGHT_DOMAIN, service, mock_service, schema)
+    return calls
+
+
+async def setup_light_and_switch(hass: HomeAssistant) -> dict[str, list]:
+    """Set up a light without an integration and a switch that adapts it."""
+    calls = await async_mock_light_services(hass)
+    hass.states.async_set(ENTITY_LIGHT, STATE_OFF, LIGHT_ATTRIBUTES)
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return calls
+
+
+async def replay_trace(hass: HomeAssistant, freezer, trace: Trace) -> dict:
+    """Replay 'trace' against the integration and report what it did.
+
+    Lights are replaced by mocked services and get the recorded states. The
+    light service calls of the integration itself are not replayed, because
+    the replayed integration makes its own.
+    """
+    freezer.move_to(trace.start)
+    calls = await async_mock_light_services(hass)
+    for entity_id, (state, attributes) in trace.lights.items():
+        hass.states.async_set(entity_id, state, attributes)
+    for entry_data in trace.entries:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=entry_data["title"],
+            data=entry_data["data"],
+            options=entry_data["options"],
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    for entity_id, state in trace.switches.items():
+        if state in (STATE_ON, STATE_OFF) and hass.states.get(entity_id) is not None:
+            await hass.services.async_call(
+                SWITCH_DOMAIN,
+                SERVICE_TURN_ON if state == STATE_ON else SERVICE_TURN_OFF,
+                {ATTR_ENTITY_ID: entity_id},
+                blocking=True,
+            )
+    await hass.async_block_till_done()
+    for service_calls in calls.values():
+        service_calls.clear()
+
+    replayed = errors = 0
+    start = perf_counter()
+    for event in trace.events:
+        now = trace.start + dt.timedelta(seconds=event.time)
+        freezer.move_to(now)
+        async_fire_time_changed(hass, now)
+        context = Context(id=event.context_id, parent_id=event.parent_id)
+        if isinstance(event, TraceState):
+            if event.state is None:
+                hass.states.async_remove(event.entity_id, context=context)
+            else:
+                hass.states.async_set(
+                    event.entity_id,
+                    event.state,
+                    event.attributes,
+                    context=context,
+                )
+        elif not is_our_context_id(event.context_id):
+            try:
+                await hass.services.async_call(
+                    event.domain,
+                    event.service,
+                    event.service_data,
+                    blocking=True,
+                    context=context,
+                )
+            except HomeAssistantError:
+                errors += 1
+        else:
+            continue
+        replayed += 1
+        await hass.async_block_till_done()
+    elapsed = perf_counter() - start
+
+    manager = hass.data[DOMAIN][ATTR_ADAPTIVE_LIGHTING_MANAGER]
+    decisions = Counter(
+        f"{decision.decision}:{decision.reason}"
+        for record in manager.records.values()
+        for decision in record.decisions or ()
+    )
+    return {
+        "events": len(trace.events),
+        "replayed": replayed,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "events_per_second": replayed / elapsed if elapsed else None,
+        "decisions": dict(decisions),
+        # Per service in the order of the calls, context ids differ between runs
+        "service_calls": [
+            [service, dict(call.data)]
+            for service, service_calls in calls.items()
+            for call in service_calls
+        ],
+    }
+
+
+async def test_trace_recorder(hass):
+    """Test that the events we handle are recorded and parsed back."""
+    await setup_light_and_switch(hass)
+    data = hass.data[DOMAIN]
+    entry_id = next(key for key in data if key != ATTR_ADAPTIVE_LIGHTING_MANAGER)
+    sleep_mode_switch = data[entry_id][SLEEP_MODE_SWITCH].entity_id
+
+    recorder = TraceRecorder(hass)
+    recorder.start()
+    await hass.services.async_call(
+        LIGHT_DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: ENTITY_LIGHT},
+        blocking=True,
+    )
+    for brightness in (1, 2):
+        attributes = {**LIGHT_ATTRIBUTES, ATTR_BRIGHTNESS: brightness}
+        hass.states.async_set(ENTITY_LIGHT, STATE_ON, attributes)
+    for entity_id in (sleep_mode_switch, ENTITY_OTHER_SWITCH):
+        await hass.services.async_call(
+            SWITCH_DOMAIN,
+            SERVICE_TURN_ON,
+            {ATTR_ENTITY_ID: entity_id},
+            blocking=True,
+        )
+    await hass.async_block_till_done()
+    recorder.stop()
+    n_events = recorder.events
+    hass.states.async_set(ENTITY_LIGHT, STATE_OFF, LIGHT_ATTRIBUTES)
+    assert recorder.events == n_events
+
+    trace = parse_trace(recorder.lines)
+    assert len(trace.events) == n_events
+    assert trace.lights[ENTITY_LIGHT][0] == STATE_OFF
+    assert trace.entries[0]["data"][CONF_NAME] == "trace"
+    assert trace.switches[sleep_mode_switch] == STATE_OFF
+
+    call = trace.events[0]
+    assert isinstance(call, TraceCall)
+    assert (call.domain, call.service) == (LIGHT_DOMAIN, SERVICE_TURN_ON)
+    assert not is_our_context_id(call.context_id)
+
+    states = [e for e in trace.events if isinstance(e, TraceState)]
+    assert [s.attributes[ATTR_BRIGHTNESS] for s in states] == [1, 2]
+    assert all(s.attributes[ATTR_FRIENDLY_NAME] == "trace" for s in states)
+    # Only the changed attributes are stored
+    raw_states = [
+        line for line in map(json.loads, recorder.lines[1:]) if line[1] == "state"
+    ]
+    assert raw_states[1][4] == {ATTR_BRIGHTNESS: 2}
+
+    switch_calls = [
+        e for e in trace.events if isinstance(e, TraceCall) and e.domain == SWITCH_DOMAIN
+    ]
+    assert [c.service_data[ATTR_ENTITY_ID] for c in switch_calls] == [sleep_mode_switch]
+
+
+async def test_async_record_trace(hass, tmp_path):
+    """Test that the trace is written to the config directory."""
+    hass.config.config_dir = str(tmp_path)
+    await setup_light_and_switch(hass)
+    result = await async_record_trace(hass, 0.01)
+    path = Path(result["path"])
+    assert path.parent == tmp_path
+    assert result["events"] == 0
+    trace = parse_trace(path.read_text().splitlines())
+    assert ENTITY_LIGHT in trace.lights
+    assert trace.events == []
+
+
+async def test_replay_trace(hass, freezer):
+    """Test that a trace is replayed deterministically against the integration."""
+    if TRACE_PATH is not None:
+        lines = Path(TRACE_PATH).read_text().splitlines()
+    else:
+        lines = [json.dumps(line) for line in SAMPLE_TRACE]
+    report = await replay_trace(hass, freezer, parse_trace(lines))
+    _LOGGER.info("Replay report: %s", report)
+    if TRACE_OUTPUT:
+        Path(TRACE_OUTPUT).write_text(json.dumps(report, indent=2, default=str) + "\n")
+
+    assert report["replayed"] > 0
+    if TRACE_PATH is None:
+        assert report["errors"] == 0
+        # The user's turn on call is intercepted and adapted
+        assert report["decisions"]["adapt:intercepted"] == 1
+        service, data = report["service_calls"][0]
+        assert service == SERVICE_TURN_ON
+        assert ATTR_BRIGHTNESS in data[CONF_PARAMS]
+        services = [service for service, _ in report["service_calls"]]
+        assert SERVICE_TURN_OFF in services
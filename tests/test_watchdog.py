@@ -0,0 +1,87 @@
+"""Tests for the Adaptive Lighting event loop watchdog."""
+
+import asyncio
+import time
+
+import pytest
+from homeassistant.components.adaptive_lighting.watchdog import LoopWatchdog, watched
+
+ENTITY_LIGHT = "light.test"
+
+
+class Watched:
+    """Object with watched callbacks."""
+
+    def __init__(self):
+        """Initialize with a disabled watchdog."""
+        self._name = "test"
+        self.watchdog = LoopWatchdog()
+
+    @watched
+    async def block(self, light, seconds):
+        """Block the event loop for 'seconds'."""
+        await asyncio.sleep(0)
+        time.sleep(seconds)  # noqa: ASYNC251
+        await asyncio.sleep(0)
+        return light
+
+    @watched
+    async def fail(self, light):
+        """Raise an error."""
+        await asyncio.sleep(0)
+        raise ValueError(light)
+
+    @watched
+    async def wait(self, light, event):
+        """Wait for 'event' without blocking."""
+        await event.wait()
+        return light
+
+
+async def test_watchdog_disabled():
+    """Test that nothing is reported while disabled."""
+    obj = Watched()
+    assert await obj.block(ENTITY_LIGHT, 0.01) == ENTITY_LIGHT
+    assert obj.watchdog.count == 0
+    assert obj.watchdog.as_dict()["enabled"] is False
+
+
+async def test_watchdog_reports_blocking_step():
+    """Test that a step that blocks longer than the threshold is reported."""
+    obj = Watched()
+    obj.watchdog.threshold = 0.005
+
+    assert await obj.block(ENTITY_LIGHT, 0) == ENTITY_LIGHT
+    assert obj.watchdog.count == 0
+
+    assert await obj.block(ENTITY_LIGHT, 0.02) == ENTITY_LIGHT
+    assert obj.watchdog.count == 1
+    block = obj.watchdog.blocks[-1]
+    assert block.callback == "Watched.block"
+    assert block.target == f"test, {ENTITY_LIGHT}"
+    assert block.duration_ms >= 20
+
+    summary = obj.watchdog.as_dict()
+    assert summary["threshold_ms"] == 5
+    assert summary["recent"][0]["callback"] == "Watched.block"
+
+
+async def test_watchdog_passes_through_exceptions_and_cancellation():
+    """Test that watched callbacks behave like the original coroutines."""
+    obj = Watched()
+    obj.watchdog.threshold = 1
+
+    with pytest.raises(ValueError, match=ENTITY_LIGHT):
+        await obj.fail(ENTITY_LIGHT)
+
+    event = asyncio.Event()
+    task = asyncio.ensure_future(obj.wait(ENTITY_LIGHT, event))
+    await asyncio.sleep(0)
+    event.set()
+    assert await task == ENTITY_LIGHT
+
+    task = asyncio.ensure_future(obj.wait(ENTITY_LIGHT, asyncio.Event()))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
@@ -14,22 +14,6 @@ from homeassistant_util_color import color_temperature_to_rgb
 from shiny import App, render, ui
 
 
-def date_range(tzinfo: dt.tzinfo) -> list[dt.datetime]:
-    """Return a list of datetimes for the current day."""
-    start_of_day = dt.datetime.now(tzinfo).replace(
-        hour=0,
-        minute=0,
-        second=0,
-        microsecond=0,
-    )
-    # one second before the next day
-    end_of_day = start_of_day + dt.timedelta(days=1) - dt.timedelta(seconds=1)
-    hours_range = [start_of_day]
-    while hours_range[-1] < end_of_day:
-        hours_range.append(hours_range[-1] + dt.timedelta(minutes=1))
-    return hours_range[:-1]
-
-
 def copy_color_and_brightness_module() -> None:
     """Copy the color_and_brightness module to the webapp folder."""
     with suppress(Exception):
@@ -56,24 +40,20 @@ def copy_color_and_brightness_module() -> None:
 copy_color_and_brightness_module()
 
 from color_and_brightness import SunLightSettings  # noqa: E402
+from series import SeriesCache  # noqa: E402
+
+# Dragging a slider back and forth only computes the series once per value
+series_cache = SeriesCache()
 
 
 def plot_brightness(inputs: dict[str, Any], sleep_mode: bool):
     """Plot the brightness over time for different modes."""
-    # Define the time range for our simulation
-    sun_linear = SunLightSettings(**inputs, brightness_mode="linear")
-    sun_tanh = SunLightSettings(**inputs, brightness_mode="tanh")
     sun = SunLightSettings(**inputs, brightness_mode="default")
-    # Calculate the brightness for each time in the time range for all modes
-    dt_range = date_range(sun.timezone)
-    time_range = [time_to_float(dt) for dt in dt_range]
-    brightness_linear_values = [
-        sun_linear.brightness_pct(dt, sleep_mode) for dt in dt_range
-    ]
-    brightness_tanh_values = [
-        sun_tanh.brightness_pct(dt, sleep_mode) for dt in dt_range
-    ]
-    brightness_default_values = [sun.brightness_pct(dt, sleep_mode) for dt in dt_range]
+    series = series_cache.get(inputs, sleep_mode)
+    time_range = series.time_range
+    brightness_linear_values = series.brightness_pct["linear"]
+    brightness_tanh_values = series.brightness_pct["tanh"]
+    brightness_default_values = series.brightness_pct["default"]
 
     # Plot the brightness over time for both modes
     fig, ax = plt.subplots(figsize=(10, 6))
@@ -138,19 +118,16 @@ def plot_brightness(inputs: dict[str, Any], sleep_mode: bool):
 def plot_color_temp(inputs: dict[str, Any], sleep_mode: bool) -> plt.Figure:
     """Plot the color temperature over time for different modes."""
     sun = SunLightSettings(**inputs, brightness_mode="default")
-    dt_range = date_range(tzinfo=sun.timezone)
-    time_range = [time_to_float(dt) for dt in dt_range]
-    settings = [sun.brightness_and_color(dt, sleep_mode) for dt in dt_range]
+    series = series_cache.get(inputs, sleep_mode)
+    time_range = series.time_range
     if sleep_mode and sun.sleep_rgb_or_color_temp == "color_temp":
-        colors = [
-            color_temperature_to_rgb(setting["color_temp_kelvin"])
-            for setting in settings
-        ]
+        rgb_color = color_temperature_to_rgb(sun.sleep_color_temp)
+        colors = np.tile(rgb_color, (len(time_range), 1))
     else:
-        colors = [setting["rgb_color"] for setting in settings]
-    color_temp_values = np.array([(*col, 255) for col in colors]) / 255
+        colors = series.rgb_color
+    color_temp_values = np.column_stack([colors, np.full(len(colors), 255)]) / 255
     color_temp_values = color_temp_values.reshape(-1, 1, 4)
-    sun_position = [setting["sun_position"] for setting in settings]
+    sun_position = series.sun_position
     fig, ax = plt.subplots(figsize=(10, 6))
 
     # Display as a horizontal bar
@@ -0,0 +1,245 @@
+"""Vectorized evaluation of the light settings over a whole day.
+
+`SunLightSettings` computes the settings for a single moment, which involves
+computing the sun events of three days. Here the sun events are computed once
+and the settings of all minutes of a day are evaluated with NumPy, matching
+`SunLightSettings.brightness_pct` and `SunLightSettings.brightness_and_color`.
+The series are cached per set of inputs, so only changed inputs are recomputed.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from astral.location import Location
+from color_and_brightness import (
+    SUN_EVENT_NOON,
+    SUN_EVENT_SUNRISE,
+    SUN_EVENT_SUNSET,
+    SunEvents,
+    SunLightSettings,
+    find_a_b,
+    lerp_color_hsv,
+)
+from homeassistant_util_color import color_temperature_to_rgb
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+BRIGHTNESS_MODES = ("linear", "tanh", "default")
+CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class DaySeries:
+    """The light settings for every minute of a day."""
+
+    time_range: np.ndarray  # hours since midnight
+    sun_position: np.ndarray
+    brightness_pct: dict[str, np.ndarray]  # per brightness mode
+    color_temp_kelvin: np.ndarray
+    rgb_color: np.ndarray  # shape (n, 3)
+
+
+def date_range(tzinfo: dt.tzinfo) -> list[dt.datetime]:
+    """Return a datetime for every minute of the current day."""
+    start_of_day = dt.datetime.now(tzinfo).replace(
+        hour=0,
+        minute=0,
+        second=0,
+        microsecond=0,
+    )
+    return [start_of_day + dt.timedelta(minutes=i) for i in range(24 * 60)]
+
+
+def sun_positions(
+    sun: SunEvents,
+    dt_range: list[dt.datetime],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return the timestamps, sun positions and closest sunrise or sunset.
+
+    The closest event is returned as a boolean array that is True for sunrise
+    and the timestamps of the events.
+    """
+    # All datetimes are on the same day, so they share the surrounding events
+    events = sorted(
+        (
+            event
+            for days in (-1, 0, 1)
+            for event in sun.sun_events(dt_range[0] + dt.timedelta(days=days))
+        ),
+        key=lambda x: x[1],
+    )
+    names = np.array([name for name, _ in events])
+    timestamps = np.array([ts for _, ts in events])
+
+    ts = np.array([t.timestamp() for t in dt_range])
+    i_now = np.searchsorted(timestamps, ts, side="right")
+    prev_event, prev_ts = names[i_now - 1], timestamps[i_now - 1]
+    next_event, next_ts = names[i_now], timestamps[i_now]
+
+    horizon_next = np.isin(next_event, (SUN_EVENT_SUNSET, SUN_EVENT_SUNRISE))
+    h = np.where(horizon_next, prev_ts, next_ts)
+    x = np.where(horizon_next, next_ts, prev_ts)
+    k = np.where(np.isin(next_event, (SUN_EVENT_SUNSET, SUN_EVENT_NOON)), 1, -1)
+    position = k * (1 - ((ts - h) / (h - x)) ** 2)
+
+    prev_sunrise = prev_event == SUN_EVENT_SUNRISE
+    is_sunrise = prev_sunrise | (next_event == SUN_EVENT_SUNRISE)
+    ts_sunrise = np.where(prev_sunrise, prev_ts, next_ts)
+    ts_sunset = np.where(prev_event == SUN_EVENT_SUNSET, prev_ts, next_ts)
+    ts_event = np.where(is_sunrise, ts_sunrise, ts_sunset)
+    return ts, position, is_sunrise, ts_event
+
+
+def _brightness_pct(
+    settings: SunLightSettings,
+    mode: str,
+    sun_position: np.ndarray,
+    x: np.ndarray,
+    is_sunrise: np.ndarray,
+) -> np.ndarray:
+    """Vectorized `SunLightSettings.brightness_pct` for 'x' seconds since the event."""
+    min_b, max_b = settings.min_brightness, settings.max_brightness
+    dark = settings.brightness_mode_time_dark.total_seconds()
+    light = settings.brightness_mode_time_light.total_seconds()
+    if mode == "default":
+        brightness = np.where(
+            sun_position > 0,
+            max_b,
+            (max_b - min_b) * (1 + sun_position) + min_b,
+        )
+    elif mode == "linear":
+        sunrise = min_b + (x + dark) * (max_b - min_b) / (light + dark)
+        sunset = max_b + (x + light) * (min_b - max_b) / (dark + light)
+        brightness = np.clip(np.where(is_sunrise, sunrise, sunset), min_b, max_b)
+    elif mode == "tanh":
+
+        def scaled_tanh(x1: float, x2: float, y1: float, y2: float) -> np.ndarray:
+            a, b = find_a_b(x1, x2, y1, y2)
+            return min_b + (max_b - min_b) * 0.5 * (np.tanh(a * (x - b)) + 1)
+
+        sunrise = scaled_tanh(-dark, light, 0.05, 0.95)
+        sunset = scaled_tanh(-light, dark, 0.95, 0.05)
+        brightness = np.clip(np.where(is_sunrise, sunrise, sunset), min_b, max_b)
+    else:
+        msg = f"Unknown brightness mode '{mode}'"
+        raise ValueError(msg)
+    if settings.invert_brightness:
+        brightness = max_b - (brightness - min_b)
+    return brightness
+
+
+def _color_temp_kelvin(
+    settings: SunLightSettings,
+    sun_position: np.ndarray,
+) -> np.ndarray:
+    """Vectorized `SunLightSettings.color_temp_kelvin`."""
+    min_ct, max_ct = settings.min_color_temp, settings.max_color_temp
+    day = 5 * np.round(((max_ct - min_ct) * sun_position + min_ct) / 5)
+    if settings.adapt_until_sleep:
+        delta = abs(min_ct - settings.sleep_color_temp)
+        ct = delta * np.abs(1 + sun_position) + settings.sleep_color_temp
+        night = 5 * np.round(ct / 5)
+    else:
+        night = np.full_like(sun_position, min_ct)
+    night = np.where(sun_position == 0, min_ct, night)
+    return np.where(sun_position > 0, day, night).astype(int)
+
+
+def compute_day_series(inputs: dict[str, Any], sleep_mode: bool) -> DaySeries:
+    """Compute the settings for every minute of today for all brightness modes."""
+    settings = {
+        mode: SunLightSettings(**inputs, brightness_mode=mode)
+        for mode in BRIGHTNESS_MODES
+    }
+    default = settings["default"]
+    dt_range = date_range(default.timezone)
+    ts, position, is_sunrise, ts_event = sun_positions(default.sun, dt_range)
+    n = len(ts)
+
+    if sleep_mode:
+        brightness = {
+            mode: np.full(n, float(default.sleep_brightness))
+            for mode in BRIGHTNESS_MODES
+        }
+        color_temp_kelvin = np.full(n, default.sleep_color_temp)
+        rgb_color = np.tile(np.array(default.sleep_rgb_color, dtype=float), (n, 1))
+    else:
+        brightness = {
+            mode: _brightness_pct(sun, mode, position, ts - ts_event, is_sunrise)
+            for mode, sun in settings.items()
+        }
+        color_temp_kelvin = _color_temp_kelvin(default, position)
+        # Few distinct values, because the color temperature is rounded to 5 K
+        kelvins, inverse = np.unique(color_temp_kelvin, return_inverse=True)
+        rgb = np.array([color_temperature_to_rgb(int(k)) for k in kelvins])
+        rgb_color = rgb[inverse.ravel()]
+        if (
+            default.sleep_rgb_or_color_temp == "rgb_color"
+            and default.adapt_until_sleep
+        ):
+            # The interpolation in HSV space is not vectorized
+            min_color_rgb = color_temperature_to_rgb(default.min_color_temp)
+            for i in np.flatnonzero(position < 0):
+                rgb_color[i] = lerp_color_hsv(
+                    min_color_rgb,
+                    default.sleep_rgb_color,
+                    position[i],
+                )
+
+    return DaySeries(
+        time_range=np.arange(n) / 60,
+        sun_position=position,
+        brightness_pct=brightness,
+        color_temp_kelvin=color_temp_kelvin,
+        rgb_color=rgb_color,
+    )
+
+
+def _freeze(value: Any) -> Hashable:
+    """Return a hashable version of an input value."""
+    if isinstance(value, Location):
+        return (value.latitude, value.longitude, value.timezone)
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(x) for x in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(x)) for key, x in value.items()))
+    return value
+
+
+class SeriesCache:
+    """Least recently used cache of `DaySeries` keyed on the inputs."""
+
+    def __init__(self, maxsize: int = CACHE_SIZE) -> None:
+        """Initialize an empty cache."""
+        self.maxsize = maxsize
+        self._series: OrderedDict[Hashable, DaySeries] = OrderedDict()
+
+    def get(
+        self,
+        inputs: dict[str, Any],
+        sleep_mode: bool,
+        compute: Callable[[dict[str, Any], bool], DaySeries] = compute_day_series,
+    ) -> DaySeries:
+        """Return the series for 'inputs', computing them if not cached."""
+        # The series depend on the day through the sun events
+        today = dt.datetime.now(inputs["timezone"]).date()
+        key = (_freeze(inputs), sleep_mode, today)
+        series = self._series.get(key)
+        if series is None:
+            series = compute(inputs, sleep_mode)
+            self._series[key] = series
+            if len(self._series) > self.maxsize:
+                self._series.popitem(last=False)
+        else:
+            self._series.move_to_end(key)
+        return series
+
+    def clear(self) -> None:
+        """Remove all cached series."""
+        self._series.clear()